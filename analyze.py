@@ -0,0 +1,265 @@
+"""
+Archivo: analyze.py
+Descripción: CLI ligera para re-ejecutar el análisis de Benford y la exportación
+sobre resultados ya recopilados (no importa Selenium; pandas, matplotlib y
+openpyxl solo se cargan si se pide una salida Excel o PNG)
+
+Uso:
+    python analyze.py benford results/following_data_perfil.json
+    python analyze.py benford results/following_data_perfil.json --excel --png
+    python analyze.py benford "results/following_data_*.json" --workers 8
+    python analyze.py benford results --panel --formato svg
+    python analyze.py benford results/dataset --perfil perfil --desde 2026-01-01
+    python analyze.py export perfil
+    python analyze.py bios perfil --workers 4
+    python analyze.py diff perfil --desde 2026-01-01 --hasta 2026-02-01
+"""
+
+import time
+
+_INICIO = time.perf_counter()
+
+import argparse
+import glob
+import sys
+from pathlib import Path
+from config import ANALYSIS_CONFIG, ensure_dirs
+
+
+def _arranque_ms():
+    """Milisegundos desde el inicio del script"""
+    return (time.perf_counter() - _INICIO) * 1000
+
+
+def _es_lote(ruta):
+    """Un directorio o un patrón glob se analizan como lote"""
+    return Path(ruta).is_dir() or glob.has_magic(ruta)
+
+
+def cmd_benford(args):
+    """Análisis de Benford sobre un archivo o un lote de archivos"""
+    import benford_analysis
+
+    listo_ms = _arranque_ms()
+
+    if benford_analysis.es_dataset_parquet(args.ruta):
+        # Dataset Parquet: se leen solo username/followers de las particiones filtradas
+        filtros = {
+            'perfiles': [args.perfil] if args.perfil else None,
+            'desde': args.desde,
+            'hasta': args.hasta,
+            'historico': args.historico
+        }
+        perfil = args.perfil or "dataset"
+        if args.excel or args.png:
+            ensure_dirs()
+            resultados = benford_analysis.analizar_benford(
+                args.ruta, perfil, excel=args.excel, png=args.png, filtros=filtros,
+                formato=args.formato, dpi=args.dpi
+            )
+            return listo_ms, resultados is not None
+        datos = benford_analysis.cargar_followers(args.ruta, **filtros)
+        print(f"Ley de Benford - @{perfil} ({len(datos[0])} registros)")
+        benford_analysis.imprimir_resumen(
+            benford_analysis.pruebas_benford(benford_analysis.conteos_benford(datos[1]))
+        )
+        return listo_ms, True
+
+    if _es_lote(args.ruta):
+        ensure_dirs()
+        resultados = benford_analysis.analizar_benford_lote(
+            args.ruta, workers=args.workers, excel=args.excel, png=args.png,
+            panel=args.panel, formato=args.formato, dpi=args.dpi
+        )
+        return listo_ms, resultados is not None
+
+    perfil = args.perfil or benford_analysis.perfil_desde_archivo(args.ruta)
+
+    if args.excel or args.png:
+        ensure_dirs()
+        resultados = benford_analysis.analizar_benford(args.ruta, perfil, excel=args.excel, png=args.png,
+                                                       formato=args.formato, dpi=args.dpi)
+        return listo_ms, resultados is not None
+
+    # Ruta rápida: solo NumPy, resultados por consola
+    datos = benford_analysis.cargar_followers(args.ruta)
+    if datos is None:
+        print(" No se encontró columna de followers")
+        return listo_ms, False
+
+    print(f"Ley de Benford - @{perfil}")
+    benford_analysis.imprimir_resumen(
+        benford_analysis.pruebas_benford(benford_analysis.conteos_benford(datos[1]))
+    )
+    return listo_ms, True
+
+
+def _usernames_journal(args):
+    """
+    Usernames del journal que se usan: los followers de la última fase 1
+    guardada (los --max-profiles primeros, como la fase 2), o None para usar
+    todo el journal (--todo o sin estado de followers guardado)
+    """
+    from file_manager import load_followers_state, select_profiles
+
+    if args.todo:
+        return None
+    followers = load_followers_state(args.perfil)
+    if followers is None:
+        print(" No hay followers guardados de la fase 1: se usa todo el journal")
+        return None
+    return set(select_profiles(followers, args.max_profiles))
+
+
+def cmd_export(args):
+    """Regenera el JSON de followers y el Excel de perfiles desde el journal de la fase 2"""
+    from file_manager import (journal_path, iter_journal, save_followers_data_json, save_profile_data_excel,
+                              save_profile_data_parquet)
+
+    listo_ms = _arranque_ms()
+
+    journal = journal_path(args.perfil)
+    if not journal.exists():
+        print(f" No existe el journal {journal}")
+        return listo_ms, False
+
+    ensure_dirs()
+    usernames = _usernames_journal(args)
+    todo = not (args.solo_json or args.solo_excel or args.solo_parquet)
+    if todo or args.solo_json:
+        save_followers_data_json(
+            ({'username': r['username'], 'followers': r['followers']} for r in iter_journal(journal, usernames)),
+            args.perfil
+        )
+    if todo or args.solo_excel:
+        save_profile_data_excel(iter_journal(journal, usernames), args.perfil)
+    if todo or args.solo_parquet:
+        save_profile_data_parquet(iter_journal(journal, usernames), args.perfil)
+    return listo_ms, True
+
+
+def cmd_bios(args):
+    """Clasifica los intereses deportivos de las bios del journal de un perfil"""
+    from file_manager import journal_path, iter_journal
+    from bio_analysis import analizar_bios
+
+    listo_ms = _arranque_ms()
+
+    journal = journal_path(args.perfil)
+    if not journal.exists():
+        print(f" No existe el journal {journal}")
+        return listo_ms, False
+
+    ensure_dirs()
+    analizar_bios(iter_journal(journal, _usernames_journal(args)), args.perfil, workers=args.workers)
+    return listo_ms, True
+
+
+def cmd_diff(args):
+    """Followers nuevos y perdidos entre dos snapshots de un perfil"""
+    import snapshots
+
+    listo_ms = _arranque_ms()
+
+    fechas = snapshots.list_snapshots(args.perfil)
+    if args.listar:
+        print(f"Snapshots de @{args.perfil}: {', '.join(fechas) if fechas else 'ninguno'}")
+        return listo_ms, bool(fechas)
+
+    diff = snapshots.diff_profile(args.perfil, args.desde, args.hasta)
+    if diff is None:
+        print(f" Se necesitan dos snapshots de @{args.perfil} (hay {len(fechas)})")
+        return listo_ms, False
+
+    print(f"@{args.perfil}: {diff['since']} ({diff['total_since']}) -> {diff['until']} ({diff['total_until']})")
+    print(f" ➕ Nuevos: {len(diff['gained'])}")
+    print(f" ➖ Perdidos: {len(diff['lost'])}")
+    if args.detalle:
+        for u in diff['gained']:
+            print(f"  + {u}")
+        for u in diff['lost']:
+            print(f"  - {u}")
+    return listo_ms, True
+
+
+def _argumentos_journal(parser):
+    """Selección de los registros del journal (ver _usernames_journal)"""
+    parser.add_argument('--max-profiles', type=int, default=None,
+                        help="Solo los N primeros followers guardados, como en la fase 2")
+    parser.add_argument('--todo', action='store_true',
+                        help="Usa todo el journal (incluye followers perdidos y de otras ejecuciones)")
+
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Análisis y exportación sobre resultados existentes")
+    parser.add_argument('--tiempo', action='store_true',
+                        help="Muestra el tiempo de arranque frente al presupuesto")
+    parser.add_argument('--estricto', action='store_true',
+                        help="Termina con error si el arranque supera el presupuesto")
+    parser.add_argument('--presupuesto-ms', type=float, default=ANALYSIS_CONFIG['startup_budget_ms'],
+                        help="Presupuesto de arranque en milisegundos")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    benford = sub.add_parser('benford', help="Análisis de Benford de un archivo, directorio o patrón glob")
+    benford.add_argument('ruta', help="Archivo JSON/JSONL, directorio, patrón glob o dataset Parquet")
+    benford.add_argument('--perfil', help="Nombre del perfil (por defecto se deduce del archivo; "
+                                          "en el dataset Parquet filtra por perfil)")
+    benford.add_argument('--desde', help="Dataset Parquet: primera fecha (YYYY-MM-DD)")
+    benford.add_argument('--hasta', help="Dataset Parquet: última fecha (YYYY-MM-DD)")
+    benford.add_argument('--historico', action='store_true',
+                         help="Dataset Parquet: usa todas las observaciones, no solo la última de cada usuario")
+    benford.add_argument('--excel', action='store_true', help="Genera el Excel del análisis")
+    benford.add_argument('--png', action='store_true', help="Genera la gráfica (PNG o SVG según --formato)")
+    benford.add_argument('--formato', choices=('png', 'svg'), default=None,
+                         help="Formato de las gráficas (por defecto el de RENDER_CONFIG)")
+    benford.add_argument('--dpi', type=int, default=None,
+                         help="Resolución de las PNG (por defecto la de RENDER_CONFIG)")
+    benford.add_argument('--panel', action='store_true',
+                         help="Lote: informe multipanel con la gráfica de todos los perfiles")
+    benford.add_argument('--workers', type=int, default=None, help="Procesos para el análisis por lotes")
+    benford.set_defaults(func=cmd_benford)
+
+    export = sub.add_parser('export', help="Regenera JSON, Excel y Parquet desde el journal de un perfil")
+    export.add_argument('perfil', help="Perfil objetivo")
+    grupo = export.add_mutually_exclusive_group()
+    grupo.add_argument('--solo-json', action='store_true', help="Solo el JSON de followers")
+    grupo.add_argument('--solo-excel', action='store_true', help="Solo el Excel de perfiles")
+    grupo.add_argument('--solo-parquet', action='store_true', help="Solo la partición Parquet de hoy")
+    _argumentos_journal(export)
+    export.set_defaults(func=cmd_export)
+
+    bios = sub.add_parser('bios', help="Intereses deportivos de las bios del journal de un perfil")
+    bios.add_argument('perfil', help="Perfil objetivo")
+    bios.add_argument('--workers', type=int, default=None, help="Procesos para la clasificación")
+    _argumentos_journal(bios)
+    bios.set_defaults(func=cmd_bios)
+
+    diff = sub.add_parser('diff', help="Followers nuevos y perdidos entre snapshots de un perfil")
+    diff.add_argument('perfil', help="Perfil objetivo")
+    diff.add_argument('--desde', help="Fecha del snapshot inicial (por defecto el penúltimo)")
+    diff.add_argument('--hasta', help="Fecha del snapshot final (por defecto el último)")
+    diff.add_argument('--detalle', action='store_true', help="Lista los usernames")
+    diff.add_argument('--listar', action='store_true', help="Solo lista las fechas disponibles")
+    diff.set_defaults(func=cmd_diff)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+    listo_ms, ok = args.func(args)
+
+    excedido = listo_ms > args.presupuesto_ms
+    if args.tiempo or excedido:
+        estado = "⚠️ supera el" if excedido else "✅ dentro del"
+        print(f"\nArranque: {listo_ms:.1f} ms ({estado} presupuesto de {args.presupuesto_ms:.0f} ms)")
+
+    if args.estricto and excedido:
+        return 3
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 """
 Archivo: auth.py
-Descripción: Manejo de login y cookies
+Descripción: Manejo de login y cookies (arranque rápido de la sesión guardada)
 """
 
 import json
@@ -12,7 +12,10 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from config import CONFIG_FILE, COOKIES_FILE, INSTAGRAM_URLS
+from config import AUTH_CONFIG, CONFIG_FILE, COOKIES_FILE, INSTAGRAM_URLS
+
+# Enlace a los mensajes directos: solo aparece con la sesión iniciada
+SESSION_XPATH = "//a[contains(@href, '/direct')]"
 
 
 def load_credentials():
@@ -33,42 +36,115 @@ def save_cookies(driver, filename=None):
     print(f"Cookies guardadas en {filename}")
 
 
-def load_cookies(driver, filename=None):
-    """Carga cookies guardadas"""
+def read_cookies(filename=None):
+    """Cookies guardadas (lista de dicts) o None si no hay un archivo válido"""
     if filename is None:
         filename = COOKIES_FILE
-    
-    try:
-        driver.get(INSTAGRAM_URLS['home'])#Navegar a la página principal de Instagram
-        time.sleep(2)#Esperar a que la página cargue
 
+    try:
         with open(filename, "r") as file:
-            cookies = json.load(file)#Cargar las cookies desde el archivo JSON
-
-        for cookie in cookies:
-            cookie.pop('sameSite', None)#Eliminar atributos no necesarios
-            cookie.pop('priority', None)
-            cookie.pop('id', None)
-            if 'domain' not in cookie:
-                cookie['domain'] = '.instagram.com'
-            try:
-                driver.add_cookie(cookie)#Agregar cada cookie al navegador
-            except Exception as e:
-                print(f"No se pudo agregar cookie: {e}")
-                continue
-
-        print("Cookies cargadas correctamente")
-        driver.refresh()#Refrescar la página para aplicar las cookies
-        time.sleep(3)
-        return True
-
+            return json.load(file)#Cargar las cookies desde el archivo JSON
     except FileNotFoundError:
         print("Archivo cookie.json no encontrado")
-        return False
     except json.JSONDecodeError:
         print(" cookie.json no es JSON válido")
+    return None
+
+
+def session_status(cookies, now=None):
+    """
+    Comprueba en local, sin abrir el navegador, que la cookie de sesión existe
+    y no caduca dentro del margen configurado. Devuelve (válida, motivo)
+    """
+    if not cookies:
+        return False, "no hay cookies guardadas"
+
+    name = AUTH_CONFIG['session_cookie']
+    session = next((c for c in cookies if c.get('name') == name), None)
+    if session is None:
+        return False, f"falta la cookie '{name}'"
+
+    expiry = session.get('expiry')
+    if expiry is not None:
+        now = time.time() if now is None else now
+        remaining = expiry - now
+        if remaining <= 0:
+            return False, "la cookie de sesión ha caducado"
+        if remaining <= AUTH_CONFIG['expiry_margin_minutes'] * 60:
+            return False, "la cookie de sesión está a punto de caducar"
+    return True, None
+
+
+def check_saved_session(filename=None):
+    """True si las cookies guardadas permiten intentar reutilizar la sesión"""
+    valid, reason = session_status(read_cookies(filename))
+    if not valid:
+        print(f" Sesión guardada no utilizable: {reason}")
+    return valid
+
+
+def _cdp_cookie(cookie):
+    """Cookie de Selenium (get_cookies) en el formato de Network.setCookies"""
+    cdp = {
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'domain': cookie.get('domain', '.instagram.com'),
+        'path': cookie.get('path', '/'),
+        'secure': cookie.get('secure', False),
+        'httpOnly': cookie.get('httpOnly', False)
+    }
+    if cookie.get('expiry') is not None:
+        cdp['expires'] = cookie['expiry']
+    if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+        cdp['sameSite'] = cookie['sameSite']
+    return cdp
+
+
+def inject_cookies(driver, cookies):
+    """
+    Añade todas las cookies con un solo comando CDP (Network.setCookies), sin
+    necesidad de estar en el dominio. Si el driver no es Chromium, navega una
+    vez al dominio y las añade una a una. Devuelve el método usado
+    """
+    try:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': [_cdp_cookie(c) for c in cookies]})
+        return 'cdp'
+    except Exception:
+        pass
+
+    driver.get(INSTAGRAM_URLS['home'])#add_cookie solo funciona en el dominio de la cookie
+    for cookie in cookies:
+        cookie = dict(cookie)
+        cookie.pop('sameSite', None)#Eliminar atributos no necesarios
+        cookie.pop('priority', None)
+        cookie.pop('id', None)
+        if 'domain' not in cookie:
+            cookie['domain'] = '.instagram.com'
+        try:
+            driver.add_cookie(cookie)#Agregar cada cookie al navegador
+        except Exception as e:
+            print(f"No se pudo agregar cookie: {e}")
+    return 'add_cookie'
+
+
+def load_cookies(driver, filename=None):
+    """
+    Carga las cookies guardadas si la sesión no ha caducado (comprobado en
+    local). No navega: la siguiente carga de página ya las envía
+    """
+    cookies = read_cookies(filename)
+    valid, reason = session_status(cookies)
+    if not valid:
+        print(f" Sesión guardada no utilizable: {reason}")
         return False
 
+    # Las cookies caducadas no se envían
+    now = time.time()
+    cookies = [c for c in cookies if c.get('expiry') is None or c['expiry'] > now]
+    method = inject_cookies(driver, cookies)
+    print(f"Cookies cargadas correctamente ({len(cookies)}, vía {method})")
+    return True
+
 
 def login(driver, username, password):
     """Realiza login en Instagram"""
@@ -113,13 +189,31 @@ def login(driver, username, password):
         return False
 
 
-def verify_session(driver):
-    """Verifica si hay una sesión activa"""
+def verify_session(driver, timeout=None):
+    """
+    Verifica si hay una sesión activa en la página cargada: espera hasta que
+    aparezca el enlace a los mensajes (sesión válida) o el formulario de
+    login (sesión inválida), sin pausas fijas
+    """
+    if timeout is None:
+        timeout = AUTH_CONFIG['verify_timeout']
+
+    def session_state(d):
+        if d.find_elements(By.XPATH, SESSION_XPATH):
+            return 'valid'
+        if d.find_elements(By.NAME, "username"):
+            return 'login'
+        return False
+
     try:
-        driver.find_element(By.XPATH, "//a[contains(@href, '/direct')]")
+        state = WebDriverWait(driver, timeout, poll_frequency=0.25).until(session_state)
+    except Exception:
+        # Timeout o navegador sin responder
+        state = None
+
+    if state == 'valid':
         print(" Sesión válida con cookies")
         return True
-    except:
-        print(" Sesión inválida")
-        return False
+    print(" Sesión inválida")
+    return False
 
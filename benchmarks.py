@@ -0,0 +1,323 @@
+"""
+Archivo: benchmarks.py
+Descripción: Micro-benchmarks de los caminos críticos de CPU y de los
+round-trips a WebDriver por perfil (con un WebDriver simulado)
+
+Uso:
+    python benchmarks.py                          # tamaños 1e3 .. 1e6
+    python benchmarks.py --sizes 1000 10000       # tamaños concretos
+    python benchmarks.py --compare results/bench/micro_anterior.json
+"""
+
+import io
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+from datetime import datetime
+from pathlib import Path
+from config import RESULTS_DIR, SCRAPING_CONFIG, INSTAGRAM_URLS, ensure_dirs
+
+BENCH_DIR = RESULTS_DIR / "bench"
+
+
+# ---------------------------------------------------------------------------
+# Datos sintéticos
+# ---------------------------------------------------------------------------
+
+def _synthetic_counts(n, rng):
+    """Conteos de followers con distribución log-uniforme (cumple Benford)"""
+    return [int(10 ** rng.uniform(0, 7)) for _ in range(n)]
+
+
+def _synthetic_count_texts(n, rng):
+    """Textos de followers en los formatos que ve el scraper"""
+    formats = [
+        lambda v: f"{v:,}",
+        lambda v: f"{v / 1000:.1f}K",
+        lambda v: f"{v / 1000000:.1f}M",
+        lambda v: str(v)
+    ]
+    return [rng.choice(formats)(v) for v in _synthetic_counts(n, rng)]
+
+
+def _synthetic_urls(n, rng):
+    """URLs de perfiles mezcladas con rutas que no son perfiles"""
+    base = INSTAGRAM_URLS['home']
+    paths = ['explore/', 'reels/', 'p/abc123/', 'direct/inbox/']
+    return [
+        f"{base}{rng.choice(paths)}" if rng.random() < 0.1 else f"{base}user_{i}/"
+        for i in range(n)
+    ]
+
+
+def synthetic_profile_html(username, followers=12345, bio_lines=3):
+    """HTML de un perfil con header, meta og:description y JSON embebido"""
+    bio = "<br>".join(f"Línea {i} de la bio de {username} ⚽ #futbol" for i in range(bio_lines))
+    return f"""<html><head>
+<meta property="og:description" content="{followers:,} Followers, 321 Following, 45 Posts - See Instagram photos">
+<script type="application/json">{{"user":{{"biography":"Bio de {username}","edge_followed_by":{{"count":{followers}}},"edge_follow":{{"count":321}}}}}}</script>
+</head><body><main><header><section>
+<div><h2>{username}</h2><button>Seguir</button></div>
+<ul><li><span><span>45</span> posts</span></li>
+<li><a href="/{username}/followers/"><span title="{followers:,}">{followers:,}</span> followers</a></li>
+<li><a href="/{username}/following/"><span>321</span> following</a></li></ul>
+<div><span>{username.title()}</span><div><span>{bio}</span></div>
+<a href="https://linktr.ee/{username}">linktr.ee/{username}</a></div>
+</section></header><article>{"<div><img src='x.jpg'></div>" * 12}</article></main></body></html>"""
+
+
+# ---------------------------------------------------------------------------
+# WebDriver simulado
+# ---------------------------------------------------------------------------
+
+class _FakeElement:
+    """Elemento mínimo devuelto por FakeWebDriver"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def click(self):
+        self._driver._count('element_click')
+
+    def is_displayed(self):
+        self._driver._count('element_is_displayed')
+        return True
+
+    def is_enabled(self):
+        self._driver._count('element_is_enabled')
+        return True
+
+
+class FakeWebDriver:
+    """
+    WebDriver simulado que cuenta cada comando: sirve perfiles sintéticos
+    y un modal de followers que, tras cada scroll, queda cargando y entrega
+    `page_size` filas nuevas en la siguiente lectura
+    """
+
+    def __init__(self, followers=0, page_size=12):
+        self.commands = {}
+        self.current_url = None
+        self._followers = [f"follower_{i}" for i in range(followers)]
+        self._page_size = page_size
+        self._served = 0
+        self._pending = False
+
+    def _count(self, name):
+        self.commands[name] = self.commands.get(name, 0) + 1
+
+    @property
+    def total_commands(self):
+        return sum(self.commands.values())
+
+    def reset(self):
+        self.commands = {}
+
+    def get(self, url):
+        self._count('get')
+        self.current_url = url
+
+    @property
+    def page_source(self):
+        self._count('page_source')
+        username = self.current_url.rstrip('/').split('/')[-1]
+        return synthetic_profile_html(username)
+
+    def find_element(self, by=None, value=None):
+        self._count('find_element')
+        return _FakeElement(self)
+
+    def find_elements(self, by=None, value=None):
+        self._count('find_elements')
+        return [_FakeElement(self)]
+
+    def execute_script(self, script, *args):
+        self._count('execute_script')
+        if 'followersHarvest' not in script:
+            return None
+        scroll = args[0] if args else None
+        reset = len(args) > 1 and args[1]
+        start = 0 if reset else self._served
+        if reset or self._pending:
+            # Primera página, o la página pedida por el scroll anterior
+            self._served = min(start + self._page_size, len(self._followers))
+            self._pending = False
+        if scroll is not None and self._served < len(self._followers):
+            self._pending = True
+
+        base = INSTAGRAM_URLS['home']
+        return {
+            'hrefs': [f"{base}{u}/" for u in self._followers[start:self._served]],
+            'total': self._served,
+            'scrollTop': self._served * 60,
+            'atBottom': self._served >= len(self._followers),
+            'loading': self._pending
+        }
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def _timeit(func, repeat):
+    """Mejor tiempo (s) de `repeat` ejecuciones"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_cpu(sizes, repeat):
+    """Caminos críticos de CPU sobre datasets sintéticos de cada tamaño"""
+    import numpy as np
+    import pandas  # noqa: F401 (la importación no debe contar en cargar_json_instagram)
+    from utils import parse_follower_count, extract_username_from_url
+    from benford_analysis import primer_digito_valor, digitos_iniciales, cargar_json_instagram
+    from page_parser import parse_page
+    from scraper import _bio_candidates
+
+    rng = random.Random(42)
+    results = []
+
+    for n in sizes:
+        texts = _synthetic_count_texts(n, rng)
+        urls = _synthetic_urls(n, rng)
+        counts = _synthetic_counts(n, rng)
+        counts_array = np.array(counts, dtype=float)
+
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False, encoding='utf-8') as f:
+            json.dump([{'username': f"user_{i}", 'followers': v} for i, v in enumerate(counts)], f)
+            json_path = f.name
+
+        # La heurística de bio es por perfil: un perfil por cada 1000 filas. Se mide
+        # junto con el parseo porque Node.text se cachea tras la primera pasada
+        sources = [synthetic_profile_html(f"user_{i}") for i in range(max(1, n // 1000))]
+
+        cases = {
+            'parse_follower_count': lambda: [parse_follower_count(t) for t in texts],
+            'extract_username_from_url': lambda: [extract_username_from_url(u) for u in urls],
+            'primer_digito_valor': lambda: [primer_digito_valor(v) for v in counts],
+            'digitos_iniciales': lambda: digitos_iniciales(counts_array),
+            'cargar_json_instagram': lambda: cargar_json_instagram(json_path),
+            'bio_candidates': lambda: [_bio_candidates(parse_page(src).header) for src in sources],
+        }
+
+        for name, func in cases.items():
+            rows = len(sources) if name == 'bio_candidates' else n
+            seconds = _timeit(func, repeat)
+            results.append({
+                'benchmark': name,
+                'size': n,
+                'rows': rows,
+                'seconds': round(seconds, 6),
+                'rows_per_s': round(rows / seconds) if seconds else None
+            })
+            print(f" {name:<28} n={n:<9} {seconds * 1000:10.2f} ms")
+
+        Path(json_path).unlink()
+
+    return results
+
+
+def bench_webdriver(profiles=20, followers=240):
+    """Comandos WebDriver por perfil (fase 2) y por cada 100 followers (fase 1)"""
+    import scraper
+
+    saved = dict(SCRAPING_CONFIG)
+    SCRAPING_CONFIG.update({
+        'delay_scale': 0, 'scroll_min_interval': 0, 'scroll_jitter': 0,
+        'scroll_poll_interval': 0, 'scroll_wait_timeout': 0.01, 'scroll_settle_time': 0
+    })
+    try:
+        # Los mensajes del scraper no interesan aquí
+        with contextlib.redirect_stdout(io.StringIO()):
+            driver = FakeWebDriver()
+            for i in range(profiles):
+                scraper.get_profile_data(driver, f"user_{i}")
+            per_profile = driver.total_commands / profiles
+            per_profile_detail = {k: v / profiles for k, v in driver.commands.items()}
+
+            driver = FakeWebDriver(followers=followers)
+            harvested = scraper.scrape_followers(driver, 'objetivo', limit=followers)
+            per_100 = driver.total_commands / max(1, len(harvested)) * 100
+    finally:
+        SCRAPING_CONFIG.clear()
+        SCRAPING_CONFIG.update(saved)
+
+    print(f" webdriver_commands_per_profile  {per_profile:.1f} {per_profile_detail}")
+    print(f" webdriver_commands_per_100_followers  {per_100:.1f}")
+    return {
+        'webdriver_commands_per_profile': per_profile,
+        'webdriver_commands_per_profile_detail': per_profile_detail,
+        'webdriver_commands_per_100_followers': round(per_100, 2)
+    }
+
+
+def compare(current, previous_file):
+    """Muestra la variación frente a un informe anterior (>1 = más lento ahora)"""
+    with open(previous_file, 'r', encoding='utf-8') as f:
+        previous = json.load(f)
+
+    before = {(r['benchmark'], r['size']): r['seconds'] for r in previous.get('cpu', [])}
+    print(f"\n Comparación con {previous_file}:")
+    for r in current['cpu']:
+        key = (r['benchmark'], r['size'])
+        if before.get(key):
+            ratio = r['seconds'] / before[key]
+            flag = " ⚠️" if ratio > 1.2 else ""
+            print(f" {r['benchmark']:<28} n={r['size']:<9} x{ratio:.2f}{flag}")
+
+    for key in ('webdriver_commands_per_profile', 'webdriver_commands_per_100_followers'):
+        old = previous.get('webdriver', {}).get(key)
+        new = current['webdriver'][key]
+        if old is not None:
+            print(f" {key:<40} {old} -> {new}")
+
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Micro-benchmarks del scraper y del análisis")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000],
+                        help="Tamaños de los datasets sintéticos")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones (se toma la mejor)")
+    parser.add_argument('--output', help="Archivo JSON de salida")
+    parser.add_argument('--compare', metavar='ARCHIVO', help="Informe anterior con el que comparar")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+
+    print("Benchmarks de CPU")
+    cpu = bench_cpu(args.sizes, args.repeat)
+    print("\nRound-trips a WebDriver (simulado)")
+    webdriver = bench_webdriver()
+
+    report = {
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'cpu': cpu,
+        'webdriver': webdriver
+    }
+
+    ensure_dirs()
+    BENCH_DIR.mkdir(exist_ok=True)
+    output = Path(args.output) if args.output else BENCH_DIR / f"micro_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\n Resultados guardados en: {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
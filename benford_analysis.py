@@ -3,39 +3,133 @@ Archivo: benford_analysis.py
 Descripción: Análisis de la Ley de Benford
 """
 
+import os
 import json
 import re
+import glob
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
 from config import RESULTS_DIR
+from metrics import METRICS
+import benford_render
 
+# pandas, matplotlib y pyarrow se importan solo cuando se necesitan
 
-def cargar_json_instagram(ruta):
-    """Carga JSON con múltiples formatos"""
+
+def _registros_json(ruta):
+    """Lista de registros (dicts) de un JSON o JSONL con múltiples formatos"""
     with open(ruta, "r", encoding="utf-8") as f:    #Abrir un archivo en forma de lectura
+        if str(ruta).endswith(".jsonl"):            #JSONL: un registro por línea
+            return [json.loads(line) for line in f if line.strip()]
         data = json.load(f)                         # Cargar los datos del archivo JSON
 
     if isinstance(data, list):      #Determinamos si los datos son una lista
-        return pd.DataFrame(data)
+        return data
 
     if isinstance(data, dict) and "data" in data and isinstance(data["data"], list):    #Determinamos si es un diccionario y si contiene la clave data que es una lista
-        return pd.DataFrame(data["data"])
+        return data["data"]
 
     for key in data:    #Iteramos sobre las claves del diccionario 
         if isinstance(data[key], list) and len(data[key]) > 0 and isinstance(data[key][0], dict):   #Verificamos si el valor es una lisya y si el tamaños es mayor a cero
-            return pd.DataFrame(data[key])
+            return data[key]
 
     if isinstance(data, dict):  #Verificamos si es un diccionario   
-        return pd.DataFrame([data])  #Devolvemos un DataFrame con una sola fila
+        return [data]  #Devolvemos una sola fila
 
     raise ValueError(" No se pudo interpretar la estructura del JSON.")
 
 
+def es_dataset_parquet(ruta):
+    """Un archivo .parquet o la carpeta del dataset particionado (target=<perfil>/date=<fecha>)"""
+    ruta = Path(ruta)
+    return ruta.suffix == ".parquet" or (ruta.is_dir() and any(ruta.glob("target=*")))
+
+
+def cargar_parquet(ruta, columnas=("username", "followers"), perfiles=None, desde=None,
+                   hasta=None, historico=False):
+    """
+    Lee del dataset Parquet solo las columnas pedidas y solo las particiones que
+    cumplen los filtros de perfil y fecha (YYYY-MM-DD). Salvo con historico=True
+    se conserva la observación más reciente de cada username de cada perfil.
+    Devuelve una tabla de pyarrow
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+    if Path(ruta).is_file():
+        # Un archivo suelto es una sola partición: no hay filtros ni duplicados entre fechas
+        return ds.dataset(str(ruta), format="parquet").to_table(columns=list(columnas))
+
+    particion = ds.partitioning(pa.schema([("target", pa.string()), ("date", pa.string())]), flavor="hive")
+    dataset = ds.dataset(str(ruta), format="parquet", partitioning=particion)
+
+    filtro = None
+    condiciones = []
+    if perfiles:
+        condiciones.append(ds.field("target").isin(list(perfiles)))
+    if desde:
+        condiciones.append(ds.field("date") >= desde)
+    if hasta:
+        condiciones.append(ds.field("date") <= hasta)
+    for condicion in condiciones:
+        filtro = condicion if filtro is None else filtro & condicion
+
+    extra = [] if historico else ["target", "date", "username"]
+    tabla = dataset.to_table(columns=list(dict.fromkeys([*columnas, *extra])), filter=filtro)
+
+    if not historico and tabla.num_rows:
+        # Más reciente primero; np.unique devuelve la primera aparición de cada clave
+        tabla = tabla.sort_by([("date", "descending")])
+        claves = pc.binary_join_element_wise(tabla["target"], tabla["username"], "/")
+        _, indices = np.unique(claves.to_numpy(zero_copy_only=False).astype(str), return_index=True)
+        tabla = tabla.take(np.sort(indices))
+
+    return tabla.select(list(columnas))
+
+
+def cargar_json_instagram(ruta, **filtros):
+    """Carga JSON con múltiples formatos (o el dataset Parquet, con filtros de cargar_parquet)"""
+    if es_dataset_parquet(ruta):
+        return cargar_parquet(ruta, **filtros).to_pandas()
+
+    import pandas as pd
+    return pd.DataFrame(_registros_json(ruta))
+
+
+def cargar_followers(ruta, **filtros):
+    """
+    Carga solo los usernames y followers de un JSON/JSONL (sin pandas) o del
+    dataset Parquet (solo esas dos columnas, con filtros de cargar_parquet).
+    Devuelve (usernames, followers) o None si no hay columna de followers
+    """
+    if es_dataset_parquet(ruta):
+        tabla = cargar_parquet(ruta, **filtros)
+        followers = tabla["followers"].to_numpy(zero_copy_only=False).astype(float)
+        return tabla["username"].to_pylist(), followers
+
+    registros = _registros_json(ruta)
+
+    # Columnas en el mismo orden que les daría un DataFrame
+    columnas = list(dict.fromkeys(k for r in registros for k in r))
+    follow_cols = [c for c in columnas if "follow" in c.lower()]
+    if not follow_cols:
+        return None
+
+    usernames = [str(r.get(columnas[0])) for r in registros]
+    valores = [r.get(follow_cols[0]) for r in registros]
+    try:
+        followers = np.array([np.nan if v is None else v for v in valores], dtype=float)
+    except (TypeError, ValueError):
+        followers = np.array(valores, dtype=object)
+
+    return usernames, followers
+
+
 def primer_digito_valor(valor):                 
     """Extrae el primer dígito de un valor"""
-    if pd.isna(valor):  #Verificamos si el valor es NaN
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):  #Verificamos si el valor es NaN
         return np.nan
     s = str(valor).strip().replace(",", "") #Convertimos el valor a cadena y quitamos espacios y comas.
     m = re.search(r"[1-9]", s)      #Buscamos el patron de digitos del 1 al 9 en la cadena
@@ -44,94 +138,483 @@ def primer_digito_valor(valor):
     return np.nan
 
 
-def analizar_benford(json_file, profile):
+def _digitos_texto(valor, n):
+    """Primeros `n` dígitos significativos de una celda no numérica (ej. "1,234" o "1.2K")"""
+    digitos = re.sub(r"\D", "", str(valor)).lstrip("0")
+    if len(digitos) < n:
+        return np.nan
+    return int(digitos[:n])
+
+
+# Potencias de 10 representables en uint64 (10**0 ... 10**19)
+_POTENCIAS_10 = np.uint64(10) ** np.arange(20, dtype=np.uint64)
+
+
+def _digitos_enteros(x, n):
+    """
+    Primeros `n` dígitos de enteros no negativos (uint64) con aritmética entera:
+    el número de cifras sale de la tabla de potencias de 10, sin log10 ni
+    redondeos en float. Los valores menores que 10**(n-1) devuelven NaN
+    """
+    resultado = np.full(x.shape[0], np.nan)
+    validos = x >= _POTENCIAS_10[n - 1]
+    xv = x[validos]
+    cifras = np.searchsorted(_POTENCIAS_10, xv, side="right")
+    resultado[validos] = xv // _POTENCIAS_10[cifras - n]
+    return resultado
+
+
+def _columna_numerica(arr):
     """
-    Analiza datos con la Ley de Benford y genera gráfica
+    Convierte a float una columna de tipo object sin recorrerla en Python
+    (None y texto no numérico quedan como NaN). Devuelve (números, índices de
+    las celdas de texto que no se pudieron convertir)
+    """
+    try:
+        # Números, None y números en texto ("123"): conversión directa en C
+        numeros, texto = arr.astype(float), ()
+    except (TypeError, ValueError):
+        import pandas as pd
+        numeros = pd.to_numeric(pd.Series(arr), errors="coerce").to_numpy(dtype=float, copy=True)
+        # Solo las celdas que quedaron en NaN se revisan una a una
+        texto = [i for i in np.flatnonzero(np.isnan(numeros)) if isinstance(arr[i], str)]
+
+    # True se convierte en 1.0, pero un booleano no es un recuento
+    for i in np.flatnonzero(numeros == 1):
+        if isinstance(arr[i], (bool, np.bool_)):
+            numeros[i] = np.nan
+    return numeros, texto
+
+
+def digitos_iniciales(valores, n=1):
     """
+    Extrae de forma vectorizada los `n` primeros dígitos significativos de cada valor.
+    Las columnas mixtas (object) se convierten primero a float en bloque y se
+    procesan con NumPy (floor(x / 10**floor(log10(x)))); solo las celdas de
+    texto no numérico ("1,234", "1.2K") se interpretan como texto. Cero, NaN y
+    valores sin dígitos devuelven NaN, los negativos se toman en valor absoluto y,
+    para n > 1, los valores menores que 10**(n-1) también devuelven NaN.
+    Los enteros (y los float con valor entero) se procesan con aritmética entera,
+    exacta también con 11 o más cifras significativas
+    """
+    arr = np.asarray(valores)
+    resultado = np.full(arr.shape[0], np.nan)
+
+    if arr.dtype.kind == "b":
+        # Booleanos: no son recuentos
+        return resultado
+    if arr.dtype.kind == "u":
+        return _digitos_enteros(arr.astype(np.uint64), n)
+    if arr.dtype.kind == "i":
+        # |x| en uint64 (también correcto para el mínimo de int64)
+        return _digitos_enteros(np.abs(arr.astype(np.int64)).astype(np.uint64), n)
+    if arr.dtype.kind == "f":
+        numeros = arr.astype(float)
+    else:
+        numeros, texto = _columna_numerica(arr.astype(object))
+        for i in texto:
+            resultado[i] = _digitos_texto(arr[i], n)
+
+    x = np.abs(numeros)
+    validos = np.isfinite(x) & ((x > 0) if n == 1 else (x >= 10.0 ** (n - 1)))
+
+    # Valores enteros (recuentos leídos como float): aritmética entera exacta
+    enteros = validos & (x < 2.0 ** 63) & (x == np.floor(x))
+    resultado[enteros] = _digitos_enteros(x[enteros].astype(np.uint64), n)
+    validos &= ~enteros
+    xv = x[validos]
+
+    exponente = np.floor(np.log10(xv)) - (n - 1)
+    d = np.floor(np.round(xv / 10.0 ** exponente, 9))
+    # Corregir el exponente cuando log10 redondea mal cerca de potencias de 10
+    exponente = exponente + (d >= 10 ** n) - (d < 10 ** (n - 1))
+    d = np.floor(np.round(xv / 10.0 ** exponente, 9))
+
+    resultado[validos] = d
+    return resultado
+
+
+# Pruebas de Benford: dígitos evaluados, proporciones esperadas, límites MAD de
+# Nigrini (conformidad cercana, aceptable, marginal) y valor crítico de chi-cuadrado (α = 0.05)
+PRUEBAS_BENFORD = {
+    'primer_digito': {
+        'digitos': np.arange(1, 10),
+        'esperado': np.log10(1 + 1 / np.arange(1, 10)),
+        'mad_limites': (0.006, 0.012, 0.015),
+        'chi2_critico': 15.507
+    },
+    'segundo_digito': {
+        'digitos': np.arange(0, 10),
+        'esperado': np.log10(1 + 1 / (10 * np.arange(1, 10)[:, None] + np.arange(0, 10))).sum(axis=0),
+        'mad_limites': (0.008, 0.010, 0.012),
+        'chi2_critico': 16.919
+    },
+    'dos_digitos': {
+        'digitos': np.arange(10, 100),
+        'esperado': np.log10(1 + 1 / np.arange(10, 100)),
+        'mad_limites': (0.0012, 0.0018, 0.0022),
+        'chi2_critico': 112.022
+    }
+}
+
+CONFORMIDAD = ('Conformidad cercana', 'Conformidad aceptable', 'Conformidad marginal', 'No conformidad')
+
+
+def conteos_benford(valores):
+    """
+    Conteos por dígito de las tres pruebas (primer dígito, segundo dígito y
+    dos primeros dígitos) a partir de los valores
+    """
+    primeros = digitos_iniciales(valores, 1)
+    dos = digitos_iniciales(valores, 2)
+
+    primeros = primeros[~np.isnan(primeros)].astype(int)
+    dos = dos[~np.isnan(dos)].astype(int)
+
+    return {
+        'primer_digito': np.bincount(primeros, minlength=10)[1:10],
+        'segundo_digito': np.bincount(dos % 10, minlength=10),
+        'dos_digitos': np.bincount(dos, minlength=100)[10:100]
+    }
+
+
+def estadisticos_benford(conteos, prueba):
+    """
+    Estadísticas de una prueba calculadas en una sola pasada vectorizada sobre
+    el array de conteos: chi-cuadrado, Kolmogorov-Smirnov y MAD de Nigrini
+    """
+    config = PRUEBAS_BENFORD[prueba]
+    conteos = np.asarray(conteos, dtype=float)
+    esperado = config['esperado']
+    n = conteos.sum()
+
+    if n == 0:
+        real = np.full(esperado.shape, np.nan)
+        chi2 = ks = mad = ks_critico = np.nan
+        conformidad = 'Sin datos'
+    else:
+        real = conteos / n
+        chi2 = float(np.sum((conteos - n * esperado) ** 2 / (n * esperado)))
+        ks = float(np.max(np.abs(np.cumsum(real) - np.cumsum(esperado))))
+        ks_critico = 1.36 / np.sqrt(n)
+        mad = float(np.mean(np.abs(real - esperado)))
+        conformidad = CONFORMIDAD[int(np.searchsorted(config['mad_limites'], mad, side='right'))]
+
+    return {
+        'prueba': prueba,
+        'n': int(n),
+        'digitos': config['digitos'],
+        'conteos': conteos.astype(int),
+        'real': real,
+        'esperado': esperado,
+        'chi2': chi2,
+        'chi2_critico': config['chi2_critico'],
+        'ks': ks,
+        'ks_critico': ks_critico,
+        'mad': mad,
+        'conformidad': conformidad
+    }
+
+
+def pruebas_benford(conteos):
+    """Ejecuta todas las pruebas sobre los conteos devueltos por conteos_benford"""
+    return {prueba: estadisticos_benford(conteos[prueba], prueba) for prueba in PRUEBAS_BENFORD}
+
+
+class AcumuladorBenford:
+    """
+    Conteos de las tres pruebas actualizados en O(1) por perfil según llegan los
+    followers durante la fase 2. Cada username cuenta una sola vez (un valor
+    nuevo sustituye al anterior), y los valores se guardan para el Excel de la fase 3
+    """
+
+    def __init__(self):
+        self.conteos = {prueba: np.zeros(len(c['digitos']), dtype=np.int64)
+                        for prueba, c in PRUEBAS_BENFORD.items()}
+        self.valores = {}
+
+    @staticmethod
+    def _posiciones(valor):
+        """Índice de cada prueba en su array de conteos (None si el valor no cuenta)"""
+        primero = digitos_iniciales([valor], 1)[0]
+        dos = digitos_iniciales([valor], 2)[0]
+        return {
+            'primer_digito': None if np.isnan(primero) else int(primero) - 1,
+            'segundo_digito': None if np.isnan(dos) else int(dos) % 10,
+            'dos_digitos': None if np.isnan(dos) else int(dos) - 10
+        }
+
+    def _sumar(self, valor, signo):
+        for prueba, i in self._posiciones(valor).items():
+            if i is not None:
+                self.conteos[prueba][i] += signo
+
+    def agregar(self, username, valor):
+        """Añade (o sustituye) el número de followers de un username"""
+        if username in self.valores:
+            self._sumar(self.valores[username], -1)
+        self.valores[username] = valor
+        self._sumar(valor, 1)
+
+    @property
+    def n(self):
+        return int(self.conteos['primer_digito'].sum())
+
+    def pruebas(self):
+        """Estadísticas actuales de las tres pruebas (coste fijo, no depende de N)"""
+        return pruebas_benford(self.conteos)
+
+    def lectura(self):
+        """Lectura breve de la conformidad del primer dígito"""
+        r = estadisticos_benford(self.conteos['primer_digito'], 'primer_digito')
+        if not r['n']:
+            return "Benford: sin datos"
+        return f"Benford: N={r['n']}, MAD={r['mad']:.4f} ({r['conformidad']})"
+
+    def datos(self):
+        """(usernames, followers) en orden de llegada"""
+        usernames = list(self.valores)
+        followers = np.array([np.nan if v is None else v for v in self.valores.values()], dtype=float)
+        return usernames, followers
+
+
+def imprimir_resumen(pruebas):
+    """Muestra N, MAD, conformidad y chi-cuadrado de cada prueba"""
+    for r in pruebas.values():
+        print(f" {r['prueba']}: N={r['n']}, MAD={r['mad']:.5f} ({r['conformidad']}), "
+              f"Chi2={r['chi2']:.4f} (crítico {r['chi2_critico']})")
+
+
+def tabla_prueba(resultado):
+    """Tabla comparativa (real vs Benford, en %) de una prueba"""
+    import pandas as pd
+    real = resultado['real'] * 100
+    esperado = resultado['esperado'] * 100
+    return pd.DataFrame({
+        "Dígito": resultado['digitos'],
+        "Conteo": resultado['conteos'],
+        "Frecuencia_Real_%": real.round(3),
+        "Benford_%": esperado.round(3),
+        "Diferencia_%": (real - esperado).round(3)
+    })
+
+
+def resumen_pruebas(pruebas):
+    """Una fila por prueba con N, chi-cuadrado, KS, MAD y conformidad"""
+    import pandas as pd
+    return pd.DataFrame([{
+        "Prueba": r['prueba'],
+        "N": r['n'],
+        "Chi2": round(r['chi2'], 4),
+        "Chi2_critico": r['chi2_critico'],
+        "Chi2_rechaza": bool(r['chi2'] > r['chi2_critico']),
+        "KS": round(r['ks'], 4),
+        "KS_critico": round(r['ks_critico'], 4),
+        "KS_rechaza": bool(r['ks'] > r['ks_critico']),
+        "MAD": round(r['mad'], 5),
+        "Conformidad": r['conformidad']
+    } for r in pruebas.values()])
+
+
+def columna_followers(df):
+    """Columna de followers del DataFrame (None si no hay ninguna)"""
+    possible_cols = [c for c in df.columns if "follow" in c.lower()]
+    # Si hay múltiples columnas que contienen "follow", se elige la primera
+    return possible_cols[0] if possible_cols else None
+
+
+def perfil_desde_archivo(ruta):
+    """Nombre del perfil a partir de un archivo following_data_<perfil>.json"""
+    stem = Path(ruta).stem
+    prefijo = "following_data_"
+    return stem[len(prefijo):] if stem.startswith(prefijo) else stem
+
+
+def analizar_benford(json_file, profile, excel=True, png=True, filtros=None, acumulador=None,
+                     formato=None, dpi=None, segundo_plano=False):
+    """
+    Analiza datos con la Ley de Benford y genera el Excel y la gráfica
+    (cada salida puede desactivarse con excel=False / png=False).
+    `json_file` puede ser también el dataset Parquet; `filtros` se pasan a cargar_parquet.
+    Con un AcumuladorBenford de la fase 2 no se vuelve a leer el archivo.
+    La gráfica (PNG o SVG, ver RENDER_CONFIG) se encola en el hilo de
+    renderizado con segundo_plano=True
+    """
+    import pandas as pd
+
     print("\n" + "=" * 60)
     print("ANÁLISIS LEY DE BENFORD")
     print("=" * 60)
     
-    # Cargar datos del archivo JSON
-    df = cargar_json_instagram(json_file)
-    
-    # Detectar columna de followers
-    possible_cols = [c for c in df.columns if "follow" in c.lower()]
-    # Si no se encuentra ninguna columna que contenga "follow" en su nombre
-    if not possible_cols:
-        print(" No se encontró columna de followers")
-        return None
-    # Si hay múltiples columnas que contienen "follow", se elige la primera
-    follow_col = possible_cols[0]
-    
-    # Preparar datos
     df_clean = pd.DataFrame()       #Crear un DataFrame vacío para almacenar los datos limpios
-    df_clean["username"] = df[df.columns[0]].astype(str)    # Asignar la primera columna del DataFrame original como nombres de usuario y transformarla a cadena
-    df_clean["followers"] = df[follow_col]                  # Asignar la columna de seguidores detectada
-    df_clean["primer_digito"] = df_clean["followers"].apply(primer_digito_valor)    # Extraer el primer dígito de los seguidores
-    
-    # Aplicar Benford
-    digitos = np.arange(1, 10)  #Crear un array con los dígitos del 1 al 9 
-    conteos = df_clean["primer_digito"].value_counts().reindex(digitos, fill_value=0)  #Contar la frecuencia de cada dígito y reindexar para asegurar que todos los dígitos del 1 al 9 estén presentes
-    total_validos = conteos.sum()   #Calcular el total de valores válidos (no NaN)
-    
-    porcentaje_real = (conteos / total_validos) * 100                           #Calcular el porcentaje real de cada dígito
-    porcentaje_benford = np.array([np.log10(1 + 1/d) * 100 for d in digitos])   #Calcular el porcentaje esperado según la Ley de Benford
-    
-    comparacion = pd.DataFrame({
-        "Dígito": digitos,
-        "Conteo": conteos.values,
-        "Frecuencia_Real_%": porcentaje_real.round(3).values,
-        "Benford_%": porcentaje_benford.round(3),
-        "Diferencia_%": (porcentaje_real - porcentaje_benford).round(3)
-    })
+
+    if acumulador is not None:
+        # Datos y conteos ya acumulados durante la fase 2
+        usernames, followers = acumulador.datos()
+        df_clean["username"] = usernames
+        df_clean["followers"] = followers
+    else:
+        # Cargar datos del archivo JSON
+        df = cargar_json_instagram(json_file, **(filtros or {}))
+
+        # Detectar columna de followers
+        follow_col = columna_followers(df)
+        if follow_col is None:
+            print(" No se encontró columna de followers")
+            return None
+
+        # Preparar datos
+        df_clean["username"] = df[df.columns[0]].astype(str)    # Asignar la primera columna del DataFrame original como nombres de usuario y transformarla a cadena
+        df_clean["followers"] = df[follow_col]                  # Asignar la columna de seguidores detectada
+
+    df_clean["primer_digito"] = digitos_iniciales(df_clean["followers"].to_numpy())    # Extraer el primer dígito de los seguidores (vectorizado)
+
+    # Aplicar Benford (primer dígito, segundo dígito y dos primeros dígitos)
+    if acumulador is not None:
+        pruebas = acumulador.pruebas()
+    else:
+        pruebas = pruebas_benford(conteos_benford(df_clean["followers"].to_numpy()))
+    comparacion = tabla_prueba(pruebas['primer_digito'])
+    resumen = resumen_pruebas(pruebas)
+
+    imprimir_resumen(pruebas)
     
+    excel_file = png_file = None
+
     # Guardar Excel
-    excel_file = RESULTS_DIR / f"benford_{profile}.xlsx"
-    with pd.ExcelWriter(excel_file, engine="openpyxl") as writer:#Abrir un escritor de Excel usando openpyxl como motor
-        df_clean.to_excel(writer, sheet_name="datos_originales", index=False)#Guardar los datos originales en una hoja llamada "datos_originales"
-        comparacion.to_excel(writer, sheet_name="comparacion_benford", index=False)# Guardar la comparación de Benford en otra hoja llamada "comparacion_benford"
-    
-    print(f" Excel generado: {excel_file}")
+    if excel:
+        excel_file = RESULTS_DIR / f"benford_{profile}.xlsx"
+        with METRICS.timer('write', kind='benford_excel'):
+            _guardar_excel(excel_file, df_clean, comparacion, pruebas, resumen)
+        print(f" Excel generado: {excel_file}")
     
-    # Generar gráfica y guardar PNG
-    png_file = RESULTS_DIR / f"benford_{profile}.png"
-    # Crear la gráfica y el eje
-    fig, ax = plt.subplots(figsize=(10, 6))
-    # Configurar la gráfica
-    bar_width = 0.35
-    # Crear barras para los datos reales 
-    ax.bar(digitos - bar_width/2,
-           comparacion["Frecuencia_Real_%"],
-           width=bar_width,
-           label="Datos Reales (%)",
-           alpha=0.85,
-           color='#1f77b4')
-    # Crear línea para la Ley de Benford
-    ax.plot(digitos,
-            comparacion["Benford_%"],
-            marker="o",
-            linewidth=2,
-            label="Ley de Benford (%)",
-            color='#ff7f0e')
-    # Configurar etiquetas y título
-    ax.set_title(f"Ley de Benford - @{profile}", fontsize=14, fontweight='bold')    #Establecer el título de la gráfica
-    ax.set_xlabel("Primer dígito", fontsize=12)    #Establecer la etiqueta del eje x
-    ax.set_ylabel("Frecuencia (%)", fontsize=12)   #Establecer la etiqueta del eje y
-    ax.set_xticks(digitos)                          #Establecer las marcas del eje x
-    ax.grid(alpha=0.3, linestyle='--')              #Configurar la cuadrícula
-    ax.legend(fontsize=10)                          #Mostrar la leyenda de la gráfica
-    
-    plt.tight_layout()#Ajustar el diseño para que no se solapen los elementos
-    fig.savefig(png_file, dpi=300, bbox_inches="tight")#Guardar la gráfica como archivo PNG
-    plt.close()#Cerrar la figura para liberar memoria
-    
-    print(f" Gráfica generada: {png_file}")
+    # Generar gráfica (PNG o SVG)
+    if png:
+        png_file = benford_render.archivo_grafica(f"benford_{profile}", formato)
+        real = pruebas['primer_digito']['real'] * 100
+        if segundo_plano:
+            benford_render.en_segundo_plano(benford_render.renderizar, png_file, real, profile, formato, dpi)
+            print(f" Gráfica en cola: {png_file}")
+        else:
+            benford_render.renderizar(png_file, real, profile, formato, dpi)
+            print(f" Gráfica generada: {png_file}")
+
     print("=" * 60 + "\n")
     
     return {
         'excel': excel_file,
         'png': png_file,
-        'comparacion': comparacion
+        'comparacion': comparacion,
+        'pruebas': pruebas,
+        'resumen': resumen
     }
 
+
+def _guardar_excel(excel_file, df_clean, comparacion, pruebas, resumen):
+    """Escribe las hojas del análisis en un Excel"""
+    import pandas as pd
+
+    with pd.ExcelWriter(excel_file, engine="openpyxl") as writer:#Abrir un escritor de Excel usando openpyxl como motor
+        df_clean.to_excel(writer, sheet_name="datos_originales", index=False)#Guardar los datos originales en una hoja llamada "datos_originales"
+        comparacion.to_excel(writer, sheet_name="comparacion_benford", index=False)# Guardar la comparación de Benford en otra hoja llamada "comparacion_benford"
+        tabla_prueba(pruebas['segundo_digito']).to_excel(writer, sheet_name="segundo_digito", index=False)
+        tabla_prueba(pruebas['dos_digitos']).to_excel(writer, sheet_name="dos_digitos", index=False)
+        resumen.to_excel(writer, sheet_name="resumen_pruebas", index=False)
+
+
+def _analizar_archivo(ruta, excel=False, png=False, formato=None, dpi=None):
+    """Analiza un archivo para el lote y devuelve su fila del resumen"""
+    perfil = perfil_desde_archivo(ruta)
+    fila = {"Perfil": perfil, "Archivo": str(ruta)}
+
+    try:
+        if excel or png:
+            resultados = analizar_benford(ruta, perfil, excel=excel, png=png, formato=formato, dpi=dpi)
+            if resultados is None:
+                return {**fila, "Error": "Sin columna de followers"}
+            pruebas = resultados['pruebas']
+        else:
+            datos = cargar_followers(ruta)
+            if datos is None:
+                return {**fila, "Error": "Sin columna de followers"}
+            pruebas = pruebas_benford(conteos_benford(datos[1]))
+    except Exception as e:
+        return {**fila, "Error": str(e)}
+
+    primer = pruebas['primer_digito']
+    return {
+        **fila,
+        "N": primer['n'],
+        "MAD": round(primer['mad'], 5),
+        "Chi2": round(primer['chi2'], 4),
+        "KS": round(primer['ks'], 4),
+        "Conformidad": primer['conformidad'],
+        "MAD_segundo_digito": round(pruebas['segundo_digito']['mad'], 5),
+        "MAD_dos_digitos": round(pruebas['dos_digitos']['mad'], 5),
+        "Conformidad_dos_digitos": pruebas['dos_digitos']['conformidad'],
+        "Error": None,
+        "_real": primer['real'] * 100     # Para el informe multipanel (no va al Excel)
+    }
+
+
+def analizar_benford_lote(entrada=None, workers=None, excel=False, png=False, panel=False,
+                          formato=None, dpi=None):
+    """
+    Analiza en paralelo (un proceso por núcleo) todos los archivos de un
+    directorio o patrón glob y genera una tabla resumen consolidada.
+    Con excel=True y/o png=True también genera el Excel y/o la gráfica de cada
+    perfil (cada proceso reutiliza su figura plantilla); con panel=True, un informe
+    multipanel con la gráfica de todos los perfiles
+    """
+    if entrada is None:
+        entrada = RESULTS_DIR
+    if Path(entrada).is_dir():
+        entrada = str(Path(entrada) / "following_data_*.json")
+
+    archivos = sorted(glob.glob(str(entrada)))
+    if not archivos:
+        print(f" No hay archivos que coincidan con {entrada}")
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    print(f" Analizando {len(archivos)} archivos con {workers} procesos...")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        filas = list(executor.map(
+            _analizar_archivo,
+            archivos,
+            [excel] * len(archivos),
+            [png] * len(archivos),
+            [formato] * len(archivos),
+            [dpi] * len(archivos),
+            chunksize=max(1, len(archivos) // (workers * 4))
+        ))
+
+    # Por archivo: el mismo perfil puede aparecer en varios directorios del glob
+    reales = {fila["Archivo"]: fila.pop("_real", None) for fila in filas}
+
+    import pandas as pd
+    resumen = pd.DataFrame(filas).sort_values("Perfil", ignore_index=True)
+
+    excel_file = RESULTS_DIR / "benford_resumen_lote.xlsx"
+    resumen.to_excel(excel_file, index=False)
+
+    paneles = []
+    if panel:
+        paneles = benford_render.renderizar_panel(
+            [(fila.Perfil, reales[fila.Archivo], f"MAD {fila.MAD}")
+             for fila in resumen.itertuples() if reales.get(fila.Archivo) is not None],
+            nombre="benford_panel_lote", formato=formato, dpi=dpi
+        )
+
+    errores = resumen["Error"].notna().sum()
+    print(f" Resumen del lote: {len(resumen) - errores} perfiles analizados, {errores} con error")
+    print(f" Excel generado: {excel_file}")
+    for archivo in paneles:
+        print(f" Informe multipanel generado: {archivo}")
+
+    return {
+        'excel': excel_file,
+        'paneles': paneles,
+        'resumen': resumen
+    }
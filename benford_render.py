@@ -0,0 +1,186 @@
+"""
+Archivo: benford_render.py
+Descripción: Generación de las gráficas de Benford con backend no interactivo
+(Agg), una figura plantilla reutilizada entre perfiles, salida PNG o SVG con
+resolución configurable, informe multipanel y renderizado en segundo plano
+"""
+
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from config import RENDER_CONFIG, RESULTS_DIR
+from metrics import METRICS
+
+# matplotlib se importa solo al dibujar la primera gráfica
+
+FORMATOS = ('png', 'svg')
+DIGITOS = np.arange(1, 10)
+BENFORD_PCT = np.log10(1 + 1 / DIGITOS) * 100
+COLOR_REAL = '#1f77b4'
+COLOR_BENFORD = '#ff7f0e'
+
+_LOCK = threading.Lock()
+_PLANTILLA = None       # Figura plantilla del proceso
+_EJECUTOR = None        # Hilo de renderizado en segundo plano
+_PENDIENTES = []
+
+
+def _figura(**kwargs):
+    """Figura de matplotlib con el backend Agg (sin pyplot ni ventanas)"""
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+
+def formato_salida(formato=None):
+    """Formato de las gráficas ('png' o 'svg'), por defecto el de RENDER_CONFIG"""
+    formato = (formato or RENDER_CONFIG['format']).lower()
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato de gráfica no soportado: {formato}")
+    return formato
+
+
+def archivo_grafica(nombre, formato=None):
+    """Ruta de una gráfica en RESULTS_DIR con la extensión del formato"""
+    return RESULTS_DIR / f"{nombre}.{formato_salida(formato)}"
+
+
+def _porcentajes(real):
+    """Frecuencias reales (%) sin NaN (un perfil sin datos se dibuja vacío)"""
+    return np.nan_to_num(np.asarray(real, dtype=float))
+
+
+class PlantillaBenford:
+    """
+    Gráfica real vs Benford creada una sola vez: para cada perfil solo se
+    actualizan las alturas de las barras, el eje Y y el título antes de guardar.
+    Los márgenes son fijos, sin tight_layout ni bbox_inches="tight" (que
+    obligan a dibujar la figura dos veces)
+    """
+
+    def __init__(self):
+        self.fig = _figura(figsize=(10, 6))
+        self.fig.subplots_adjust(left=0.08, right=0.97, bottom=0.1, top=0.92)
+        ax = self.ax = self.fig.add_subplot()
+
+        bar_width = 0.35
+        self.barras = ax.bar(DIGITOS - bar_width/2, np.zeros(len(DIGITOS)), width=bar_width,
+                             label="Datos Reales (%)", alpha=0.85, color=COLOR_REAL)
+        ax.plot(DIGITOS, BENFORD_PCT, marker="o", linewidth=2,
+                label="Ley de Benford (%)", color=COLOR_BENFORD)
+        self.titulo = ax.set_title("", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Primer dígito", fontsize=12)
+        ax.set_ylabel("Frecuencia (%)", fontsize=12)
+        ax.set_xticks(DIGITOS)
+        ax.grid(alpha=0.3, linestyle='--')
+        ax.legend(fontsize=10)
+        self._lock = threading.Lock()
+
+    def guardar(self, archivo, real, profile, formato=None, dpi=None):
+        """Dibuja las frecuencias reales (%) de un perfil y guarda la figura"""
+        real = _porcentajes(real)
+        with self._lock:
+            for barra, altura in zip(self.barras, real):
+                barra.set_height(altura)
+            self.ax.set_ylim(0, max(real.max(), BENFORD_PCT.max()) * 1.08)
+            self.titulo.set_text(f"Ley de Benford - @{profile}")
+            self.fig.savefig(archivo, format=formato_salida(formato), dpi=dpi or RENDER_CONFIG['dpi'])
+        return archivo
+
+
+def plantilla():
+    """Figura plantilla del proceso (se crea con la primera gráfica)"""
+    global _PLANTILLA
+    with _LOCK:
+        if _PLANTILLA is None:
+            _PLANTILLA = PlantillaBenford()
+        return _PLANTILLA
+
+
+def renderizar(archivo, real, profile, formato=None, dpi=None):
+    """Guarda la gráfica del primer dígito de un perfil; devuelve su ruta"""
+    with METRICS.timer('write', kind=f"benford_{formato_salida(formato)}"):
+        return plantilla().guardar(archivo, real, profile, formato, dpi)
+
+
+def renderizar_panel(perfiles, nombre="benford_panel", columnas=None, formato=None, dpi=None):
+    """
+    Informe multipanel: una gráfica pequeña por perfil a partir de tuplas
+    (perfil, frecuencias reales %[, nota]), en páginas de RENDER_CONFIG['panel_max']
+    perfiles. Devuelve la lista de archivos generados
+    """
+    perfiles = list(perfiles)
+    columnas = columnas or RENDER_CONFIG['panel_columns']
+    por_pagina = RENDER_CONFIG['panel_max']
+    formato = formato_salida(formato)
+    paginas = [perfiles[i:i + por_pagina] for i in range(0, len(perfiles), por_pagina)]
+    archivos = []
+
+    for numero, pagina in enumerate(paginas, 1):
+        sufijo = f"_{numero}" if len(paginas) > 1 else ""
+        archivo = archivo_grafica(f"{nombre}{sufijo}", formato)
+        cols = min(columnas, len(pagina))
+        filas = math.ceil(len(pagina) / cols)
+
+        fig = _figura(figsize=(3.2 * cols, 2.6 * filas + 0.6))
+        axes = fig.subplots(filas, cols, sharex=True, sharey=True, squeeze=False)
+        for ax, (perfil, real, *nota) in zip(axes.flat, pagina):
+            ax.bar(DIGITOS, _porcentajes(real), width=0.6, alpha=0.85, color=COLOR_REAL)
+            ax.plot(DIGITOS, BENFORD_PCT, marker="o", markersize=3, linewidth=1.5, color=COLOR_BENFORD)
+            titulo = f"@{perfil}" + (f" ({nota[0]})" if nota and nota[0] else "")
+            ax.set_title(titulo, fontsize=9)
+            ax.set_xticks(DIGITOS)
+            ax.tick_params(labelsize=7)
+            ax.grid(alpha=0.3, linestyle='--')
+        for ax in axes.flat[len(pagina):]:
+            ax.set_visible(False)
+
+        fig.suptitle("Ley de Benford - primer dígito (barras: datos reales %, línea: Benford %)",
+                     fontsize=11, fontweight='bold')
+        fig.subplots_adjust(left=0.06, right=0.98, bottom=0.06, top=1 - 0.6 / (2.6 * filas + 0.6),
+                            hspace=0.35, wspace=0.15)
+        with METRICS.timer('write', kind=f"benford_panel_{formato}"):
+            fig.savefig(archivo, format=formato, dpi=dpi or RENDER_CONFIG['dpi'])
+        archivos.append(archivo)
+
+    return archivos
+
+
+def _informar_error(futuro):
+    error = futuro.exception()
+    if error is not None:
+        print(f" Error al generar una gráfica: {error}")
+
+
+def en_segundo_plano(func, *args, **kwargs):
+    """
+    Ejecuta `func` (renderizar, renderizar_panel...) en el hilo de renderizado
+    y devuelve su Future; el scraping sigue mientras tanto
+    """
+    global _EJECUTOR
+    with _LOCK:
+        if _EJECUTOR is None:
+            _EJECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix='render')
+        futuro = _EJECUTOR.submit(func, *args, **kwargs)
+        _PENDIENTES.append(futuro)
+    futuro.add_done_callback(_informar_error)
+    return futuro
+
+
+def esperar():
+    """Espera a las gráficas en cola y cierra el hilo; devuelve cuántas fallaron"""
+    global _EJECUTOR
+    with _LOCK:
+        ejecutor, _EJECUTOR = _EJECUTOR, None
+        pendientes = list(_PENDIENTES)
+        _PENDIENTES.clear()
+    if ejecutor is None:
+        return 0
+
+    en_cola = sum(1 for f in pendientes if not f.done())
+    if en_cola:
+        print(f"🖼️ Esperando {en_cola} gráficas en cola...")
+    ejecutor.shutdown(wait=True)
+    return sum(1 for f in pendientes if f.exception() is not None)
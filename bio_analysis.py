@@ -0,0 +1,336 @@
+"""
+Archivo: bio_analysis.py
+Descripción: Clasificación de intereses deportivos en las biografías con un
+autómata Aho-Corasick (todas las palabras clave en una sola pasada por bio)
+sobre un léxico multilingüe configurable, en paralelo con un pool de procesos
+"""
+
+import os
+import re
+import json
+import unicodedata
+from collections import deque
+from itertools import chain, islice
+from concurrent.futures import ProcessPoolExecutor
+from config import BIO_CONFIG, RESULTS_DIR
+
+# Léxico por defecto: categoría -> términos (palabras, hashtags sin '#', emoji).
+# Se puede sustituir o ampliar con un JSON en BIO_CONFIG['lexicon_file']
+LEXICO_DEPORTES = {
+    'futbol': [
+        'futbol', 'fútbol', 'football', 'soccer', 'futebol', 'calcio', 'fussball', 'fußball',
+        'futbolista', 'footballer', 'jogador', 'hincha', 'barra brava', 'golazo', 'liga pro',
+        'ligapro', 'champions league', 'worldcup', 'real madrid', 'realmadrid', 'barca',
+        'fcbarcelona', 'barcelona sc', 'emelec', 'ldu', 'liga de quito', 'independiente del valle',
+        'latri', '⚽', '🥅'
+    ],
+    'baloncesto': [
+        'baloncesto', 'basket', 'basketball', 'basquet', 'básquet', 'basquete', 'pallacanestro',
+        'nba', 'wnba', '🏀'
+    ],
+    'tenis': ['tenis', 'tennis', 'padel', 'pádel', 'atp', 'wta', '🎾'],
+    'ciclismo': [
+        'ciclismo', 'ciclista', 'cycling', 'cyclist', 'ciclismo de ruta', 'mtb', 'mountain bike',
+        'bici', 'tour de france', 'giro de italia', '🚴', '🚵'
+    ],
+    'running': [
+        'running', 'runner', 'corredor', 'corredora', 'maraton', 'maratón', 'marathon',
+        'trail running', 'trailrunning', '10k', '21k', '42k', 'atletismo', 'athletics', '🏃'
+    ],
+    'fitness': [
+        'gym', 'gimnasio', 'fitness', 'crossfit', 'workout', 'entrenador personal',
+        'personal trainer', 'bodybuilding', 'fisicoculturismo', 'powerlifting', 'calistenia',
+        'calisthenics', 'musculação', '🏋', '💪'
+    ],
+    'natacion': ['natacion', 'natación', 'swimming', 'swimmer', 'nadador', 'nadadora', 'natação', '🏊'],
+    'combate': [
+        'boxeo', 'boxing', 'boxe', 'mma', 'ufc', 'jiu jitsu', 'jiujitsu', 'bjj', 'karate',
+        'taekwondo', 'judo', 'muay thai', 'kickboxing', 'lucha libre', 'wrestling', '🥊', '🥋'
+    ],
+    'beisbol': ['beisbol', 'béisbol', 'baseball', 'mlb', '⚾'],
+    'voley': ['voley', 'vóley', 'voleibol', 'volleyball', 'ecuavoley', 'ecuavóley', 'volei', 'vôlei', '🏐'],
+    'futbol_americano': ['nfl', 'american football', 'futbol americano', 'fútbol americano', 'super bowl', '🏈'],
+    'motor': ['formula 1', 'fórmula 1', 'formula1', 'f1', 'motogp', 'rally', 'karting', 'nascar', '🏎', '🏁'],
+    'esports': ['esports', 'e-sports', 'gamer', 'fifa', 'eafc', 'league of legends', 'valorant', 'streamer', '🎮'],
+    'deporte_general': [
+        'deporte', 'deportes', 'deportista', 'sport', 'sports', 'sportsman', 'athlete', 'atleta',
+        'esporte', 'esportes', 'entrenador', 'coach', '🏆', '🥇', '🏅'
+    ]
+}
+
+# Términos genéricos que también aparecen fuera del deporte ("coach de vida",
+# "gamer", "F1" de un teclado, un "rally" político, 🏆 por cualquier logro,
+# "10k followers", una "barca de vela", "basket weaving"): solo cuentan si la
+# bio tiene además algún término deportivo no ambiguo.
+# Se amplía con la clave "_ambiguos" del JSON del léxico
+TERMINOS_AMBIGUOS = (
+    'coach', 'entrenador', 'f1', 'rally', 'fifa', 'gamer', 'streamer', '10k', '21k', '42k',
+    'barca', 'basket', '🏆', '🥇', '🏅'
+)
+
+
+# Marcas combinantes (acentos) y selectores de variante de emoji
+_MARCAS = re.compile('[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe00-\ufe0f\ufe20-\ufe2f]')
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos ni selectores de variante (🏋️ y 🏋 coinciden)"""
+    texto = texto.casefold()
+    if texto.isascii():
+        return texto
+    return _MARCAS.sub('', unicodedata.normalize('NFKD', texto))
+
+
+def cargar_lexico(ruta=None):
+    """
+    Léxico por defecto, ampliado o sustituido por el JSON configurado si existe.
+    La clave '_ambiguos' lleva los términos que necesitan otro término deportivo
+    """
+    ruta = ruta or BIO_CONFIG['lexicon_file']
+    lexico = {cat: list(terms) for cat, terms in LEXICO_DEPORTES.items()}
+    lexico['_ambiguos'] = list(TERMINOS_AMBIGUOS)
+    if ruta and os.path.exists(ruta):
+        with open(ruta, 'r', encoding='utf-8') as f:
+            extra = json.load(f)
+        if extra.pop('_reemplazar', False):
+            lexico = {'_ambiguos': []}
+        for cat, terms in extra.items():
+            lexico.setdefault(cat, []).extend(terms)
+    return lexico
+
+
+class AhoCorasick:
+    """
+    Autómata de Aho-Corasick sobre texto normalizado. Los términos que empiezan
+    o terminan en letra/dígito solo coinciden con palabras completas, salvo al
+    principio de un hashtag compuesto (#FutbolEcuador cuenta como 'futbol'; un
+    término en medio o al final del hashtag, como #VamosBarca, no se detecta);
+    los emoji coinciden en cualquier posición. Los términos de lexico['_ambiguos']
+    (por defecto TERMINOS_AMBIGUOS) no clasifican una bio por sí solos
+    """
+
+    def __init__(self, lexico):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.terms = []     # (término normalizado, categoría)
+
+        for categoria, terminos in lexico.items():
+            if categoria.startswith('_'):
+                continue
+            for termino in terminos:
+                termino = normalizar(termino).lstrip('#')
+                if termino:
+                    self._add(termino, categoria)
+        self._build()
+        self.alfabeto = frozenset(c for t, _ in self.terms for c in t)
+
+        ambiguos = {normalizar(t).lstrip('#') for t in lexico.get('_ambiguos', TERMINOS_AMBIGUOS)}
+        self.ambiguos = frozenset(i for i, (t, _) in enumerate(self.terms) if t in ambiguos)
+
+    def _add(self, termino, categoria):
+        nodo = 0
+        for c in termino:
+            siguiente = self.goto[nodo].get(c)
+            if siguiente is None:
+                siguiente = len(self.goto)
+                self.goto[nodo][c] = siguiente
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            nodo = siguiente
+        self.output[nodo].append(len(self.terms))
+        self.terms.append((termino, categoria))
+
+    def _build(self):
+        """Enlaces de fallo por BFS (las salidas se heredan del nodo de fallo)"""
+        cola = deque(self.goto[0].values())
+        while cola:
+            nodo = cola.popleft()
+            for c, hijo in self.goto[nodo].items():
+                cola.append(hijo)
+                f = self.fail[nodo]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[hijo] = self.goto[f].get(c, 0)
+                self.output[hijo] = self.output[hijo] + self.output[self.fail[hijo]]
+
+    def buscar(self, texto):
+        """Índices de los términos encontrados en un texto ya normalizado"""
+        goto, fail, output, terms = self.goto, self.fail, self.output, self.terms
+        alfabeto = self.alfabeto
+        encontrados = set()
+        nodo = 0
+        n = len(texto)
+        for i, c in enumerate(texto):
+            if c not in alfabeto:
+                # Ningún término contiene el carácter: vuelta a la raíz
+                nodo = 0
+                continue
+            while nodo and c not in goto[nodo]:
+                nodo = fail[nodo]
+            nodo = goto[nodo].get(c, 0)
+            for t in output[nodo]:
+                if t in encontrados:
+                    continue
+                termino = terms[t][0]
+                inicio = i - len(termino) + 1
+                # Límites de palabra para términos alfanuméricos
+                if termino[0].isalnum() and inicio > 0 and texto[inicio - 1].isalnum():
+                    continue
+                if (termino[-1].isalnum() and i + 1 < n and texto[i + 1].isalnum()
+                        and not (inicio > 0 and texto[inicio - 1] == '#')):
+                    continue
+                encontrados.add(t)
+        return encontrados
+
+    def clasificar(self, bio):
+        """(categorías, términos) encontrados en una bio"""
+        if not bio:
+            return [], []
+        encontrados = self.buscar(normalizar(bio))
+        if encontrados <= self.ambiguos:
+            # Sin ningún término deportivo inequívoco (o sin coincidencias)
+            return [], []
+        terminos = sorted({self.terms[t][0] for t in encontrados})
+        categorias = sorted({self.terms[t][1] for t in encontrados})
+        return categorias, terminos
+
+
+# Autómata de cada proceso del pool (se construye una vez en el inicializador)
+_AUTOMATA = None
+
+
+def _iniciar_worker(lexico):
+    global _AUTOMATA
+    _AUTOMATA = AhoCorasick(lexico)
+
+
+def _clasificar_lote(lote):
+    return [(username, *_AUTOMATA.clasificar(bio)) for username, bio in lote]
+
+
+def _lotes(pares, tamano):
+    """Listas de `tamano` elementos de un iterable, sin leerlo entero"""
+    pares = iter(pares)
+    while True:
+        lote = list(islice(pares, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def clasificar_pares(pares, workers=None, lexico=None):
+    """
+    Clasifica un iterable de pares (username, bio) y genera tuplas
+    (username, categorias, terminos) en el mismo orden, leyendo la entrada por
+    lotes de BIO_CONFIG['chunk_size']. Si hay menos de BIO_CONFIG['parallel_min']
+    bios (o workers=1) se clasifica en el mismo proceso; si no, en un pool de
+    procesos con como mucho dos lotes por proceso en curso
+    """
+    lexico = lexico or cargar_lexico()
+    lotes = _lotes(pares, BIO_CONFIG['chunk_size'])
+
+    # Solo se retienen los lotes necesarios para decidir si merece la pena el pool
+    iniciales = []
+    leidos = 0
+    for lote in lotes:
+        iniciales.append(lote)
+        leidos += len(lote)
+        if leidos >= BIO_CONFIG['parallel_min']:
+            break
+
+    if leidos < BIO_CONFIG['parallel_min'] or workers == 1:
+        _iniciar_worker(lexico)
+        for lote in chain(iniciales, lotes):
+            yield from _clasificar_lote(lote)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker,
+                             initargs=(lexico,)) as executor:
+        en_curso = deque()
+        for lote in chain(iniciales, lotes):
+            en_curso.append(executor.submit(_clasificar_lote, lote))
+            if len(en_curso) >= 2 * workers:
+                yield from en_curso.popleft().result()
+        while en_curso:
+            yield from en_curso.popleft().result()
+
+
+def clasificar_bios(registros, workers=None, lexico=None):
+    """
+    Clasifica las bios de un iterable de registros {username, bio}.
+    Genera dicts {username, categorias, terminos} (ver clasificar_pares)
+    """
+    pares = ((r.get('username'), r.get('bio')) for r in registros)
+    for username, categorias, terminos in clasificar_pares(pares, workers, lexico):
+        yield {'username': username, 'categorias': categorias, 'terminos': terminos}
+
+
+def agregar_intereses(etiquetas, con_bio=None):
+    """Resumen de un objetivo (en una pasada por las etiquetas): usuarios y porcentaje por categoría"""
+    total = 0
+    por_categoria = {}
+    con_interes = 0
+    for fila in etiquetas:
+        total += 1
+        if fila['categorias']:
+            con_interes += 1
+        for cat in fila['categorias']:
+            por_categoria[cat] = por_categoria.get(cat, 0) + 1
+
+    return {
+        'usuarios': total,
+        'con_bio': con_bio,
+        'con_interes_deportivo': con_interes,
+        'porcentaje_interes': round(100 * con_interes / total, 2) if total else 0.0,
+        'categorias': {
+            cat: {'usuarios': n, 'porcentaje': round(100 * n / total, 2)}
+            for cat, n in sorted(por_categoria.items(), key=lambda kv: -kv[1])
+        }
+    }
+
+
+def analizar_bios(registros, profile, workers=None):
+    """
+    Etiqueta las bios de un objetivo y guarda las etiquetas por usuario (JSONL)
+    y el resumen agregado (JSON) en una sola pasada por los registros, que no
+    se cargan en memoria (solo viajan los pares username/bio).
+    Devuelve {'resumen', 'tags', 'json'}
+    """
+    con_bio = 0
+
+    def pares():
+        nonlocal con_bio
+        for r in registros:
+            bio = r.get('bio')
+            if bio:
+                con_bio += 1
+            yield r.get('username'), bio
+
+    def guardar(etiquetas):
+        for username, categorias, terminos in etiquetas:
+            fila = {'username': username, 'categorias': categorias, 'terminos': terminos}
+            f.write(json.dumps(fila, ensure_ascii=False) + "\n")
+            yield fila
+
+    print("🏷️ Clasificando bios...")
+    tags_file = RESULTS_DIR / f"bio_tags_{profile}.jsonl"
+    with open(tags_file, 'w', encoding='utf-8') as f:
+        resumen = agregar_intereses(guardar(clasificar_pares(pares(), workers)))
+    resumen = {'perfil': profile, **resumen, 'con_bio': con_bio}
+
+    resumen_file = RESULTS_DIR / f"bio_resumen_{profile}.json"
+    with open(resumen_file, 'w', encoding='utf-8') as f:
+        json.dump(resumen, f, indent=2, ensure_ascii=False)
+
+    print(f" {resumen['usuarios']} bios clasificadas ({con_bio} con texto)")
+    print(f" Interés deportivo: {resumen['con_interes_deportivo']}/{resumen['usuarios']} "
+          f"({resumen['porcentaje_interes']}%)")
+    for cat, datos in list(resumen['categorias'].items())[:5]:
+        print(f"   • {cat}: {datos['usuarios']} ({datos['porcentaje']}%)")
+    print(f" Etiquetas guardadas en: {tags_file}")
+    print(f" Resumen guardado en: {resumen_file}")
+
+    return {'resumen': resumen, 'tags': tags_file, 'json': resumen_file}
@@ -5,15 +5,23 @@ Descripción: Inicialización y configuración del driver
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
-from config import SELENIUM_CONFIG
+from config import SELENIUM_CONFIG, METRICS_CONFIG
+from metrics import instrument_driver
 
 
-def init_browser(headless=None, detach=None):
-    """Inicializa el navegador Chrome con configuración anti-detección"""
+def init_browser(headless=None, detach=None, lightweight=None):
+    """
+    Inicializa el navegador Chrome con configuración anti-detección.
+    En modo ligero no espera a los recursos secundarios (page_load_strategy
+    'eager') ni descarga imágenes, vídeo o fuentes; las esperas explícitas del
+    scraper siguen garantizando que el header esté en el DOM
+    """
     if headless is None:
         headless = SELENIUM_CONFIG['headless']
     if detach is None:
         detach = SELENIUM_CONFIG['detach']
+    if lightweight is None:
+        lightweight = SELENIUM_CONFIG['lightweight']
     
     options = webdriver.ChromeOptions()
     options.add_argument(f"--window-size={SELENIUM_CONFIG['window_size']}")
@@ -29,8 +37,18 @@ def init_browser(headless=None, detach=None):
     
     if detach:
         options.add_experimental_option("detach", True)
+
+    if lightweight:
+        options.page_load_strategy = 'eager'
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2
+        })
     
     driver = webdriver.Chrome(options=options)
+    if METRICS_CONFIG['enabled']:
+        # Cuenta y mide cada comando WebDriver desde el primero
+        instrument_driver(driver)
 
     # Anti-detección
     driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
@@ -40,6 +58,13 @@ def init_browser(headless=None, detach=None):
             });
         '''
     })
+
+    if lightweight:
+        # Bloquea en la red lo que las preferencias no cubren (vídeo, fuentes, avatares CSS)
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {
+            'urls': SELENIUM_CONFIG['blocked_url_patterns']
+        })
     
     return driver
 
@@ -11,11 +11,17 @@ BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 RESULTS_DIR = BASE_DIR / "results"
 COOKIES_DIR = BASE_DIR / "cookies"
+SNAPSHOTS_DIR = DATA_DIR / "snapshots"
+DATASET_DIR = RESULTS_DIR / "dataset"   # Parquet particionado target=<perfil>/date=<fecha>
+
+
+
+def ensure_dirs():
+    """Crea los directorios de trabajo si no existen (no se hace al importar)"""
+    DATA_DIR.mkdir(exist_ok=True)
+    RESULTS_DIR.mkdir(exist_ok=True)
+    COOKIES_DIR.mkdir(exist_ok=True)
 
-# Crear directorios si no existen
-DATA_DIR.mkdir(exist_ok=True)
-RESULTS_DIR.mkdir(exist_ok=True)
-COOKIES_DIR.mkdir(exist_ok=True)
 
 # Archivos
 CONFIG_FILE = 'config.ini'
@@ -26,25 +32,115 @@ SELENIUM_CONFIG = {
     'window_size': '1920,1080',
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'headless': False,
-    'detach': True
+    'detach': True,
+    # Modo ligero: carga 'eager' y sin imágenes, vídeo ni fuentes (la extracción
+    # solo usa el texto del header, las meta y el JSON embebido)
+    'lightweight': False,
+    'blocked_url_patterns': [
+        '*.jpg*', '*.jpeg*', '*.png*', '*.gif*', '*.webp*', '*.heic*', '*.svg*',
+        '*.mp4*', '*.webm*', '*.m4a*', '*.m4v*', '*.mp3*',
+        '*.woff*', '*.ttf*', '*.otf*', '*.eot*'
+    ]
 }
 
 # Límites y timeouts
 SCRAPING_CONFIG = {
     'default_timeout': 15,
-    'scroll_delay_min': 1.5,
-    'scroll_delay_max': 2.5,
+    'delay_scale': 1.0,             # Multiplicador de human_delay (0 en benchmarks offline)
+    'scroll_min_interval': 0.8,     # Intervalo mínimo entre scrolls (s)
+    'scroll_jitter': 0.7,           # Aleatoriedad añadida al intervalo mínimo (s)
+    'scroll_poll_interval': 0.25,   # Frecuencia de consulta de filas nuevas (s)
+    'scroll_wait_timeout': 8,       # Espera máxima de filas nuevas tras un scroll (s)
+    'scroll_settle_time': 1.5,      # Espera al final de la lista sin petición de carga (s)
     'max_scroll_attempts': 50,
     'no_change_max': 3,
     'request_delay_min': 2,
-    'request_delay_max': 4
+    'request_delay_max': 4,
+    'navigation_burst': 1,          # Navegaciones seguidas permitidas sin pausa (token bucket)
+    'max_profiles': 100             # Perfiles a recopilar por objetivo en la fase 2
+}
+
+# Caché de perfiles entre ejecuciones
+CACHE_CONFIG = {
+    'enabled': True,
+    'file': DATA_DIR / 'profile_cache.sqlite3',
+    'ttl_hours': 72,
+    'max_entries': 50000
+}
+
+# URLs de Instagram (la base se puede sustituir, ej. por el servidor de replay.py)
+INSTAGRAM_BASE_URL = os.environ.get('INSTAGRAM_BASE_URL', 'https://www.instagram.com')
+
+
+def _build_instagram_urls(base):
+    base = base.rstrip('/')
+    return {
+        'login': f'{base}/accounts/login/',
+        'home': f'{base}/',
+        'profile': f'{base}/{{username}}/',
+        'followers': f'{base}/{{username}}/following/'
+    }
+
+
+INSTAGRAM_URLS = _build_instagram_urls(INSTAGRAM_BASE_URL)
+
+
+def set_instagram_base(base):
+    """Cambia la base de INSTAGRAM_URLS en caliente (el dict se actualiza en sitio)"""
+    INSTAGRAM_URLS.update(_build_instagram_urls(base))
+
+
+# Intereses deportivos en las bios (bio_analysis.py)
+BIO_CONFIG = {
+    'enabled': True,                            # Clasifica las bios al final de cada objetivo
+    'lexicon_file': DATA_DIR / 'lexico_deportes.json',  # Amplía (o con "_reemplazar": true sustituye) el léxico
+    'chunk_size': 2000,                         # Bios por tarea del pool de procesos
+    'parallel_min': 20000                       # Por debajo, se clasifica en el mismo proceso
+}
+
+# Salida columnar (Parquet)
+OUTPUT_CONFIG = {
+    'parquet': True,                # Escribe también el dataset Parquet en la fase 2
+    'parquet_batch_rows': 50000,    # Filas por row group
+    'parquet_compression': 'zstd'
+}
+
+# Arranque de sesión desde cookies (auth.py)
+AUTH_CONFIG = {
+    'session_cookie': 'sessionid',  # Cookie imprescindible para reutilizar la sesión
+    'expiry_margin_minutes': 10,    # Si caduca antes, se trata como caducada (sin abrir el navegador)
+    'verify_timeout': 10            # Espera máxima del enlace de mensajes o del formulario de login (s)
+}
+
+# Pool de sesiones de navegador (session_pool.py, modo por lotes)
+SESSION_CONFIG = {
+    'size': 1,                      # Navegadores autenticados que se mantienen abiertos
+    'max_pages': 400,               # Páginas cargadas antes de reciclar un navegador
+    'max_heap_mb': 768,             # Memoria JS de la pestaña que fuerza el reciclado
+    'request_budget': 1500,         # Navegaciones máximas entre todas las sesiones...
+    'budget_window_minutes': 60,    # ...en cada ventana (None = en toda la ejecución)
+    'watch_interval': 30            # Segundos entre revisiones de la carpeta de trabajos
 }
 
-# URLs de Instagram
-INSTAGRAM_URLS = {
-    'login': 'https://www.instagram.com/accounts/login/',
-    'home': 'https://www.instagram.com/',
-    'profile': 'https://www.instagram.com/{username}/',
-    'followers': 'https://www.instagram.com/{username}/following/'
+# Instrumentación (metrics.py)
+METRICS_CONFIG = {
+    'enabled': True,                # Instrumenta el driver y exporta el informe al terminar
+    'dir': RESULTS_DIR / 'metrics',
+    'prefix': 'igscraper',          # Prefijo de las métricas en el archivo Prometheus
+    'buckets': (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
 }
 
+# CLI de análisis (analyze.py)
+ANALYSIS_CONFIG = {
+    'startup_budget_ms': 150,   # Presupuesto de arranque hasta estar listo para analizar
+    'live_every': 10            # Perfiles entre lecturas de Benford en vivo durante la fase 2
+}
+
+# Gráficas de Benford (benford_render.py)
+RENDER_CONFIG = {
+    'format': 'png',            # 'png' o 'svg'
+    'dpi': 300,                 # Resolución de las PNG (ej. 100 para vistas previas rápidas)
+    'background': True,         # Durante el scraping, las gráficas se generan en un hilo aparte
+    'panel_columns': 4,         # Columnas del informe multipanel
+    'panel_max': 36             # Perfiles por página del informe multipanel
+}
@@ -4,9 +4,10 @@ Descripción: Guardado y carga de datos
 """
 
 import json
-from datetime import datetime
-from config import RESULTS_DIR
-import pandas as pd
+from datetime import datetime, date
+from config import RESULTS_DIR, DATA_DIR, DATASET_DIR, OUTPUT_CONFIG
+from metrics import METRICS
+
 
 def save_followers_txt(followers, profile):
     """Guarda followers en archivo de texto"""
@@ -23,23 +24,237 @@ def save_followers_txt(followers, profile):
     return filename
 
 
+def _ends_with_newline(filename):
+    with open(filename, 'rb') as f:
+        f.seek(-1, 2)
+        return f.read(1) == b"\n"
+
+
+class JsonlWriter:
+    """Escritor JSONL en streaming: una línea por registro, volcada al momento"""
+
+    def __init__(self, filename, append=False):
+        self.filename = filename
+        self.count = 0
+        self._file = open(filename, 'a' if append else 'w', encoding='utf-8')
+        if append and self._file.tell() and not _ends_with_newline(filename):
+            # Última línea incompleta tras un corte: el primer registro nuevo va en su propia línea
+            self._file.write("\n")
+
+    def write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StreamingExcelWriter:
+    """
+    Escritor Excel de memoria constante (openpyxl en modo write_only):
+    las filas se vuelcan a disco según se añaden
+    """
+
+    def __init__(self, filename, columns=None, sheet_name='datos'):
+        from openpyxl import Workbook
+
+        self.filename = filename
+        self.columns = list(columns) if columns else None
+        self.count = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet_name)
+        if self.columns:
+            self._sheet.append(self.columns)
+
+    @staticmethod
+    def _cell(value):
+        if isinstance(value, (list, tuple, set)):
+            return ", ".join(str(v) for v in value)
+        if isinstance(value, dict):
+            return json.dumps(value, ensure_ascii=False)
+        return value
+
+    def write(self, record):
+        if self.columns is None:
+            # Las columnas se toman del primer registro
+            self.columns = list(record.keys())
+            self._sheet.append(self.columns)
+        self._sheet.append([self._cell(record.get(col)) for col in self.columns])
+        self.count += 1
+
+    def close(self):
+        self._workbook.save(self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_jsonl(filename):
+    """Recorre los registros de un archivo JSONL sin cargarlo entero en memoria"""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # Última línea incompleta tras un corte
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def iter_journal(filename, usernames=None):
+    """
+    Registro vigente de cada username del journal: el último con followers o,
+    si todos fallaron, el último fallido. Con `usernames` solo se devuelven esos.
+    Dos pasadas para no cargar los registros en memoria (solo un índice por username)
+    """
+    chosen = {}
+    for line, record in enumerate(iter_jsonl(filename)):
+        username = record.get('username')
+        if usernames is not None and username not in usernames:
+            continue
+        ok = record.get('followers') is not None
+        previous = chosen.get(username)
+        if previous is None or ok or not previous[1]:
+            chosen[username] = (line, ok)
+
+    lines = {line for line, _ in chosen.values()}
+    for line, record in enumerate(iter_jsonl(filename)):
+        if line in lines:
+            yield record
+
+
 def save_followers_data_json(followers_data, profile):
-    """Guarda datos de followers en JSON"""
+    """Guarda datos de followers en JSON (acepta cualquier iterable y lo escribe en streaming)"""
     filename = RESULTS_DIR / f"following_data_{profile}.json"
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(followers_data, f, indent=2, ensure_ascii=False)
+    with METRICS.timer('write', kind='followers_json'), open(filename, 'w', encoding='utf-8') as f:
+        f.write("[")
+        for i, item in enumerate(followers_data):
+            f.write(",\n  " if i else "\n  ")
+            f.write(json.dumps(item, ensure_ascii=False))
+        f.write("\n]\n")
     
     print(f" Datos JSON guardados en: {filename}")
     return filename
 
 
 def save_profile_data_excel(profile_data, profile):
-  
+    """Guarda los datos de perfil en Excel (acepta cualquier iterable y lo escribe en streaming)"""
     filename = RESULTS_DIR / f"profile_data_{profile}.xlsx"
     
-    df = pd.DataFrame(profile_data)
-    df.to_excel(filename, index=False)
+    with METRICS.timer('write', kind='profile_excel'), StreamingExcelWriter(filename) as writer:
+        for record in profile_data:
+            writer.write(record)
 
     print(f" Datos de perfil guardados en: {filename}")
     return filename
+
+
+# Columnas del dataset Parquet (la partición añade target y date)
+PARQUET_COLUMNS = ('username', 'followers', 'following', 'posts', 'bio', 'links', 'raw')
+
+
+def _parquet_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('username', pa.string()),
+        ('followers', pa.int64()),
+        ('following', pa.int64()),
+        ('posts', pa.int64()),
+        ('bio', pa.string()),
+        ('links', pa.list_(pa.string())),
+        ('raw', pa.string())
+    ])
+
+
+def _parquet_row(record):
+    """Registro de perfil con los tipos del esquema Parquet"""
+    row = {}
+    for col in ('followers', 'following', 'posts'):
+        value = record.get(col)
+        row[col] = value if isinstance(value, int) and not isinstance(value, bool) else None
+    for col in ('username', 'bio', 'raw'):
+        value = record.get(col)
+        row[col] = None if value is None else str(value)
+    row['links'] = [str(link) for link in (record.get('links') or [])]
+    return row
+
+
+def parquet_partition(profile, day=None):
+    """Carpeta de la partición de un perfil y una fecha dentro del dataset"""
+    day = day or date.today().isoformat()
+    return DATASET_DIR / f"target={profile}" / f"date={day}"
+
+
+def save_profile_data_parquet(profile_data, profile, day=None):
+    """
+    Guarda los datos de perfil en el dataset Parquet (acepta cualquier iterable
+    y lo escribe en streaming por row groups). La partición del día se sustituye
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    folder = parquet_partition(profile, day)
+    folder.mkdir(parents=True, exist_ok=True)
+    filename = folder / "part-0.parquet"
+
+    schema = _parquet_schema()
+    batch_rows = OUTPUT_CONFIG['parquet_batch_rows']
+    rows = []
+
+    with METRICS.timer('write', kind='profile_parquet'), \
+            pq.ParquetWriter(filename, schema, compression=OUTPUT_CONFIG['parquet_compression']) as writer:
+        for record in profile_data:
+            rows.append(_parquet_row(record))
+            if len(rows) >= batch_rows:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+    print(f" Datos de perfil (Parquet) guardados en: {filename}")
+    return filename
+
+
+def select_profiles(usernames, max_profiles=None):
+    """Usernames que recorre la fase 2: orden estable (alfabético) y como máximo max_profiles"""
+    selected = sorted(usernames)
+    return selected[:max_profiles] if max_profiles else selected
+
+
+def journal_path(profile):
+    """Ruta del journal de la fase 2 para un perfil"""
+    return DATA_DIR / f"journal_{profile}.jsonl"
+
+
+def save_followers_state(followers, profile):
+    """Guarda el conjunto de followers de la fase 1 para poder reanudar"""
+    filename = DATA_DIR / f"followers_{profile}.json"
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(sorted(followers), f, ensure_ascii=False)
+
+    return filename
+
+
+def load_followers_state(profile):
+    """Carga el conjunto de followers de la fase 1 guardado (None si no existe)"""
+    filename = DATA_DIR / f"followers_{profile}.json"
+
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return set(json.load(f))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
@@ -0,0 +1,191 @@
+"""
+Archivo: metrics.py
+Descripción: Instrumentación de la ejecución: contadores, tiempos por fase,
+comandos WebDriver e histogramas de latencia, exportados a JSON y Prometheus
+"""
+
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from config import METRICS_CONFIG, ensure_dirs
+
+
+class Histogram:
+    """Histograma acumulativo con buckets fijos (segundos) al estilo Prometheus"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'max': round(self.max, 6),
+            'buckets': {str(b): c for b, c in zip(self.buckets, self.counts)}
+        }
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class Metrics:
+    """Registro de métricas de una ejecución (contadores e histogramas con etiquetas)"""
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or METRICS_CONFIG['buckets']
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """Incrementa un contador"""
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        """Registra una duración en el histograma `name`"""
+        key = _key(name, labels)
+        with self._lock:
+            if key not in self.histograms:
+                self.histograms[key] = Histogram(self.buckets)
+            self.histograms[key].observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Mide la duración del bloque, también si termina con una excepción"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+    def report(self):
+        """Métricas como dict serializable"""
+        with self._lock:
+            return {
+                'started': datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                'elapsed_seconds': round(time.time() - self.started, 3),
+                'counters': [
+                    {'name': name, 'labels': dict(labels), 'value': value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                'histograms': [
+                    {'name': name, 'labels': dict(labels), **hist.to_dict()}
+                    for (name, labels), hist in sorted(self.histograms.items())
+                ]
+            }
+
+    def prometheus(self):
+        """Métricas en formato de texto de Prometheus"""
+        prefix = METRICS_CONFIG['prefix']
+        lines = []
+
+        def fmt(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{fmt(labels)} {value}")
+
+            for (name, labels), hist in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}_seconds"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f"{metric}_bucket{fmt(labels, [('le', bound)])} {count}")
+                lines.append(f"{metric}_bucket{fmt(labels, [('le', '+Inf')])} {hist.count}")
+                lines.append(f"{metric}_sum{fmt(labels)} {hist.sum:.6f}")
+                lines.append(f"{metric}_count{fmt(labels)} {hist.count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def print_summary(self):
+        """Resumen por consola: tiempo total de cada histograma"""
+        with self._lock:
+            items = sorted(self.histograms.items(), key=lambda kv: -kv[1].sum)
+        print("\n⏱️ Reparto del tiempo:")
+        for (name, labels), hist in items:
+            label = ','.join(f"{k}={v}" for k, v in labels)
+            label = f"{name}[{label}]" if label else name
+            print(f"   {label:<45} {hist.sum:9.2f} s  ({hist.count} veces)")
+
+    def export(self, name=None):
+        """Guarda el informe JSON y el archivo Prometheus; devuelve sus rutas"""
+        ensure_dirs()
+        out_dir = METRICS_CONFIG['dir']
+        out_dir.mkdir(exist_ok=True)
+        stem = name or f"run_{datetime.now():%Y%m%d_%H%M%S}"
+
+        json_file = out_dir / f"{stem}.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2, ensure_ascii=False)
+
+        prom_file = out_dir / f"{stem}.prom"
+        with open(prom_file, 'w', encoding='utf-8') as f:
+            f.write(self.prometheus())
+
+        print(f"📈 Métricas guardadas en: {json_file} y {prom_file}")
+        return json_file, prom_file
+
+
+# Registro global de la ejecución
+METRICS = Metrics()
+
+
+def instrument_driver(driver, metrics=METRICS):
+    """
+    Envuelve `driver.execute` en la instancia para contar y medir cada comando
+    WebDriver (get, page_source, execute_script, CDP...). Devuelve el driver
+    """
+    if getattr(driver, '_metrics_instrumented', False):
+        return driver
+
+    execute = driver.execute
+
+    def timed_execute(driver_command, params=None):
+        start = time.perf_counter()
+        try:
+            return execute(driver_command, params)
+        except Exception:
+            metrics.inc('webdriver_errors', command=driver_command)
+            raise
+        finally:
+            metrics.inc('webdriver_commands', command=driver_command)
+            metrics.observe('webdriver_command', time.perf_counter() - start, command=driver_command)
+
+    driver.execute = timed_execute
+    driver._metrics_instrumented = True
+    return driver
@@ -0,0 +1,92 @@
+"""
+Archivo: pacing.py
+Descripción: Control del ritmo de scroll basado en condiciones observables
+"""
+
+import time
+import random
+from config import SCRAPING_CONFIG
+
+# Motivos de fin de la extracción
+END_LIMIT = 'limit'
+END_OF_LIST = 'end'
+END_STALL = 'stall'
+
+END_REASONS = {
+    END_LIMIT: 'límite alcanzado',
+    END_OF_LIST: 'fin de la lista',
+    END_STALL: 'carga estancada'
+}
+
+
+class ScrollPacer:
+    """
+    Espera a que el modal cargue filas nuevas (o a que termine la petición
+    de carga) en lugar de dormir un tiempo fijo tras cada scroll
+    """
+
+    def __init__(self, min_interval=None, jitter=None, poll_interval=None,
+                 wait_timeout=None, settle_time=None, max_idle=None):
+        self.min_interval = SCRAPING_CONFIG['scroll_min_interval'] if min_interval is None else min_interval
+        self.jitter = SCRAPING_CONFIG['scroll_jitter'] if jitter is None else jitter
+        self.poll_interval = SCRAPING_CONFIG['scroll_poll_interval'] if poll_interval is None else poll_interval
+        self.wait_timeout = SCRAPING_CONFIG['scroll_wait_timeout'] if wait_timeout is None else wait_timeout
+        self.settle_time = SCRAPING_CONFIG['scroll_settle_time'] if settle_time is None else settle_time
+        self.max_idle = SCRAPING_CONFIG['no_change_max'] if max_idle is None else max_idle
+
+        self.idle_count = 0
+        self.scrolls = 0
+        self._last_scroll = None
+
+    def pace(self):
+        """Respeta el intervalo mínimo (con jitter) desde el último scroll"""
+        interval = random.uniform(self.min_interval, self.min_interval + self.jitter)
+        if self._last_scroll is not None:
+            remaining = interval - (time.monotonic() - self._last_scroll)
+            if remaining > 0:
+                time.sleep(remaining)
+        self._last_scroll = time.monotonic()
+        self.scrolls += 1
+
+    def wait_for_rows(self, poll, baseline):
+        """
+        Llama a `poll()` hasta que el total de filas supere `baseline`, la
+        petición de carga termine sin filas nuevas o se agote el timeout.
+        Devuelve el último estado leído (None si el modal desapareció)
+        """
+        start = time.monotonic()
+        saw_loading = False
+        status = None
+
+        while time.monotonic() - start < self.wait_timeout:
+            time.sleep(self.poll_interval)
+            status = poll()
+            if status is None:
+                return None
+
+            if status['total'] > baseline:
+                self.idle_count = 0
+                return status
+
+            if status['loading']:
+                saw_loading = True
+                continue
+
+            # La petición terminó sin filas nuevas, o nunca empezó estando al final
+            if saw_loading or (status['atBottom'] and time.monotonic() - start >= self.settle_time):
+                break
+
+        self.idle_count += 1
+        return status
+
+    def register_idle(self):
+        """Cuenta un intento sin progreso (ej. un error durante la extracción)"""
+        self.idle_count += 1
+
+    def end_reason(self, status):
+        """Motivo de fin si se agotaron los intentos sin progreso, si no None"""
+        if self.idle_count < self.max_idle:
+            return None
+        if status and status['atBottom'] and not status['loading']:
+            return END_OF_LIST
+        return END_STALL
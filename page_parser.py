@@ -0,0 +1,158 @@
+"""
+Archivo: page_parser.py
+Descripción: Parseo offline de snapshots HTML (sin round-trips a WebDriver)
+"""
+
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# Elementos sin etiqueta de cierre
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# Elementos cuyo contenido no es texto visible
+SKIP_TAGS = {'script', 'style', 'noscript', 'template'}
+
+# Elementos de bloque: su texto va en líneas separadas (como el .text de Selenium)
+BLOCK_TAGS = {
+    'address', 'article', 'aside', 'blockquote', 'dd', 'div', 'dl', 'dt',
+    'fieldset', 'figcaption', 'figure', 'footer', 'form', 'h1', 'h2', 'h3',
+    'h4', 'h5', 'h6', 'header', 'hr', 'li', 'main', 'nav', 'ol', 'p', 'pre',
+    'section', 'table', 'tr', 'ul'
+}
+
+_WHITESPACE = re.compile(r'[ \t\r\n\f]+')
+
+
+class Node:
+    """Nodo mínimo del árbol HTML"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'parent', '_text')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.children = []
+        self.parent = parent
+        self._text = None
+
+    def get(self, name, default=None):
+        """Devuelve un atributo del nodo"""
+        return self.attrs.get(name, default)
+
+    @property
+    def text(self):
+        """Texto visible del nodo, con una línea por bloque (equivalente a element.text)"""
+        if self._text is None:
+            parts = []
+            for child in self.children:
+                if isinstance(child, str):
+                    parts.append(_WHITESPACE.sub(' ', child))
+                elif child.tag == 'br':
+                    parts.append('\n')
+                elif child.tag in BLOCK_TAGS:
+                    parts.append('\n' + child.text + '\n')
+                else:
+                    parts.append(child.text)
+
+            lines = (' '.join(line.split()) for line in ''.join(parts).split('\n'))
+            self._text = '\n'.join(line for line in lines if line)
+        return self._text
+
+    def iter(self):
+        """Recorre todos los descendientes en orden de documento (equivalente a .//*)"""
+        stack = [c for c in reversed(self.children) if isinstance(c, Node)]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(c for c in reversed(node.children) if isinstance(c, Node))
+
+    def find_all(self, tag):
+        """Descendientes con la etiqueta indicada"""
+        return [node for node in self.iter() if node.tag == tag]
+
+
+class PageSnapshot:
+    """Snapshot de una página: HTML crudo más los nodos que usan las heurísticas"""
+
+    def __init__(self, source, url=None):
+        self.source = source or ''
+        self.url = url
+        self.root = Node('#document')
+        self.header = None
+        self.metas = []
+        self.title_spans = []
+
+    def meta_content(self, prop=None, name=None):
+        """Contenido del primer <meta> cuyo property o name coincida"""
+        for attrs in self.metas:
+            if (prop and attrs.get('property') == prop) or (name and attrs.get('name') == name):
+                return attrs.get('content')
+        return None
+
+    def absolute(self, href):
+        """Resuelve un href relativo contra la URL de la página"""
+        return urljoin(self.url, href) if self.url else href
+
+
+class _TreeBuilder(HTMLParser):
+    """Construye el árbol de un snapshot en una sola pasada"""
+
+    def __init__(self, page):
+        super().__init__(convert_charrefs=True)
+        self.page = page
+        self.stack = [page.root]
+        self.skip_depth = 0
+
+    def _add(self, tag, attrs):
+        parent = self.stack[-1]
+        node = Node(tag, {k: (v if v is not None else '') for k, v in attrs}, parent)
+        parent.children.append(node)
+
+        if tag == 'meta':
+            self.page.metas.append(node.attrs)
+        elif tag == 'header' and self.page.header is None:
+            self.page.header = node
+        elif tag == 'span' and 'title' in node.attrs:
+            self.page.title_spans.append(node)
+        return node
+
+    def handle_starttag(self, tag, attrs):
+        node = self._add(tag, attrs)
+        if tag in VOID_TAGS:
+            return
+        self.stack.append(node)
+        if tag in SKIP_TAGS:
+            self.skip_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._add(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Cerrar hasta la etiqueta correspondiente (tolera HTML mal anidado)
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                for node in self.stack[i:]:
+                    if node.tag in SKIP_TAGS:
+                        self.skip_depth -= 1
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self.skip_depth:
+            return
+        self.stack[-1].children.append(data)
+
+
+def parse_page(source, url=None):
+    """Parsea el HTML de una página y devuelve un PageSnapshot"""
+    page = PageSnapshot(source, url)
+    builder = _TreeBuilder(page)
+    builder.feed(page.source)
+    builder.close()
+    return page
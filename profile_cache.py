@@ -0,0 +1,92 @@
+"""
+Archivo: profile_cache.py
+Descripción: Caché persistente (SQLite) de datos de perfil entre ejecuciones
+"""
+
+import json
+import time
+import sqlite3
+from config import CACHE_CONFIG, ensure_dirs
+
+
+class ProfileCache:
+    """
+    Caché de registros de perfil por username con TTL y tamaño máximo.
+    Al superar el tamaño se expulsan las entradas usadas hace más tiempo (LRU)
+    """
+
+    def __init__(self, path=None, ttl_hours=None, max_entries=None):
+        self.path = path or CACHE_CONFIG['file']
+        self.ttl = (CACHE_CONFIG['ttl_hours'] if ttl_hours is None else ttl_hours) * 3600
+        self.max_entries = CACHE_CONFIG['max_entries'] if max_entries is None else max_entries
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+        ensure_dirs()
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                username    TEXT PRIMARY KEY,
+                record      TEXT NOT NULL,
+                fetched_at  REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_accessed ON profiles(accessed_at)")
+        self.conn.commit()
+
+    def get(self, username):
+        """Devuelve el registro si está en caché y no ha caducado, si no None"""
+        row = self.conn.execute(
+            "SELECT record, fetched_at FROM profiles WHERE username = ?", (username,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        record, fetched_at = row
+        if time.time() - fetched_at > self.ttl:
+            # Entrada caducada: se refrescará con el siguiente put()
+            self.misses += 1
+            self.stale += 1
+            return None
+
+        self.conn.execute(
+            "UPDATE profiles SET accessed_at = ? WHERE username = ?", (time.time(), username)
+        )
+        self.conn.commit()
+        self.hits += 1
+        return json.loads(record)
+
+    def put(self, username, record):
+        """Guarda (o refresca) el registro de un username"""
+        now = time.time()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profiles (username, record, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (username, json.dumps(record, ensure_ascii=False), now, now)
+        )
+        self.conn.commit()
+
+    def evict(self):
+        """Elimina entradas caducadas y las menos usadas si se supera max_entries"""
+        self.conn.execute("DELETE FROM profiles WHERE fetched_at < ?", (time.time() - self.ttl,))
+        self.conn.execute("""
+            DELETE FROM profiles WHERE username IN (
+                SELECT username FROM profiles ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+        self.conn.commit()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def summary(self):
+        """Resumen de aciertos y fallos de la caché"""
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale}
+
+    def close(self):
+        """Aplica la política de expulsión y cierra la base de datos"""
+        self.evict()
+        self.conn.close()
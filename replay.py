@@ -0,0 +1,352 @@
+"""
+Archivo: replay.py
+Descripción: Grabación de snapshots de páginas y servidor HTTP local que las
+reproduce, para medir el pipeline de scraping sin conexión y de forma determinista
+
+Uso:
+    python replay.py record --name demo --target perfil --limit 200 --max-profiles 50
+    python replay.py serve --name demo --port 8765
+    INSTAGRAM_BASE_URL=http://127.0.0.1:8765 python scrape_followers.py --target perfil:200
+    python replay.py bench --name demo --target perfil --limit 200 --max-profiles 50
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from config import DATA_DIR, RESULTS_DIR, INSTAGRAM_URLS, SCRAPING_CONFIG, ensure_dirs, set_instagram_base
+
+FIXTURES_DIR = DATA_DIR / "fixtures"
+
+# Scripts ejecutables (no los JSON embebidos, que usan las heurísticas de extracción)
+_SCRIPT_TAG = re.compile(
+    r'<script\b(?![^>]*type="application/(?:ld\+)?json")[^>]*>.*?</script>',
+    re.S | re.I
+)
+
+# Modal de followers simulado: se abre al pulsar el enlace /followers y carga
+# filas por páginas al llegar al final, con un indicador de carga mientras tanto
+_MODAL_SCRIPT = """
+<script>
+(function () {
+    const usernames = __USERNAMES__;
+    const pageSize = __PAGE_SIZE__;
+    const latency = __LATENCY_MS__;
+
+    document.addEventListener('click', function (ev) {
+        const link = ev.target.closest && ev.target.closest("a[href*='/followers']");
+        if (!link) return;
+        ev.preventDefault();
+        openModal();
+    }, true);
+
+    function openModal() {
+        if (document.querySelector("div[role='dialog']")) return;
+        const dialog = document.createElement('div');
+        dialog.setAttribute('role', 'dialog');
+        dialog.style.cssText = 'position:fixed;top:10%;left:30%;width:400px;height:400px;background:#fff;';
+        const box = document.createElement('div');
+        box.className = 'followers-scroll';
+        box.style.cssText = 'height:100%;overflow-y:auto;';
+        const list = document.createElement('div');
+        list.className = 'followers-rows';
+        box.appendChild(list);
+        dialog.appendChild(box);
+        document.body.appendChild(dialog);
+
+        let next = 0;
+        let loading = false;
+
+        function render() {
+            const end = Math.min(next + pageSize, usernames.length);
+            for (; next < end; next++) {
+                const row = document.createElement('div');
+                row.style.height = '60px';
+                const a = document.createElement('a');
+                a.href = '/' + usernames[next] + '/';
+                a.textContent = usernames[next];
+                row.appendChild(a);
+                list.appendChild(row);
+            }
+        }
+
+        function loadMore() {
+            if (loading || next >= usernames.length) return;
+            loading = true;
+            const spinner = document.createElement('div');
+            spinner.setAttribute('role', 'progressbar');
+            box.appendChild(spinner);
+            setTimeout(function () {
+                render();
+                spinner.remove();
+                loading = false;
+            }, latency);
+        }
+
+        box.addEventListener('scroll', function () {
+            if (box.scrollTop + box.clientHeight >= box.scrollHeight - 50) loadMore();
+        });
+        render();
+    }
+})();
+</script>
+"""
+
+
+def _page_file(fixture_dir, path):
+    """Archivo del snapshot para una ruta de URL (ej. /perfil/ -> pages/perfil/index.html)"""
+    parts = [p for p in path.split('/') if p and p not in ('.', '..')]
+    return fixture_dir.joinpath('pages', *parts, 'index.html')
+
+
+class FixtureRecorder:
+    """Guarda snapshots de las páginas que visita el driver y listas de followers"""
+
+    def __init__(self, driver, name):
+        self.driver = driver
+        self.fixture_dir = FIXTURES_DIR / name
+        self.base = INSTAGRAM_URLS['home']
+        self.pages = []
+
+    def record(self, url=None, wait_header=True):
+        """Guarda el HTML actual (o el de `url`, navegando antes) sin scripts ejecutables"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
+        if url is not None:
+            self.driver.get(url)
+        if wait_header:
+            try:
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "header"))
+                )
+            except TimeoutException:
+                pass
+        current = url or self.driver.current_url
+        source = _SCRIPT_TAG.sub('', self.driver.page_source)
+        # Enlaces absolutos al sitio real -> rutas locales
+        source = source.replace(self.base, '/')
+
+        path = urlparse(current).path or '/'
+        filename = _page_file(self.fixture_dir, path)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text(source, encoding='utf-8')
+        self.pages.append(path)
+        return filename
+
+    def record_followers(self, profile, usernames):
+        """Guarda la lista de followers que el servidor servirá en el modal simulado"""
+        filename = self.fixture_dir / 'followers' / f'{profile}.json'
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        filename.write_text(json.dumps(sorted(usernames), ensure_ascii=False), encoding='utf-8')
+        return filename
+
+    def save_manifest(self):
+        """Escribe el manifiesto de la grabación"""
+        manifest = {
+            'base': self.base,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'pages': sorted(set(self.pages))
+        }
+        filename = self.fixture_dir / 'manifest.json'
+        filename.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        return filename
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Sirve los snapshots grabados e inyecta el modal simulado en los perfiles objetivo"""
+
+    fixture_dir = None
+    page_size = 12
+    latency_ms = 300
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        filename = _page_file(self.fixture_dir, path)
+
+        if not filename.exists():
+            body = b"<html><body><h1>404</h1></body></html>"
+            self.send_response(404)
+        else:
+            html = filename.read_text(encoding='utf-8')
+            parts = [p for p in path.split('/') if p]
+            followers_file = self.fixture_dir / 'followers' / f'{parts[0]}.json' if parts else None
+
+            if followers_file is not None and followers_file.exists():
+                script = (_MODAL_SCRIPT
+                          .replace('__USERNAMES__', followers_file.read_text(encoding='utf-8'))
+                          .replace('__PAGE_SIZE__', str(self.page_size))
+                          .replace('__LATENCY_MS__', str(self.latency_ms)))
+                html = html.replace('</body>', script + '</body>') if '</body>' in html else html + script
+
+            body = html.encode('utf-8')
+            self.send_response(200)
+
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(name, port=8765, page_size=12, latency_ms=300):
+    """Arranca el servidor de replay en un hilo y devuelve (server, base_url)"""
+    fixture_dir = FIXTURES_DIR / name
+    if not fixture_dir.exists():
+        raise FileNotFoundError(f"No existe la grabación {fixture_dir}")
+
+    handler = type('ReplayHandler', (_ReplayHandler,), {
+        'fixture_dir': fixture_dir,
+        'page_size': page_size,
+        'latency_ms': latency_ms
+    })
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def cmd_record(args):
+    """Graba home, perfil objetivo, su lista de followers y los perfiles de la fase 2"""
+    from browser import init_browser
+    from auth import check_saved_session, load_cookies, verify_session
+    from scraper import scrape_followers
+
+    if not check_saved_session():
+        print(" Se necesita una sesión válida (cookies) para grabar")
+        return 1
+
+    driver = init_browser(detach=False)
+    try:
+        loaded = load_cookies(driver)
+        if loaded:
+            driver.get(INSTAGRAM_URLS['home'])
+        if not loaded or not verify_session(driver):
+            print(" Se necesita una sesión válida (cookies) para grabar")
+            return 1
+
+        recorder = FixtureRecorder(driver, args.name)
+        recorder.record(INSTAGRAM_URLS['home'], wait_header=False)
+        recorder.record(INSTAGRAM_URLS['profile'].format(username=args.target))
+
+        followers = scrape_followers(driver, args.target, args.limit)
+        recorder.record_followers(args.target, followers)
+
+        for username in sorted(followers)[:args.max_profiles]:
+            recorder.record(INSTAGRAM_URLS['profile'].format(username=username))
+            time.sleep(SCRAPING_CONFIG['request_delay_min'])
+
+        print(f" Grabación guardada en: {recorder.save_manifest().parent}")
+        return 0
+    finally:
+        driver.quit()
+
+
+def cmd_serve(args):
+    """Sirve una grabación hasta Ctrl-C"""
+    server, base = start_server(args.name, args.port, args.page_size, args.latency_ms)
+    print(f" Sirviendo {args.name} en {base}")
+    print(f" Usa: INSTAGRAM_BASE_URL={base} python scrape_followers.py --target ...")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+def cmd_bench(args):
+    """Mide el pipeline completo (fases 1 y 2) contra una grabación, sin pausas humanas"""
+    server, base = start_server(args.name, args.port, args.page_size, args.latency_ms)
+    set_instagram_base(base)
+    SCRAPING_CONFIG['delay_scale'] = 0
+
+    from browser import init_browser
+    from scraper import scrape_followers, collect_followers_data
+
+    driver = init_browser(headless=True, detach=False, lightweight=args.lightweight)
+    try:
+        driver.get(INSTAGRAM_URLS['home'])
+
+        start = time.perf_counter()
+        followers, stats = scrape_followers(driver, args.target, args.limit, return_stats=True)
+        phase1 = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, profiles = collect_followers_data(driver, followers, max_profiles=args.max_profiles)
+        phase2 = time.perf_counter() - start
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    report = {
+        'fixture': args.name,
+        'target': args.target,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'followers': len(followers),
+        'end_reason': stats['end_reason'],
+        'lightweight': args.lightweight,
+        'phase1_s': round(phase1, 3),
+        'phase2_s': round(phase2, 3),
+        'profiles': len(profiles),
+        'profiles_per_s': round(len(profiles) / phase2, 2) if phase2 else None
+    }
+
+    ensure_dirs()
+    suffix = "_lightweight" if args.lightweight else ""
+    filename = RESULTS_DIR / f"bench_replay_{args.name}{suffix}.json"
+    filename.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(json.dumps(report, indent=2))
+    print(f" Resultados guardados en: {filename}")
+    return 0
+
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Grabación y replay offline de páginas de Instagram")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    record = sub.add_parser('record', help="Graba snapshots desde el sitio real")
+    record.add_argument('--name', required=True, help="Nombre de la grabación")
+    record.add_argument('--target', required=True, help="Perfil objetivo")
+    record.add_argument('--limit', type=int, default=100, help="Followers a grabar")
+    record.add_argument('--max-profiles', type=int, default=SCRAPING_CONFIG['max_profiles'],
+                        help="Perfiles de followers a grabar")
+    record.set_defaults(func=cmd_record)
+
+    for nombre, ayuda, func in (('serve', "Sirve una grabación", cmd_serve),
+                                ('bench', "Mide el pipeline contra una grabación", cmd_bench)):
+        cmd = sub.add_parser(nombre, help=ayuda)
+        cmd.add_argument('--name', required=True, help="Nombre de la grabación")
+        cmd.add_argument('--port', type=int, default=8765 if nombre == 'serve' else 0,
+                         help="Puerto local (0 = libre)")
+        cmd.add_argument('--page-size', type=int, default=12, help="Filas por carga del modal simulado")
+        cmd.add_argument('--latency-ms', type=int, default=300, help="Latencia simulada de cada carga")
+        if nombre == 'bench':
+            cmd.add_argument('--target', required=True, help="Perfil objetivo grabado")
+            cmd.add_argument('--limit', type=int, default=100, help="Límite de followers")
+            cmd.add_argument('--max-profiles', type=int, default=SCRAPING_CONFIG['max_profiles'],
+                             help="Perfiles a recopilar en la fase 2")
+            cmd.add_argument('--lightweight', action='store_true',
+                             help="Navegador en modo ligero (para comparar con el normal)")
+        cmd.set_defaults(func=func)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Función principal"""
+    args = parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
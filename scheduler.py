@@ -0,0 +1,109 @@
+"""
+Archivo: scheduler.py
+Descripción: Planificador que respeta el espaciado mínimo entre navegaciones
+(token bucket) y aprovecha las esperas para ejecutar trabajo local pendiente
+(parseo, escritura del journal, caché...)
+"""
+
+import time
+import random
+from collections import deque
+from contextlib import contextmanager
+from config import SCRAPING_CONFIG
+from metrics import METRICS
+
+
+class Scheduler:
+    """
+    Token bucket de navegaciones: hay `burst` tokens y cada uno vuelve al bucket
+    un intervalo aleatorio (request_delay_min..max) después de que termine la
+    visita que lo usó, igual que la pausa de human_delay entre perfiles.
+    Mientras se espera un token (o una pausa), se ejecutan las tareas encoladas
+    con `submit()`; si no hay tareas, se duerme el tiempo restante
+    """
+
+    def __init__(self, min_interval=None, max_interval=None, burst=None):
+        self.min_interval = SCRAPING_CONFIG['request_delay_min'] if min_interval is None else min_interval
+        self.max_interval = SCRAPING_CONFIG['request_delay_max'] if max_interval is None else max_interval
+        self.burst = SCRAPING_CONFIG['navigation_burst'] if burst is None else burst
+
+        self._tasks = deque()
+        self._in_use = 0
+        self._refills = []
+        self.overlapped = 0.0   # Segundos de trabajo local hechos durante esperas
+        self.slept = 0.0        # Segundos de espera sin nada que hacer
+
+    def _interval(self):
+        return random.uniform(self.min_interval, self.max_interval) * SCRAPING_CONFIG['delay_scale']
+
+    # --- Trabajo local ---
+
+    def submit(self, func, *args, **kwargs):
+        """Encola trabajo local para ejecutarlo en la próxima espera"""
+        self._tasks.append((func, args, kwargs))
+
+    def run_pending(self, deadline=None):
+        """Ejecuta tareas en orden hasta vaciar la cola o alcanzar `deadline`"""
+        while self._tasks and (deadline is None or time.monotonic() < deadline):
+            func, args, kwargs = self._tasks.popleft()
+            start = time.perf_counter()
+            try:
+                func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                if deadline is not None:
+                    self.overlapped += elapsed
+                METRICS.observe('scheduler_task', elapsed)
+
+    def drain(self):
+        """Ejecuta todas las tareas pendientes"""
+        self.run_pending()
+
+    def wait_until(self, deadline):
+        """Espera hasta `deadline` haciendo trabajo local mientras tanto"""
+        self.run_pending(deadline)
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            with METRICS.timer('human_delay'):
+                time.sleep(remaining)
+            self.slept += remaining
+
+    def delay(self, min_sec=None, max_sec=None):
+        """Como human_delay, pero la pausa se aprovecha para el trabajo pendiente"""
+        if min_sec is None:
+            min_sec = SCRAPING_CONFIG['request_delay_min']
+        if max_sec is None:
+            max_sec = SCRAPING_CONFIG['request_delay_max']
+        seconds = random.uniform(min_sec, max_sec) * SCRAPING_CONFIG['delay_scale']
+        self.wait_until(time.monotonic() + seconds)
+
+    # --- Navegaciones ---
+
+    def acquire(self):
+        """Espera a que haya un token de navegación disponible y lo toma"""
+        while True:
+            now = time.monotonic()
+            self._refills = [t for t in self._refills if t > now]
+            if self._in_use + len(self._refills) < self.burst:
+                self._in_use += 1
+                return
+            if not self._refills:
+                raise RuntimeError("Todos los tokens de navegación están en uso")
+            self.wait_until(min(self._refills))
+
+    def release(self):
+        """Fin de la visita: el token vuelve al bucket tras el intervalo"""
+        self._in_use -= 1
+        self._refills.append(time.monotonic() + self._interval())
+
+    @contextmanager
+    def navigation(self):
+        """`with scheduler.navigation():` delimita una visita al navegador"""
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def summary(self):
+        return {'overlapped': round(self.overlapped, 2), 'slept': round(self.slept, 2)}
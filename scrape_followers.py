@@ -1,110 +1,460 @@
 """
 Archivo: scrape_followers.py (PRINCIPAL)
 Descripción: Orquestador principal del scraping
+
+Uso:
+    python scrape_followers.py                       # modo interactivo
+    python scrape_followers.py --resume              # reanuda la última ejecución
+    python scrape_followers.py --target perfil1:200 --target perfil2:500
+    python scrape_followers.py --job trabajos.json   # lote desatendido
+    python scrape_followers.py --watch trabajos/     # servicio: procesa cada trabajo nuevo
+    python scrape_followers.py --target perfil --only-new   # fase 2 solo para followers nuevos
 """
 
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
 from browser import init_browser
-from auth import load_credentials, load_cookies, login, verify_session
+from auth import load_credentials, load_cookies, login, verify_session, check_saved_session
 from scraper import scrape_followers, collect_followers_data
-from file_manager import save_followers_txt, save_followers_data_json, save_profile_data_excel
-from benford_analysis import analizar_benford
-from utils import human_delay
+from file_manager import (save_followers_txt, save_followers_data_json, save_profile_data_excel,
+                          save_profile_data_parquet, save_followers_state, load_followers_state,
+                          journal_path, iter_jsonl, iter_journal, select_profiles)
+from benford_analysis import analizar_benford, AcumuladorBenford
+import benford_render
+from bio_analysis import analizar_bios
+from profile_cache import ProfileCache
+from snapshots import save_snapshot, load_snapshot, diff_snapshots, to_array, to_names
+from session_pool import SessionPool, SessionStartError, RequestBudgetExceeded
+from config import ANALYSIS_CONFIG, OUTPUT_CONFIG, RENDER_CONFIG, BIO_CONFIG, CACHE_CONFIG, SCRAPING_CONFIG, SELENIUM_CONFIG, SESSION_CONFIG, INSTAGRAM_URLS, METRICS_CONFIG, ensure_dirs
+from metrics import METRICS
+
+
+def parse_args(argv=None):
+    """Argumentos de línea de comandos (args.targets: objetivos del modo por lotes)"""
+    parser = argparse.ArgumentParser(description="Instagram followers scraper + análisis de Benford")
+    parser.add_argument('--resume', action='store_true',
+                        help="Reanuda una ejecución interrumpida (reutiliza la fase 1 y el journal de la fase 2)")
+    parser.add_argument('--job', metavar='ARCHIVO',
+                        help="Archivo JSON con la lista de objetivos a procesar sin intervención")
+    parser.add_argument('--target', action='append', default=[], metavar='PERFIL[:LIMITE]',
+                        help="Objetivo a procesar sin intervención (se puede repetir)")
+    parser.add_argument('--limit', type=int, default=100,
+                        help="Límite de followers por defecto para los objetivos sin límite propio")
+    parser.add_argument('--max-profiles', type=int, default=SCRAPING_CONFIG['max_profiles'],
+                        help="Perfiles a recopilar en la fase 2 por defecto")
+    parser.add_argument('--only-new', action='store_true',
+                        help="En la fase 2 solo visita los followers nuevos desde el último snapshot")
+    parser.add_argument('--lightweight', action='store_true',
+                        help="Modo ligero: sin imágenes, vídeo ni fuentes y carga 'eager'")
+    parser.add_argument('--watch', metavar='CARPETA',
+                        help="Mantiene los navegadores abiertos y procesa cada archivo de trabajo nuevo de la carpeta")
+    args = parser.parse_args(argv)
+    try:
+        args.targets = load_targets(args)
+    except OSError as e:
+        parser.error(f"no se pudo leer el archivo de trabajo: {e}")
+    except ValueError as e:
+        parser.error(str(e))
+    return args
+
+
+def _target(profile, limit, max_profiles):
+    """Objetivo normalizado; ValueError si falta el perfil o un límite no es un entero positivo"""
+    profile = str(profile).strip().lstrip('@')
+    if not profile:
+        raise ValueError("objetivo sin perfil")
+    try:
+        target = {'profile': profile, 'limit': int(limit), 'max_profiles': int(max_profiles)}
+    except (TypeError, ValueError):
+        raise ValueError(f"límites no válidos para @{profile}: {limit!r}, {max_profiles!r}") from None
+    if target['limit'] <= 0 or target['max_profiles'] <= 0:
+        raise ValueError(f"límites no válidos para @{profile}: deben ser positivos")
+    return target
+
+
+def job_targets(path, args):
+    """
+    Objetivos de un archivo de trabajo (ver load_targets). Un archivo que no es
+    JSON válido o con objetivos mal formados lanza ValueError
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        job = json.load(f)
+    if isinstance(job, dict):
+        job = job.get('targets', [])
+    if not isinstance(job, list):
+        raise ValueError("el trabajo debe ser una lista de objetivos o {\"targets\": [...]}")
+
+    targets = []
+    for item in job:
+        if isinstance(item, str):
+            item = {'profile': item}
+        if not isinstance(item, dict) or 'profile' not in item:
+            raise ValueError(f"objetivo sin \"profile\": {item!r}")
+        targets.append(_target(item['profile'], item.get('limit', args.limit),
+                               item.get('max_profiles', args.max_profiles)))
+    return targets
+
+
+def load_targets(args):
+    """
+    Objetivos del modo por lotes como lista de dicts {profile, limit, max_profiles}.
+    El archivo de trabajo es una lista JSON (o {"targets": [...]}) de objetos con
+    "profile" y, opcionalmente, "limit" y "max_profiles"
+    """
+    targets = job_targets(args.job, args) if args.job else []
+
+    for spec in args.target:
+        profile, _, limit = spec.partition(':')
+        try:
+            targets.append(_target(profile, limit or args.limit, args.max_profiles))
+        except ValueError as e:
+            raise ValueError(f"--target {spec}: {e}") from None
+
+    return targets
+
+
+def authenticate(driver, username, password, interactive=True):
+    """
+    Carga la sesión desde cookies (una sola navegación para verificarla) o hace
+    login (el login manual requiere modo interactivo). Informa del tiempo hasta
+    tener la sesión lista
+    """
+    print("\nAutenticando...")
+    start = time.perf_counter()
+    if load_cookies(driver):
+        # Las cookies ya están en el navegador: basta con cargar la portada
+        driver.get(INSTAGRAM_URLS['home'])
+
+        if verify_session(driver):
+            ready = time.perf_counter() - start
+            METRICS.observe('session_ready', ready, method='cookies')
+            print(f"⚡ Sesión lista en {ready:.1f} s")
+            return True
+        print(" Cookies inválidas, reintentando login...")
+    else:
+        print(" Login manual requerido...")
+
+    if not interactive:
+        print(" El modo por lotes necesita cookies válidas: ejecuta antes el modo interactivo para iniciar sesión")
+        return False
+
+    if not login(driver, username, password):
+        print(" Login fallido")
+        return False
+    METRICS.observe('session_ready', time.perf_counter() - start, method='login')
+    return True
+
+
+def run_target(driver, profile, limit, max_profiles, cache=None, resume=False, only_new=False):
+    """
+    Ejecuta las fases 1, 2 y 3 para un perfil objetivo y devuelve un resumen.
+    Con only_new=True la fase 2 solo visita los followers que no estaban en el
+    snapshot anterior y completa el journal existente con ellos
+    """
+    summary = {'profile': profile, 'followers': 0, 'end_reason': None, 'ok': False}
+
+    # Scraping de followers
+    print("\n" + "="*60)
+    print(f"FASE 1: EXTRACCIÓN DE FOLLOWERS (@{profile})")
+    print("="*60)
+    with METRICS.timer('phase', phase='1_followers'):
+        followers = load_followers_state(profile) if resume else None
+
+        if followers:
+            print(f"♻️ Reanudando: {len(followers)} followers recuperados de la ejecución anterior")
+            summary['end_reason'] = 'resume'
+        else:
+            followers, stats = scrape_followers(driver, profile, limit, return_stats=True)
+            summary['end_reason'] = stats['end_reason']
+
+            if not followers:
+                print("No se encontraron followers.")
+                return summary
+
+            save_followers_state(followers, profile)
+
+    summary['followers'] = len(followers)
+
+    # Guardar lista de followers
+    save_followers_txt(followers, profile)
+
+    # Snapshot del día y diferencias con el anterior
+    previous = load_snapshot(profile)
+    save_snapshot(profile, followers)
+    to_collect = followers
+    incremental = False
+    if previous is not None:
+        gained, lost = diff_snapshots(previous, to_array(followers))
+        print(f"📸 Desde el último snapshot: {len(gained)} followers nuevos, {len(lost)} perdidos")
+        if only_new:
+            to_collect = set(to_names(gained))
+            incremental = True
+
+    # Recopilar datos de followers
+    print("\n" + "="*60)
+    print("FASE 2: RECOPILACIÓN DE DATOS")
+    print("="*60)
+    journal = journal_path(profile)
+
+    # Perfiles que forman el resultado: la selección de esta ejecución (max_profiles)
+    # y, en modo incremental, los followers actuales ya recopilados antes
+    selected = set(select_profiles(to_collect, max_profiles))
+    if incremental:
+        selected |= {r['username'] for r in iter_jsonl(journal) if r['username'] in followers}
+
+    def current_records():
+        # El journal puede tener perdidos y perfiles de ejecuciones con otro
+        # max_profiles; un registro por username (el reintento sustituye al fallo)
+        return iter_journal(journal, selected)
+
+    # Benford en vivo: los conteos se actualizan con cada perfil recopilado
+    acumulador = AcumuladorBenford()
+    if incremental:
+        # Perfiles de ejecuciones anteriores que no se vuelven a visitar
+        for record in current_records():
+            acumulador.agregar(record['username'], record['followers'])
+
+    def on_record(record):
+        acumulador.agregar(record['username'], record['followers'])
+        if len(acumulador.valores) % ANALYSIS_CONFIG['live_every'] == 0:
+            print(f"  📈 {acumulador.lectura()}")
+
+    with METRICS.timer('phase', phase='2_profiles'):
+        # Los registros se escriben en streaming al journal, no se acumulan en memoria
+        # En modo incremental el journal conserva los perfiles de ejecuciones anteriores
+        collect_followers_data(
+            driver, to_collect, max_profiles=max_profiles, cache=cache,
+            journal=journal, resume=resume or incremental, keep_records=False,
+            on_record=on_record
+        )
+
+        # Guardar datos JSON
+        json_file = save_followers_data_json(
+            ({'username': r['username'], 'followers': r['followers']} for r in current_records()),
+            profile
+        )
+        #Guardar datos del perfil detallado
+        excel_file_profile = save_profile_data_excel(current_records(), profile)
+        # Dataset columnar particionado por perfil y fecha
+        parquet_file = save_profile_data_parquet(current_records(), profile) if OUTPUT_CONFIG['parquet'] else None
+
+
+    # Análisis de Benford
+    print("\n" + "="*60)
+    print("FASE 3: ANÁLISIS DE BENFORD")
+    print("="*60)
+    with METRICS.timer('phase', phase='3_benford'):
+        # Se reutilizan los conteos de la fase 2 en lugar de releer el JSON; la
+        # gráfica se dibuja en segundo plano mientras empieza el siguiente objetivo
+        benford_results = analizar_benford(json_file, profile, acumulador=acumulador,
+                                           segundo_plano=RENDER_CONFIG['background'])
+    print("Se guardan los resultados de los datos de los perfiles detallados")
+
+    # Intereses deportivos de las bios
+    bio_results = None
+    if BIO_CONFIG['enabled']:
+        print("\n" + "="*60)
+        print("FASE 4: INTERESES DEPORTIVOS (BIOS)")
+        print("="*60)
+        with METRICS.timer('phase', phase='4_bios'):
+            bio_results = analizar_bios(current_records(), profile)
+
+    if benford_results:
+        summary['ok'] = True
+        summary['benford'] = benford_results['pruebas']['primer_digito']['real'] * 100
+        print("\n" + "="*60)
+        print(" PROCESO COMPLETADO EXITOSAMENTE")
+        print("="*60)
+        print("\n Archivos generados:")
+        print(f"   • Lista de followers (TXT)")
+        print(f"   • Datos de followers (JSON): {json_file}")
+
+        print(f"   • Datos de perfil detallado (XLSX): {excel_file_profile}")
+        if parquet_file:
+            print(f"   • Datos de perfil detallado (Parquet): {parquet_file}")
+
+        print(f"   • Análisis Benford (XLSX): {benford_results['excel']}")
+        print(f"   • Gráfica Benford ({benford_results['png'].suffix[1:].upper()}): {benford_results['png']}")
+        if bio_results:
+            print(f"   • Intereses deportivos (JSON): {bio_results['json']}")
+        print("\n" + "="*60)
+
+    return summary
+
+
+def print_batch_summary(summaries):
+    """Resumen final del modo por lotes"""
+    print("\n" + "="*60)
+    print(" RESUMEN DEL LOTE")
+    print("="*60)
+    for s in summaries:
+        status = "✅" if s['ok'] else "❌"
+        print(f" {status} @{s['profile']}: {s['followers']} followers (fin: {s['end_reason']})")
+    print("="*60)
+
+
+def render_batch_panel(summaries, name="benford_panel_lote"):
+    """Encola el informe multipanel de Benford de los objetivos completados"""
+    done = [(s['profile'], s['benford']) for s in summaries if s.get('benford') is not None]
+    if len(done) > 1:
+        benford_render.en_segundo_plano(benford_render.renderizar_panel, done, name)
+        print(f"🖼️ Informe multipanel de {len(done)} objetivos en cola")
+
+
+def run_batch(pool, targets, cache=None, resume=False, only_new=False):
+    """Procesa los objetivos con sesiones del pool; un objetivo fallido no detiene a los siguientes"""
+    summaries = []
+
+    for index, target in enumerate(targets, 1):
+        print(f"\n[{index}/{len(targets)}] Objetivo @{target['profile']}")
+        try:
+            with pool.session() as session:
+                summaries.append(run_target(
+                    session.driver, target['profile'], target['limit'], target['max_profiles'],
+                    cache=cache, resume=resume, only_new=only_new
+                ))
+        except RequestBudgetExceeded as e:
+            # Sin presupuesto no tiene sentido seguir con el resto del lote
+            print(f"\n⛔ {e}: se detiene el lote")
+            summaries.append({'profile': target['profile'], 'followers': 0,
+                              'end_reason': 'budget', 'ok': False})
+            break
+        except SessionStartError:
+            raise
+        except Exception as e:
+            print(f"\n Error en @{target['profile']}: {e}")
+            summaries.append({'profile': target['profile'], 'followers': 0,
+                              'end_reason': 'error', 'ok': False})
+
+    return summaries
+
+
+def watch_jobs(folder, args, interval=None):
+    """
+    Genera (archivo, objetivos) por cada archivo de trabajo nuevo en la carpeta.
+    Solo se leen los archivos *.json: para publicar un trabajo se escribe con
+    otro nombre (ej. trabajo.json.tmp) y se renombra a .json al terminar.
+    Los trabajos procesados se mueven a CARPETA/done y los inválidos a
+    CARPETA/error, salvo si se modificaron en el último intervalo (pueden estar
+    escribiéndose) y se reintentan en la siguiente revisión; termina con Ctrl+C
+    """
+    folder = Path(folder)
+    interval = SESSION_CONFIG['watch_interval'] if interval is None else interval
+    done = folder / "done"
+    error = folder / "error"
+    done.mkdir(parents=True, exist_ok=True)
+    error.mkdir(parents=True, exist_ok=True)
+    print(f"\n👀 Esperando trabajos en {folder} (Ctrl+C para terminar)")
+
+    while True:
+        for job in sorted(folder.glob("*.json")):
+            try:
+                targets = job_targets(job, args)
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                if time.time() - job.stat().st_mtime < interval:
+                    continue
+                print(f"\n Trabajo {job.name} inválido, se mueve a {error}: {e}")
+                job.replace(error / job.name)
+                continue
+            yield job, targets
+            job.replace(done / job.name)
+        time.sleep(interval)
 
 
 def main():
     """Función principal"""
+    args = parse_args()
+    targets = args.targets
+    interactive = not targets and not args.watch
+    ensure_dirs()
+    if args.lightweight:
+        SELENIUM_CONFIG['lightweight'] = True
+
     print("\n" + "="*60)
     print("  INSTAGRAM FOLLOWERS SCRAPER + BENFORD ANALYSIS")
     print("="*60 + "\n")
-    
+
     # Cargar credenciales
     username, password = load_credentials()
-    
-    # Inicializar navegador
-    print("Iniciando navegador...")
-    driver = init_browser()
-    
-    try:
-        # Autenticación
-        print("\nAutenticando...")
-        cookies_loaded = load_cookies(driver)
-        
-        if not cookies_loaded:
-            print(" Login manual requerido...")
-            if not login(driver, username, password):
-                print(" Login fallido")
-                return
-        else:
-            driver.get("https://www.instagram.com/")
-            human_delay(3, 4)
-            
-            if not verify_session(driver):
-                print(" Cookies inválidas, reintentando login...")
-                if not login(driver, username, password):
-                    print(" Login fallido")
-                    return
-        
-        # Solicitar datos
-        print("\n" + "="*60)
-        profile = input(" Ingresa el username objetivo: ").strip()
-        limit = int(input(" Límite de seguidores a scrapear: "))
-        
-        # Scraping de followers
-        print("\n" + "="*60)
-        print("FASE 1: EXTRACCIÓN DE FOLLOWERS")
-        print("="*60)
-        followers = scrape_followers(driver, profile, limit)
-        
-        if not followers:
-            print("No se encontraron followers.")
-            return
-        
-        # Guardar lista de followers
-        save_followers_txt(followers, profile)
-        
-        # Recopilar datos de followers
-        print("\n" + "="*60)
-        print("FASE 2: RECOPILACIÓN DE DATOS")
-        print("="*60)
-        followers_data, followers_data_profile = collect_followers_data(driver, followers, max_profiles=100)
-        # Guardar datos JSON
-        json_file = save_followers_data_json(followers_data, profile)
-        #Guardar datos del perfil detallado
 
+    # Comprobación local de las cookies antes de lanzar ningún navegador
+    if not interactive and not check_saved_session():
+        print(" El modo por lotes necesita cookies válidas: ejecuta antes el modo interactivo para iniciar sesión")
+        return 1
 
+    cache = ProfileCache() if CACHE_CONFIG['enabled'] else None
+    driver = pool = None
+    summaries = []
 
-        excel_file_profile = save_profile_data_excel(followers_data_profile, profile)
+    try:
+        if interactive:
+            # Inicializar navegador (queda abierto al terminar)
+            print("Iniciando navegador...")
+            driver = init_browser()
 
+            if not authenticate(driver, username, password):
+                return 1
 
-        # Análisis de Benford
-        print("\n" + "="*60)
-        print("FASE 3: ANÁLISIS DE BENFORD")
-        print("="*60)
-        benford_results = analizar_benford(json_file, profile)
-        print("Se guardan los resultados de los datos de los perfiles detallados")
-        if benford_results:
-            print("\n" + "="*60)
-            print(" PROCESO COMPLETADO EXITOSAMENTE")
-            print("="*60)
-            print("\n Archivos generados:")
-            print(f"   • Lista de followers (TXT)")
-            print(f"   • Datos de followers (JSON): {json_file}")
-            
-            print(f"   • Datos de perfil detallado (XLSX): {excel_file_profile}")
-
-            print(f"   • Análisis Benford (XLSX): {benford_results['excel']}")
-            print(f"   • Gráfica Benford (PNG): {benford_results['png']}")
+            # Solicitar datos
             print("\n" + "="*60)
-        
+            profile = input(" Ingresa el username objetivo: ").strip()
+            limit = int(input(" Límite de seguidores a scrapear: "))
+            summaries.append(run_target(driver, profile, limit, args.max_profiles,
+                                        cache=cache, resume=args.resume, only_new=args.only_new))
+        else:
+            # Navegadores autenticados que se reutilizan entre objetivos y trabajos
+            pool = SessionPool(lambda d: authenticate(d, username, password, interactive=False))
+            pool.warm()
+
+            if targets:
+                print(f"\n Modo por lotes: {len(targets)} objetivos")
+                summaries.extend(run_batch(pool, targets, cache=cache, resume=args.resume,
+                                           only_new=args.only_new))
+                print_batch_summary(summaries)
+                render_batch_panel(summaries)
+
+            if args.watch:
+                for job, job_targets_list in watch_jobs(args.watch, args):
+                    print(f"\n📥 Trabajo {job.name}: {len(job_targets_list)} objetivos "
+                          f"({pool.budget.remaining()} navegaciones disponibles)")
+                    job_summaries = run_batch(pool, job_targets_list, cache=cache,
+                                             resume=args.resume, only_new=args.only_new)
+                    print_batch_summary(job_summaries)
+                    render_batch_panel(job_summaries, f"benford_panel_{job.stem}")
+                    summaries.extend(job_summaries)
+
+    except SessionStartError as e:
+        print(f"\n {e}")
+        return 1
     except KeyboardInterrupt:
         print("\n\nProceso interrumpido por el usuario")
+        print("Puedes continuar donde se quedó con: python scrape_followers.py --resume")
     except Exception as e:
         print(f"\n Error inesperado: {e}")
         import traceback
         traceback.print_exc()
     finally:
-        input("\n  Presiona ENTER para cerrar el navegador...")
-        driver.quit()
+        if cache is not None:
+            cache.close()
+        # Gráficas que sigan en cola en el hilo de renderizado
+        benford_render.esperar()
+        if METRICS_CONFIG['enabled']:
+            METRICS.print_summary()
+            METRICS.export()
+        if driver is not None:
+            input("\n  Presiona ENTER para cerrar el navegador...")
+            driver.quit()
+        if pool is not None:
+            pool.close()
         print(" Navegador cerrado. Fin del programa.")
+
+    return 0 if summaries and all(s['ok'] for s in summaries) else 1
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -3,27 +3,118 @@ Archivo: scraper.py
 Descripción: Funciones principales de scraping
 """
 
+import re
+import html
 import time
-import random
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, JavascriptException
 from config import INSTAGRAM_URLS, SCRAPING_CONFIG
 from utils import human_delay, extract_username_from_url, parse_follower_count
+from page_parser import parse_page
+from file_manager import JsonlWriter, iter_journal, select_profiles
+from pacing import ScrollPacer, END_LIMIT, END_STALL, END_REASONS
+from metrics import METRICS
+from scheduler import Scheduler
+from session_pool import RequestBudgetExceeded, SessionStartError
+
+# Textos que indican estadísticas del perfil y no biografía
+BIO_STAT_KEYWORDS = ['followers', 'seguidores', 'posts', 'siguiendo', 'following']
+
+# Extracción incremental del modal en una sola llamada. La primera vez localiza
+# el contenedor con scroll e instala un MutationObserver que acumula en un buffer
+# los hrefs de las filas nuevas; cada llamada vacía el buffer (solo filas añadidas
+# desde la llamada anterior) y, si se pide, hace scroll.
+# arguments[0]: None (solo extraer), 'bottom' (ir al final) o un número de píxeles.
+# arguments[1]: true para reiniciar el estado (nuevo perfil).
+JS_HARVEST_MODAL = """
+const dialog = document.querySelector("div[role='dialog']");
+let state = window.__followersHarvest;
+if (arguments[1] && state) {
+    if (state.observer) state.observer.disconnect();
+    state = null;
+}
+if (!state) {
+    state = window.__followersHarvest = {box: null, observer: null, seen: new Set(), buffer: []};
+}
+if (!dialog) return null;
+
+const push = (a) => {
+    const href = a.href;
+    if (href && !state.seen.has(href)) { state.seen.add(href); state.buffer.push(href); }
+};
+const collect = (node) => {
+    if (node.nodeType !== 1) return;
+    if (node.matches("a[href*='/']")) push(node);
+    node.querySelectorAll("a[href*='/']").forEach(push);
+};
+const consume = (mutations) => {
+    for (const m of mutations) {
+        if (m.type === 'attributes') collect(m.target);
+        else m.addedNodes.forEach(collect);
+    }
+};
+
+if (!state.box || !dialog.contains(state.box)) {
+    if (state.observer) state.observer.disconnect();
+    state.box = null;
+    for (const div of dialog.querySelectorAll('div[class]')) {
+        if (div.scrollHeight > div.clientHeight + 100) { state.box = div; break; }
+    }
+    if (!state.box) return null;
+    state.observer = new MutationObserver(consume);
+    state.observer.observe(state.box, {childList: true, subtree: true, attributes: true, attributeFilter: ['href']});
+    collect(state.box);
+}
+
+// Mutaciones pendientes que el observer aún no ha entregado
+consume(state.observer.takeRecords());
+const fresh = state.buffer;
+state.buffer = [];
+
+const scroll = arguments[0];
+if (scroll === 'bottom') {
+    state.box.scrollTop = state.box.scrollHeight;
+} else if (typeof scroll === 'number') {
+    state.box.scrollTop = state.box.scrollTop + scroll;
+}
+
+const box = state.box;
+return {
+    hrefs: fresh,
+    total: state.seen.size,
+    scrollTop: box.scrollTop,
+    atBottom: box.scrollTop + box.clientHeight >= box.scrollHeight - 2,
+    loading: !!dialog.querySelector("[role='progressbar'], svg[aria-label='Loading...'], svg[aria-label='Cargando...']")
+};
+"""
 
-def scrape_followers(driver, profile, limit=100):
+def scrape_followers(driver, profile, limit=100, return_stats=False):
     """
-    Scrapea los followers de un perfil con manejo mejorado de scroll
+    Scrapea los followers de un perfil con manejo mejorado de scroll.
+    Con return_stats=True devuelve (followers, stats), donde stats indica
+    el motivo de fin ('limit', 'end', 'stall' o 'error'), los scrolls y el tiempo
     """
     print(f"\n🔍 Scrapeando followers de @{profile}...")
-    
+    start = time.monotonic()
+    followers = set()
+    pacer = ScrollPacer()
+
+    def result(end_reason):
+        if not return_stats:
+            return followers
+        return followers, {
+            'end_reason': end_reason,
+            'scrolls': pacer.scrolls,
+            'elapsed': round(time.monotonic() - start, 2)
+        }
+
     # Ir al perfil
     driver.get(INSTAGRAM_URLS['profile'].format(username=profile))
     human_delay(3, 6)
     
     wait = WebDriverWait(driver, SCRAPING_CONFIG['default_timeout'])
-    followers = set()
 
     try:
         # Verificar que el perfil existe
@@ -31,7 +122,7 @@ def scrape_followers(driver, profile, limit=100):
         print("✅ Perfil cargado correctamente")
     except TimeoutException:
         print("❌ No se pudo cargar el perfil. Puede ser privado o no existe.")
-        return set()
+        return result('error')
 
     # --- PASO 1: Abrir el modal de seguidores ---
     try:
@@ -40,131 +131,129 @@ def scrape_followers(driver, profile, limit=100):
         )
         driver.execute_script("arguments[0].click();", followers_link)
         print("✅ Modal de followers abierto")
-        time.sleep(3)
     except TimeoutException:
         print("❌ No se pudo abrir el modal de followers")
-        return set()
+        return result('error')
+
+    def harvest(scroll=None, reset=False):
+        """Extrae las filas nuevas del modal (y hace scroll si se pide)"""
+        batch = driver.execute_script(JS_HARVEST_MODAL, scroll, reset)
+        if batch:
+            # Solo las filas nuevas desde la última llamada (ya deduplicadas en el navegador)
+            for href in batch['hrefs']:
+                username = extract_username_from_url(href)
+                if username:
+                    followers.add(username)
+            print(f"📢 Followers capturados: {len(followers)}/{limit}", end="\r")
+        return batch
 
     # --- PASO 2: Detectar el contenedor con scroll ---
-    modal = None
     try:
-        posibles = driver.find_elements(By.XPATH, "//div[@role='dialog']//div[@class]")
-
-        for div in posibles:
-            try:
-                scroll_height = driver.execute_script("return arguments[0].scrollHeight", div)
-                client_height = driver.execute_script("return arguments[0].clientHeight", div)
-
-                if scroll_height > client_height + 100:
-                    modal = div
-                    print("🌀 Contenedor desplazable detectado")
-                    break
-            except Exception:
-                continue
-
-    except Exception as e:
-        print(f"⚠️ Error buscando contenedor: {e}")
-
-    if not modal:
+        # Un error de script o un nodo obsoleto mientras el modal se monta se reintenta
+        batch = WebDriverWait(
+            driver, SCRAPING_CONFIG['default_timeout'],
+            ignored_exceptions=(JavascriptException, StaleElementReferenceException)
+        ).until(lambda d: harvest(reset=True))
+        print("\n🌀 Contenedor desplazable detectado")
+    except TimeoutException:
         print("❌ No se encontró el contenedor desplazable del modal.")
-        return set()
+        return result('error')
+    except Exception as e:
+        # Como en el bucle de scroll: se termina la fase 1 con lo capturado
+        print(f"\n❌ Error al leer el modal de followers: {e}")
+        return result('error')
 
     # --- PASO 3: Scroll y extracción de usuarios ---
     print(f"📊 Iniciando extracción (límite: {limit})...")
+    end_reason = None
 
-    last_scroll_position = 0
-    no_change_count = 0
+    while True:
+        if len(followers) >= limit:
+            end_reason = END_LIMIT
+            break
 
-    while len(followers) < limit:
         try:
-            # Extraer usuarios visibles
-            links = modal.find_elements(By.XPATH, ".//a[contains(@href,'/')]")
-
-            for a in links:
-                try:
-                    href = a.get_attribute("href")
-                    username = extract_username_from_url(href)
-                    
-                    if username and username not in followers:
-                        followers.add(username)
-                except Exception:
-                    continue
-
-            current_count = len(followers)
-            print(f"📢 Followers capturados: {current_count}/{limit}", end="\r")
+            # Extraer y hacer scroll en una sola llamada
+            pacer.pace()
+            batch = harvest('bottom')
+            if not batch:
+                print("\n❌ El modal de followers ya no está disponible")
+                end_reason = END_STALL
+                break
 
-            if current_count >= limit:
-                print(f"\n✅ Límite alcanzado: {limit} followers")
+            # Esperar filas nuevas o el fin de la petición de carga
+            status = pacer.wait_for_rows(harvest, batch['total'])
+            if status is None:
+                print("\n❌ El modal de followers ya no está disponible")
+                end_reason = END_STALL
                 break
 
-            # Hacer scroll
-            driver.execute_script(
-                "arguments[0].scrollTop = arguments[0].scrollHeight;",
-                modal
-            )
-
-            time.sleep(random.uniform(
-                SCRAPING_CONFIG['scroll_delay_min'],
-                SCRAPING_CONFIG['scroll_delay_max']
-            ))
-
-            new_scroll_position = driver.execute_script(
-                "return arguments[0].scrollTop",
-                modal
-            )
-
-            # Verificar si hubo cambio
-            if new_scroll_position == last_scroll_position:
-                no_change_count += 1
-                print(f"\n⚠️ Sin cambios en scroll ({no_change_count}/{SCRAPING_CONFIG['no_change_max']})")
-
-                if no_change_count >= SCRAPING_CONFIG['no_change_max']:
-                    print("🛑 No hay más followers para cargar")
+            if pacer.idle_count:
+                print(f"\n⚠️ Sin filas nuevas ({pacer.idle_count}/{pacer.max_idle})")
+                end_reason = pacer.end_reason(status)
+                if end_reason:
                     break
 
                 # Intento adicional: scroll más agresivo
-                driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollTop + 1000;",
-                    modal
-                )
-                time.sleep(2)
-            else:
-                no_change_count = 0
-                last_scroll_position = new_scroll_position
+                harvest(1000)
 
         except Exception as e:
             print(f"\n⚠️ Error durante extracción: {e}")
-            time.sleep(2)
+            pacer.register_idle()
+            end_reason = pacer.end_reason(None)
+            if end_reason:
+                break
             continue
 
-    print(f"\n✅ Extracción completada: {len(followers)} followers encontrados")
-    return followers
+    print(f"\n🛑 Fin de la extracción: {END_REASONS[end_reason]}")
+    print(f"✅ Extracción completada: {len(followers)} followers encontrados")
+    return result(end_reason)
+
+
+def _load_profile_source(driver, username, delay=human_delay):
+    """
+    Navega al perfil, espera a que cargue el header y devuelve (HTML, url)
+    (un único round-trip para todo el contenido de la página)
+    """
+    url = INSTAGRAM_URLS['profile'].format(username=username)
+    driver.get(url)
+    delay(2, 4)
+
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.TAG_NAME, "header"))
+    )
+
+    return driver.page_source, url
+
+
+def _load_profile(driver, username):
+    """Carga el perfil y devuelve su snapshot ya parseado"""
+    return parse_page(*_load_profile_source(driver, username))
 
 
 def get_followers_count(driver, username):
     """Obtiene el número de followers de un usuario"""
     try:
-        url = INSTAGRAM_URLS['profile'].format(username=username)
-        driver.get(url)
-        human_delay(2, 4)
+        page = _load_profile(driver, username)
+        return _extract_followers_count(page, username)
 
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "header"))
-        )
+    except TimeoutException:
+        print(f"  ❌ @{username}: Timeout")
+        return None
+    except Exception as e:
+        print(f"  ❌ @{username}: Error {e}")
+        return None
 
+
+def _extract_followers_count(page, username):
+    """Extrae el número de followers de un snapshot de perfil"""
+    try:
         # Método 1: Buscar span con title
         try:
-            spans_with_title = driver.find_elements(By.XPATH, "//span[@title]")
-            
-            for span in spans_with_title:
-                title = span.get_attribute('title')
+            for span in page.title_spans:
+                title = span.get('title')
                 if title and title.replace(',', '').replace('.', '').isdigit():
-                    parent_text = ''
-                    try:
-                        parent = span.find_element(By.XPATH, "./parent::*")
-                        parent_text = parent.text.lower()
-                    except:
-                        pass
+                    parent_text = span.parent.text.lower() if span.parent is not None else ''
 
                     if any(word in parent_text for word in ['seguidores', 'followers', 'follower']):
                         follower_count = parse_follower_count(title)
@@ -175,14 +264,8 @@ def get_followers_count(driver, username):
             pass
 
         # Método 2: Buscar en metadata
-        try:
-            import re
-            meta_element = driver.find_element(
-                By.XPATH,
-                "//meta[@property='og:description']"
-            )
-            content = meta_element.get_attribute('content')
-
+        content = page.meta_content(prop='og:description')
+        if content:
             patterns = [
                 r'([\d,\.KMB]+)\s+[Ff]ollowers?',
                 r'([\d,\.KMB]+)\s+[Ss]eguidores?'
@@ -196,73 +279,104 @@ def get_followers_count(driver, username):
                     if follower_count is not None:
                         print(f"  ✅ @{username}: {follower_count:,} followers")
                         return follower_count
-        except NoSuchElementException:
-            pass
 
         # Método 3: Buscar en el HTML (JSON interno)
-        try:
-            import re
-            page_source = driver.page_source
-
-            patterns = [
-                r'"edge_followed_by":\{"count":(\d+)\}',
-                r'"follower_count":(\d+)',
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, page_source)
-                if match:
-                    follower_count = int(match.group(1))
-                    print(f"  ✅ @{username}: {follower_count:,} followers")
-                    return follower_count
-        except Exception:
-            pass
+        patterns = [
+            r'"edge_followed_by":\{"count":(\d+)\}',
+            r'"follower_count":(\d+)',
+        ]
+
+        for pattern in patterns:
+            match = re.search(pattern, page.source)
+            if match:
+                follower_count = int(match.group(1))
+                print(f"  ✅ @{username}: {follower_count:,} followers")
+                return follower_count
 
         print(f"  ⚠️ @{username}: No se pudo obtener followers")
         return None
 
-    except TimeoutException:
-        print(f"  ❌ @{username}: Timeout")
-        return None
     except Exception as e:
         print(f"  ❌ @{username}: Error {e}")
         return None
 
 
+def _extract_following_and_posts(page):
+    """Extrae el número de seguidos y publicaciones de un snapshot de perfil"""
+    counts = {'following': None, 'posts': None}
+
+    # Método 1: metadata (ej. "120 Followers, 45 Following, 30 Posts")
+    content = page.meta_content(prop='og:description') or ''
+    patterns = {
+        'following': [r'([\d,\.KMB]+)\s+[Ff]ollowing', r'([\d,\.KMB]+)\s+[Ss]eguidos'],
+        'posts': [r'([\d,\.KMB]+)\s+[Pp]osts?', r'([\d,\.KMB]+)\s+[Pp]ublicaci[oó]n(?:es)?'],
+    }
+
+    for key, key_patterns in patterns.items():
+        for pattern in key_patterns:
+            match = re.search(pattern, content)
+            if match:
+                counts[key] = parse_follower_count(match.group(1))
+                if counts[key] is not None:
+                    break
+
+    # Método 2: JSON interno del HTML
+    patterns = {
+        'following': [r'"edge_follow":\{"count":(\d+)\}', r'"following_count":(\d+)'],
+        'posts': [r'"edge_owner_to_timeline_media":\{"count":(\d+)', r'"media_count":(\d+)'],
+    }
+
+    for key, key_patterns in patterns.items():
+        if counts[key] is not None:
+            continue
+        for pattern in key_patterns:
+            match = re.search(pattern, page.source)
+            if match:
+                counts[key] = int(match.group(1))
+                break
+
+    return counts
+
+
 def get_bio(driver, username):
     """Obtiene la biografía (descripción) y enlaces del perfil de `username`."""
     try:
-        url = INSTAGRAM_URLS['profile'].format(username=username)
-        driver.get(url)
-        human_delay(2, 4)
+        page = _load_profile(driver, username)
+        return _extract_bio(page, username)
+
+    except TimeoutException:
+        print(f"  ❌ @{username}: Timeout")
+        return {'bio': None, 'links': [], 'raw': None}
+    except Exception as e:
+        print(f"  ❌ @{username}: Error {e}")
+        return {'bio': None, 'links': [], 'raw': None}
+
+
+def _bio_candidates(header):
+    """Textos del header que pueden ser la biografía, como (longitud, texto)"""
+    candidates = []
+    for el in header.iter():
+        txt = el.text.strip()
+        if not txt:
+            continue
+        low = txt.lower()
+        if any(k in low for k in BIO_STAT_KEYWORDS):
+            continue
+        if txt.startswith('@'):
+            continue
+        if len(txt) >= 3:
+            candidates.append((len(txt), txt))
+    return candidates
 
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "header"))
-        )
 
-       
+def _extract_bio(page, username):
+    """Extrae la biografía y enlaces de un snapshot de perfil"""
+    header = page.header
+    links = []
+    try:
         # Método 1: extracción robusta desde el header (intenta varios nodos y filtra estadísticas)
-        try:
-            header = driver.find_element(By.TAG_NAME, 'header')
-            candidates = []
-            try:
-                child_elements = header.find_elements(By.XPATH, ".//*")
-                for el in child_elements:
-                    try:
-                        txt = el.text.strip()
-                        if not txt:
-                            continue
-                        low = txt.lower()
-                        if any(k in low for k in ['followers', 'seguidores', 'posts', 'siguiendo', 'following']):
-                            continue
-                        if txt.startswith('@'):
-                            continue
-                        if len(txt) >= 3:
-                            candidates.append((len(txt), txt))
-                    except Exception:
-                        continue
-            except Exception:
-                candidates = []
+        if header is not None:
+            candidates = _bio_candidates(header)
 
             # Ordenar por longitud y escoger el candidato más largo (mejor heurística para bio)
             best = ''
@@ -270,125 +384,226 @@ def get_bio(driver, username):
                 candidates.sort(reverse=True)
                 best = candidates[0][1]
 
-            links = []
-            try:
-                for a in header.find_elements(By.XPATH, ".//a"):
-                    href = a.get_attribute('href')
-                    if href:
-                        links.append(href)
-            except Exception:
-                pass
+            for a in header.find_all('a'):
+                href = a.get('href')
+                if href:
+                    links.append(page.absolute(href))
 
-            if best and len(best) > 0:
+            if best:
                 print(f"  ✅ @{username}: Biografía encontrada (header)")
                 return {'bio': best, 'links': links, 'raw': best}
-        except Exception:
-            pass
 
         # Método 2: meta tags (og:description o name=description)
-        try:
-            meta = driver.find_element(By.XPATH, "//meta[@name='description' or @property='og:description']")
-            content = meta.get_attribute('content') or ''
-            if content:
-                print(f"  ✅ @{username}: Biografía encontrada (meta)")
-                return {'bio': content.strip(), 'links': [], 'raw': content}
-        except Exception:
-            pass
+        content = page.meta_content(prop='og:description', name='description') or ''
+        if content:
+            print(f"  ✅ @{username}: Biografía encontrada (meta)")
+            return {'bio': content.strip(), 'links': [], 'raw': content}
 
         # Método 3: buscar biografía en JSON embebido en el HTML (clave "biography")
-        try:
-            import re, html
-            page_source = driver.page_source
-            m = re.search(r'"biography":"(.*?)"', page_source)
-            if m:
-                raw = m.group(1)
-                try:
-                    # Decodificar secuencias unicode y entidades HTML
-                    raw = raw.encode('utf-8').decode('unicode_escape')
-                except Exception:
-                    pass
-                raw = html.unescape(raw)
-                if raw:
-                    print(f"  ✅ @{username}: Biografía encontrada (JSON embebido)")
-                    return {'bio': raw, 'links': [], 'raw': raw}
-        except Exception:
-            pass
+        m = re.search(r'"biography":"(.*?)"', page.source)
+        if m:
+            raw = m.group(1)
+            try:
+                # Decodificar secuencias unicode y entidades HTML
+                raw = raw.encode('utf-8').decode('unicode_escape')
+            except Exception:
+                pass
+            raw = html.unescape(raw)
+            if raw:
+                print(f"  ✅ @{username}: Biografía encontrada (JSON embebido)")
+                return {'bio': raw, 'links': [], 'raw': raw}
 
         # Fallback: concatenar texto del header filtrado
-        try:
+        if header is not None:
             header_text = header.text or ''
             lines = [l.strip() for l in header_text.splitlines() if l.strip()]
-            filtered = [l for l in lines if not any(k in l.lower() for k in ['followers', 'seguidores', 'posts', 'siguiendo', 'following'])]
+            filtered = [l for l in lines if not any(k in l.lower() for k in BIO_STAT_KEYWORDS)]
             if filtered:
                 fallback = ' '.join(filtered)
                 print(f"  ⚠️ @{username}: Usando fallback de header")
                 return {'bio': fallback, 'links': links, 'raw': header_text}
-        except Exception:
-            pass
 
         print(f"  ⚠️ @{username}: No se encontró biografía")
-        return {'bio': None, 'links': links if 'links' in locals() else [], 'raw': None}
+        return {'bio': None, 'links': links, 'raw': None}
+
+    except Exception as e:
+        print(f"  ❌ @{username}: Error {e}")
+        return {'bio': None, 'links': [], 'raw': None}
+
 
+def _fetch_profile(driver, username, delay=human_delay):
+    """
+    Parte en el navegador de get_profile_data: (HTML, url) o None si falla.
+    El presupuesto agotado o una sesión inservible no son fallos del perfil:
+    se propagan para detener la fase 2 sin escribir registros vacíos
+    """
+    try:
+        return _load_profile_source(driver, username, delay)
+    except (RequestBudgetExceeded, SessionStartError):
+        raise
     except TimeoutException:
         print(f"  ❌ @{username}: Timeout")
-        return {'bio': None, 'links': [], 'raw': None}
     except Exception as e:
         print(f"  ❌ @{username}: Error {e}")
-        return {'bio': None, 'links': [], 'raw': None}
+    return None
+
+
+def _profile_record(username, snapshot):
+    """Parte local de get_profile_data: extrae el registro de un (HTML, url)"""
+    record = {
+        'username': username,
+        'followers': None,
+        'following': None,
+        'posts': None,
+        'bio': None,
+        'links': [],
+        'raw': None
+    }
+    if snapshot is None:
+        return record
+
+    # Toda la extracción se hace en local sobre el snapshot
+    page = parse_page(*snapshot)
+    record['followers'] = _extract_followers_count(page, username)
+    record.update(_extract_following_and_posts(page))
+
+    biography = _extract_bio(page, username)
+    record['bio'] = biography.get('bio')
+    record['links'] = biography.get('links')
+    record['raw'] = biography.get('raw')
+
+    return record
 
 
-def collect_followers_data(driver, usernames_set, max_profiles=None):
+def get_profile_data(driver, username):
     """
-    Recopila el número de followers de cada username
+    Carga el perfil de `username` una sola vez y extrae en un único registro
+    followers, following, posts, biografía y enlaces
+    """
+    return _profile_record(username, _fetch_profile(driver, username))
+
+
+def collect_followers_data(driver, usernames_set, max_profiles=None, cache=None,
+                           journal=None, resume=False, keep_records=True, scheduler=None,
+                           on_record=None):
+    """
+    Recopila el número de followers y los datos de perfil de cada username.
+    Si se pasa una ProfileCache, los perfiles en caché no se visitan.
+    Si se pasa un journal (JSONL), cada registro se escribe al terminar su perfil;
+    con resume=True se omiten los usernames que ya tienen un registro con
+    followers en el journal (los fallidos se vuelven a intentar).
+    Con keep_records=False no se acumulan los registros en memoria (las listas
+    devueltas quedan vacías y los datos se leen del journal).
+    Las visitas se espacian con un Scheduler; el parseo, la caché y el journal
+    de cada perfil se hacen durante la pausa previa a la siguiente visita.
+    `on_record(record)` se llama con cada registro (también los reanudados)
     """
     print("\n" + "=" * 60)
     print("📊 RECOPILANDO DATOS DE FOLLOWING")
     print("=" * 60)
 
     followers_data = []
-    usernames_list = list(usernames_set)
+    followers_data_profile = []
+
+    def keep(record):
+        if on_record is not None:
+            on_record(record)
+        if keep_records:
+            followers_data.append({
+                'username': record['username'],
+                'followers': record['followers']
+            })
+            followers_data_profile.append(record)
 
-    if max_profiles:
-        usernames_list = usernames_list[:max_profiles]
+    # Orden estable para que una ejecución reanudada procese los mismos perfiles
+    usernames_list = select_profiles(usernames_set, max_profiles)
 
     total = len(usernames_list)
     print(f"Total de perfiles a procesar: {total}\n")
 
-    followers_data_profile = []
-
-    for index, username in enumerate(usernames_list, 1):
-        print(f"[{index}/{total}] Procesando @{username}...")
-
-        follower_count = get_followers_count(driver, username)
-        follower_biography = get_bio(driver, username)
+    completed = set()
+    successful = 0
+    writer = None
+    if journal is not None:
+        if resume:
+            for record in iter_journal(journal, set(usernames_list)):
+                if record['followers'] is None:
+                    # Timeout o error en la ejecución anterior: se reintenta
+                    continue
+                completed.add(record['username'])
+                successful += 1
+                keep(record)
+            print(f"♻️ Reanudando: {len(completed)} perfiles ya completados en {journal}")
+        writer = JsonlWriter(journal, append=resume)
+
+    browser_visits = 0
+    scheduler = scheduler or Scheduler()
+    # Una caché compartida entre objetivos acumula contadores: se informa solo de esta ejecución
+    cache_start = cache.summary() if cache is not None else None
+
+    def finish(record, fetched):
+        """Trabajo local de un perfil: caché, contadores, memoria y journal"""
+        nonlocal successful
+        if fetched and cache is not None and record['followers'] is not None:
+            cache.put(record['username'], record)
+
+        if record['followers'] is not None:
+            successful += 1
+        else:
+            METRICS.inc('profile_failures')
+        keep(record)
+
+        if writer is not None:
+            writer.write(record)
+
+    def extract(username, snapshot):
+        finish(_profile_record(username, snapshot), fetched=True)
 
-        followers_data.append({
-            'username': username,
-            'followers': follower_count
-        })
+    try:
+        for index, username in enumerate(usernames_list, 1):
+            print(f"[{index}/{total}] Procesando @{username}...")
 
-        followers_data_profile.append({
-            'username': username,
-            'followers': follower_count,
-            'bio': follower_biography.get('bio'),
-            'links': follower_biography.get('links'),
-            'raw': follower_biography.get('raw')
-        })
+            if username in completed:
+                print(f"  ♻️ @{username}: ya completado (journal)")
+                continue
 
-        if index < total:
-            human_delay()
+            record = cache.get(username) if cache is not None else None
 
+            if record is not None:
+                print(f"  💾 @{username}: datos en caché")
+                METRICS.inc('profiles', source='cache')
+                # Se encola igualmente para conservar el orden del journal
+                scheduler.submit(finish, record, fetched=False)
+                continue
 
+            # Espera el turno de navegación (haciendo el trabajo pendiente) y visita
+            # el perfil una sola vez; el parseo queda encolado para la siguiente espera
+            with scheduler.navigation(), METRICS.timer('profile', source='browser'):
+                snapshot = _fetch_profile(driver, username, scheduler.delay)
+            browser_visits += 1
+            METRICS.inc('profiles', source='browser')
+            scheduler.submit(extract, username, snapshot)
+    finally:
+        try:
+            # Los perfiles ya visitados no se pierden aunque se interrumpa el bucle
+            scheduler.drain()
+        finally:
+            if writer is not None:
+                writer.close()
 
     # Estadísticas finales
-    successful = sum(1 for item in followers_data if item['followers'] is not None)
     failed = total - successful
 
     print("\n" + "=" * 60)
     print(f"✅ Completado: {successful}/{total} perfiles exitosos")
     if failed > 0:
         print(f"⚠️ Fallidos: {failed} perfiles")
+    if cache is not None:
+        stats = {key: value - cache_start[key] for key, value in cache.summary().items()}
+        print(f"💾 Caché: {stats['hits']} aciertos, {stats['misses']} fallos "
+              f"({stats['stale']} caducados), {browser_visits} visitas al navegador")
+    timing = scheduler.summary()
+    print(f"⏱️ Pausas: {timing['overlapped']} s con trabajo local, {timing['slept']} s en espera")
     print("=" * 60 + "\n")
 
     return followers_data,followers_data_profile
-
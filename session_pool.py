@@ -0,0 +1,253 @@
+"""
+Archivo: session_pool.py
+Descripción: Pool de sesiones de navegador ya autenticadas y reutilizables entre
+trabajos, con chequeo de salud, reciclado y presupuesto global de peticiones
+"""
+
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from selenium.webdriver.remote.command import Command
+from browser import init_browser
+from config import SESSION_CONFIG
+from metrics import METRICS
+
+
+class RequestBudgetExceeded(Exception):
+    """Se agotó el presupuesto global de navegaciones"""
+
+
+class SessionStartError(Exception):
+    """No se pudo iniciar o autenticar un navegador del pool"""
+
+
+class RequestBudget:
+    """
+    Presupuesto de navegaciones compartido por todas las sesiones: como máximo
+    `max_requests` en cada ventana de `window_seconds` (None = en toda la ejecución)
+    """
+
+    def __init__(self, max_requests=None, window_seconds=None):
+        self.max_requests = SESSION_CONFIG['request_budget'] if max_requests is None else max_requests
+        if window_seconds is None and SESSION_CONFIG['budget_window_minutes']:
+            window_seconds = SESSION_CONFIG['budget_window_minutes'] * 60
+        self.window = window_seconds
+        self.used = 0
+        self._stamps = deque()
+        self._lock = threading.Lock()
+
+    def _in_window(self, now):
+        if self.window is None:
+            return self.used
+        while self._stamps and now - self._stamps[0] > self.window:
+            self._stamps.popleft()
+        return len(self._stamps)
+
+    def remaining(self):
+        with self._lock:
+            return max(0, self.max_requests - self._in_window(time.monotonic()))
+
+    def consume(self):
+        """Descuenta una navegación o lanza RequestBudgetExceeded"""
+        with self._lock:
+            now = time.monotonic()
+            if self._in_window(now) >= self.max_requests:
+                raise RequestBudgetExceeded(
+                    f"Presupuesto de {self.max_requests} navegaciones agotado"
+                )
+            self.used += 1
+            self._stamps.append(now)
+
+
+class BrowserSession:
+    """Un navegador del pool: cuenta las páginas cargadas y descuenta el presupuesto"""
+
+    def __init__(self, driver, budget, number):
+        self.driver = driver
+        self.number = number
+        self.pages = 0
+        self.created = time.monotonic()
+
+        execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            if driver_command == Command.GET:
+                budget.consume()
+                self.pages += 1
+            return execute(driver_command, params)
+
+        driver.execute = counted_execute
+
+    def heap_mb(self):
+        """Memoria JS usada por la pestaña (MB, vía CDP) o None si no está disponible"""
+        try:
+            self.driver.execute_cdp_cmd('Performance.enable', {})
+            data = self.driver.execute_cdp_cmd('Performance.getMetrics', {})
+            values = {m['name']: m['value'] for m in data.get('metrics', [])}
+            return values['JSHeapUsedSize'] / (1024 * 1024)
+        except Exception:
+            return None
+
+    def healthy(self):
+        """El navegador responde y la pestaña sigue abierta"""
+        try:
+            return self.driver.execute_script("return document.readyState") is not None
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class SessionPool:
+    """
+    Mantiene hasta `size` navegadores autenticados. `acquire()` entrega una sesión
+    sana (la recicla si superó `max_pages` o `max_heap_mb`) y `release()` la devuelve
+    para el siguiente trabajo. `authenticate(driver)` debe devolver True si la
+    sesión quedó iniciada
+    """
+
+    def __init__(self, authenticate, size=None, max_pages=None, max_heap_mb=None,
+                 budget=None, factory=None):
+        self.authenticate = authenticate
+        self.size = SESSION_CONFIG['size'] if size is None else size
+        self.max_pages = SESSION_CONFIG['max_pages'] if max_pages is None else max_pages
+        self.max_heap_mb = SESSION_CONFIG['max_heap_mb'] if max_heap_mb is None else max_heap_mb
+        self.budget = budget or RequestBudget()
+        self.factory = factory or (lambda: init_browser(detach=False))
+
+        self._idle = []
+        self._all = []
+        self._starting = 0      # Huecos reservados para sesiones que se están arrancando
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def _start(self, number):
+        """Arranca y autentica un navegador nuevo (sin el lock del pool)"""
+        print(f"🌐 Iniciando sesión de navegador #{number}...")
+        start = time.perf_counter()
+
+        session = BrowserSession(self.factory(), self.budget, number)
+        try:
+            if not self.authenticate(session.driver):
+                raise SessionStartError("No se pudo autenticar la sesión del navegador")
+        except Exception:
+            session.quit()
+            raise
+
+        METRICS.observe('session_start', time.perf_counter() - start)
+        return session
+
+    def _reserve_slot(self):
+        """Con el lock tomado: reserva un hueco para arrancar una sesión y devuelve su número"""
+        self._starting += 1
+        self._created += 1
+        return self._created
+
+    def _launch(self, number):
+        """
+        Arranca la sesión de un hueco ya reservado fuera del lock, para que
+        release() no espere a la carga de páginas, y la registra en el pool
+        """
+        try:
+            session = self._start(number)
+        except Exception:
+            with self._cond:
+                self._starting -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self._starting -= 1
+            self._all.append(session)
+        return session
+
+    def _needs_recycle(self, session):
+        """Motivo para reciclar la sesión, o None si puede seguir en uso"""
+        if not session.healthy():
+            return "no responde"
+        if self.max_pages and session.pages >= self.max_pages:
+            return f"{session.pages} páginas cargadas"
+        if self.max_heap_mb:
+            heap = session.heap_mb()
+            if heap is not None and heap >= self.max_heap_mb:
+                return f"{heap:.0f} MB de memoria JS"
+        return None
+
+    def _discard(self, session):
+        """Cierra el navegador (fuera del lock) y libera su hueco"""
+        session.quit()
+        with self._cond:
+            if session in self._all:
+                self._all.remove(session)
+            self._cond.notify()
+
+    def warm(self):
+        """Arranca las sesiones que falten hasta `size`"""
+        while True:
+            with self._cond:
+                if len(self._all) + self._starting >= self.size:
+                    return self
+                number = self._reserve_slot()
+
+            session = self._launch(number)
+            with self._cond:
+                self._idle.append(session)
+                self._cond.notify()
+
+    def _take(self, timeout):
+        """Con el lock: una sesión libre, o None tras reservar hueco para una nueva (y su número)"""
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop(), None
+                if len(self._all) + self._starting < self.size:
+                    return None, self._reserve_slot()
+                if not self._cond.wait(timeout):
+                    raise TimeoutError("No hay sesiones de navegador libres")
+
+    def acquire(self, timeout=None):
+        """Entrega una sesión sana y autenticada (espera si todas están en uso)"""
+        while True:
+            session, number = self._take(timeout)
+            if session is None:
+                return self._launch(number)
+
+            # El chequeo habla con el navegador: se hace sin el lock
+            reason = self._needs_recycle(session)
+            if reason is None:
+                return session
+            print(f"♻️ Reciclando sesión #{session.number}: {reason}")
+            METRICS.inc('session_recycles')
+            self._discard(session)
+
+    def release(self, session, broken=False):
+        """Devuelve una sesión al pool (o la descarta si quedó inservible)"""
+        if broken:
+            self._discard(session)
+            return
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    @contextmanager
+    def session(self):
+        """`with pool.session() as s:` entrega y devuelve una sesión"""
+        session = self.acquire()
+        try:
+            yield session
+        finally:
+            self.release(session, broken=not session.healthy())
+
+    def close(self):
+        """Cierra todos los navegadores del pool"""
+        with self._cond:
+            sessions = list(self._all)
+            self._all.clear()
+            self._idle.clear()
+        for session in sessions:
+            session.quit()
@@ -0,0 +1,99 @@
+"""
+Archivo: snapshots.py
+Descripción: Almacén de snapshots de followers por objetivo y fecha (arrays
+NumPy ordenados y sin duplicados, comprimidos) y diferencias entre ejecuciones
+"""
+
+from datetime import date as Date
+import numpy as np
+from config import SNAPSHOTS_DIR, ensure_dirs
+
+
+def _profile_dir(profile):
+    return SNAPSHOTS_DIR / profile
+
+
+def to_array(usernames):
+    """Usernames como array de bytes UTF-8 ordenado y sin duplicados"""
+    encoded = np.array([u.encode('utf-8') for u in usernames], dtype=bytes)
+    return np.unique(encoded)
+
+
+def to_names(array):
+    """Array de snapshot a lista de usernames"""
+    return [u.decode('utf-8') for u in array.tolist()]
+
+
+def save_snapshot(profile, usernames, day=None):
+    """Guarda el snapshot del día (sustituye al de la misma fecha) y devuelve su ruta"""
+    day = day or Date.today().isoformat()
+    ensure_dirs()
+    folder = _profile_dir(profile)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    filename = folder / f"{day}.npz"
+    np.savez_compressed(filename, usernames=to_array(usernames))
+    print(f"📸 Snapshot de followers guardado en: {filename}")
+    return filename
+
+
+def list_snapshots(profile):
+    """Fechas con snapshot para un perfil, de la más antigua a la más reciente"""
+    folder = _profile_dir(profile)
+    if not folder.exists():
+        return []
+    return sorted(p.stem for p in folder.glob("*.npz"))
+
+
+def load_snapshot(profile, day=None):
+    """Array del snapshot de una fecha (por defecto el último) o None si no hay"""
+    days = list_snapshots(profile)
+    if not days:
+        return None
+    day = day or days[-1]
+    filename = _profile_dir(profile) / f"{day}.npz"
+    if not filename.exists():
+        return None
+    with np.load(filename) as data:
+        return data['usernames']
+
+
+def diff_snapshots(old, new):
+    """
+    Followers nuevos y perdidos entre dos snapshots (arrays ordenados y únicos);
+    operaciones de conjuntos vectorizadas, válidas para millones de usernames
+    """
+    gained = np.setdiff1d(new, old, assume_unique=True)
+    lost = np.setdiff1d(old, new, assume_unique=True)
+    return gained, lost
+
+
+def diff_profile(profile, since=None, until=None):
+    """
+    Diferencias entre dos snapshots de un perfil (por defecto el penúltimo y el
+    último). Devuelve dict con las fechas y las listas de nuevos y perdidos, o None
+    """
+    days = list_snapshots(profile)
+    if len(days) < 2 and not (since and until):
+        return None
+
+    until = until or days[-1]
+    since = since or max((d for d in days if d < until), default=None)
+    if since is None:
+        return None
+
+    old = load_snapshot(profile, since)
+    new = load_snapshot(profile, until)
+    if old is None or new is None:
+        return None
+
+    gained, lost = diff_snapshots(old, new)
+    return {
+        'profile': profile,
+        'since': since,
+        'until': until,
+        'total_since': len(old),
+        'total_until': len(new),
+        'gained': to_names(gained),
+        'lost': to_names(lost)
+    }
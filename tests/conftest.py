@@ -0,0 +1,20 @@
+"""
+Archivo: tests/conftest.py
+Descripción: Configuración común de las pruebas (módulos del proyecto en el
+path y pausas de scraping desactivadas)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import SCRAPING_CONFIG  # noqa: E402
+
+
+@pytest.fixture
+def no_delays(monkeypatch):
+    """Sin pausas entre navegaciones ni en human_delay"""
+    monkeypatch.setitem(SCRAPING_CONFIG, 'delay_scale', 0)
@@ -0,0 +1,90 @@
+"""
+Archivo: tests/test_auth.py
+Descripción: Pruebas del arranque de la sesión guardada (caducidad e inyección de cookies)
+"""
+
+import json
+
+import pytest
+
+from auth import _cdp_cookie, check_saved_session, load_cookies, session_status
+
+NOW = 1_800_000_000
+
+
+def session_cookie(expiry):
+    return {'name': 'sessionid', 'value': 's', 'domain': '.instagram.com', 'path': '/',
+            'secure': True, 'httpOnly': True, 'expiry': expiry, 'sameSite': 'Lax'}
+
+
+@pytest.mark.parametrize('cookies, valid', [
+    (None, False),
+    ([], False),
+    ([{'name': 'csrftoken', 'value': 'x'}], False),
+    ([session_cookie(NOW - 1)], False),
+    ([session_cookie(NOW + 60)], False),          # Dentro del margen de caducidad
+    ([session_cookie(NOW + 86400)], True),
+    ([{'name': 'sessionid', 'value': 's'}], True),    # Cookie de sesión sin caducidad
+])
+def test_session_status(cookies, valid):
+    ok, reason = session_status(cookies, now=NOW)
+    assert ok is valid
+    assert (reason is None) is valid
+
+
+def test_cdp_cookie_format():
+    assert _cdp_cookie(session_cookie(NOW)) == {
+        'name': 'sessionid', 'value': 's', 'domain': '.instagram.com', 'path': '/',
+        'secure': True, 'httpOnly': True, 'expires': NOW, 'sameSite': 'Lax'
+    }
+    assert _cdp_cookie({'name': 'a', 'value': 'b', 'sameSite': 'unknown'}) == {
+        'name': 'a', 'value': 'b', 'domain': '.instagram.com', 'path': '/', 'secure': False, 'httpOnly': False
+    }
+
+
+class CookieDriver:
+    def __init__(self, cdp=True):
+        self.cdp = cdp
+        self.commands = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        if not self.cdp:
+            raise AttributeError("sin CDP")
+        self.commands.append((cmd, [c['name'] for c in params['cookies']]))
+
+    def get(self, url):
+        self.commands.append(('get', url))
+
+    def add_cookie(self, cookie):
+        self.commands.append(('add_cookie', cookie['name']))
+
+
+@pytest.fixture
+def cookie_file(tmp_path):
+    path = tmp_path / "cookie.json"
+    far = 4_000_000_000
+    path.write_text(json.dumps([session_cookie(far), {'name': 'viejo', 'value': 'v', 'expiry': 1},
+                                {'name': 'csrftoken', 'value': 'c', 'expiry': far}]))
+    return path
+
+
+def test_load_cookies_injects_once_without_navigating(cookie_file):
+    driver = CookieDriver()
+    assert load_cookies(driver, cookie_file)
+    assert driver.commands == [('Network.setCookies', ['sessionid', 'csrftoken'])]
+
+
+def test_load_cookies_falls_back_to_add_cookie(cookie_file):
+    driver = CookieDriver(cdp=False)
+    assert load_cookies(driver, cookie_file)
+    assert [c[0] for c in driver.commands] == ['get', 'add_cookie', 'add_cookie']
+
+
+def test_expired_session_is_rejected_before_using_the_browser(tmp_path):
+    path = tmp_path / "cookie.json"
+    path.write_text(json.dumps([session_cookie(1)]))
+    driver = CookieDriver()
+    assert not load_cookies(driver, path)
+    assert driver.commands == []
+    assert not check_saved_session(path)
+    assert not check_saved_session(tmp_path / "no_existe.json")
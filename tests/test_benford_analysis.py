@@ -0,0 +1,162 @@
+"""
+Archivo: tests/test_benford_analysis.py
+Descripción: Pruebas del análisis de Benford (dígitos, estadísticas, acumulador y lote)
+"""
+
+import json
+
+import numpy as np
+
+import benford_analysis
+import benford_render
+import pytest
+
+from benford_analysis import (AcumuladorBenford, PRUEBAS_BENFORD, analizar_benford, analizar_benford_lote,
+                              conteos_benford, digitos_iniciales, estadisticos_benford, primer_digito_valor,
+                              pruebas_benford)
+
+
+def test_digitos_iniciales_numeric():
+    valores = np.array([1, 9, 10, 19, 99, 100, 123456, 0.0123, -45, 0, np.nan, 1000, 999.999])
+    np.testing.assert_array_equal(
+        digitos_iniciales(valores, 1), [1, 9, 1, 1, 9, 1, 1, 1, 4, np.nan, np.nan, 1, 9]
+    )
+    np.testing.assert_array_equal(
+        digitos_iniciales(valores, 2), [np.nan, np.nan, 10, 19, 99, 10, 12, np.nan, 45, np.nan, np.nan, 10, 99]
+    )
+
+
+def test_digitos_iniciales_large_integers():
+    enteros = np.array([99999999999, 12345678901234567, -98765432109876, np.iinfo(np.int64).min, 10 ** 18])
+    np.testing.assert_array_equal(digitos_iniciales(enteros), [9, 1, 9, 9, 1])
+    np.testing.assert_array_equal(digitos_iniciales(enteros, 2), [99, 12, 98, 92, 10])
+    np.testing.assert_array_equal(digitos_iniciales(np.array([np.iinfo(np.uint64).max]), 2), [18])
+    # Los mismos recuentos leídos como float o en una columna mixta
+    np.testing.assert_array_equal(digitos_iniciales(np.array([99999999999.0, 9999999999999.0]), 2), [99, 99])
+    np.testing.assert_array_equal(digitos_iniciales(np.array([99999999999, "1,234"], dtype=object)), [9, 1])
+
+
+def test_digitos_iniciales_mixed_column_matches_per_cell_parsing():
+    valores = [123, None, 4.5, "1,234", "1.2K", "789", "sin datos", 0, -56, float("nan"), True]
+    esperado = [primer_digito_valor(v) for v in valores[:-1]] + [np.nan]
+    np.testing.assert_array_equal(digitos_iniciales(np.array(valores, dtype=object)), esperado)
+    np.testing.assert_array_equal(
+        digitos_iniciales(np.array(valores, dtype=object), 2),
+        [12, np.nan, np.nan, 12, 12, 78, np.nan, np.nan, 56, np.nan, np.nan]
+    )
+    # Sin texto no numérico: conversión directa
+    np.testing.assert_array_equal(digitos_iniciales(np.array([5, None, "31"], dtype=object)), [5, np.nan, 3])
+
+
+def test_batch_panel_pairs_each_file_with_its_own_row(tmp_path, monkeypatch):
+    rng = np.random.default_rng(3)
+    datos = {}
+    for carpeta, escala in (("a", 5), ("b", 2)):
+        (tmp_path / carpeta).mkdir()
+        followers = (10 ** rng.uniform(0, escala, 300)).astype(int).tolist()
+        ruta = tmp_path / carpeta / "following_data_perfil.json"
+        ruta.write_text(json.dumps([{'username': f"u{i}", 'followers': f} for i, f in enumerate(followers)]))
+        datos[str(ruta)] = pruebas_benford(conteos_benford(followers))['primer_digito']
+
+    paneles = []
+    monkeypatch.setattr(benford_analysis, 'RESULTS_DIR', tmp_path)
+    monkeypatch.setattr(benford_render, 'renderizar_panel', lambda perfiles, **kw: paneles.append(perfiles) or [])
+
+    resultado = analizar_benford_lote(str(tmp_path / "*" / "following_data_*.json"), workers=1, panel=True)
+
+    (perfiles,) = paneles
+    assert len(perfiles) == 2
+    for fila, (perfil, real, nota) in zip(resultado['resumen'].itertuples(), perfiles):
+        esperado = datos[fila.Archivo]
+        assert perfil == "perfil"
+        np.testing.assert_allclose(real, esperado['real'] * 100)
+        assert nota == f"MAD {round(esperado['mad'], 5)}"
+
+
+@pytest.mark.parametrize("excel, png", [(True, False), (False, True)])
+def test_batch_passes_excel_and_png_separately(tmp_path, monkeypatch, excel, png):
+    ruta = tmp_path / "following_data_perfil.json"
+    ruta.write_text(json.dumps([{'username': f"u{i}", 'followers': 10 + i} for i in range(50)]))
+    monkeypatch.setattr(benford_analysis, 'RESULTS_DIR', tmp_path)
+    monkeypatch.setattr(benford_render, 'RESULTS_DIR', tmp_path)
+
+    resultado = analizar_benford_lote(str(ruta), workers=1, excel=excel, png=png)
+
+    assert resultado['resumen']['Error'].isna().all()
+    assert (tmp_path / "benford_perfil.xlsx").exists() == excel
+    assert (tmp_path / "benford_perfil.png").exists() == png
+
+def test_conteos_benford():
+    conteos = conteos_benford([1, 12, 123, 19, 9, 95, 0, None, -30, 5.5])
+    np.testing.assert_array_equal(conteos['primer_digito'], [4, 0, 1, 0, 1, 0, 0, 0, 2])
+    np.testing.assert_array_equal(conteos['segundo_digito'], [1, 0, 2, 0, 0, 1, 0, 0, 0, 1])
+    assert conteos['dos_digitos'].sum() == 5
+    assert conteos['dos_digitos'][12 - 10] == 2
+
+
+def test_statistics_for_perfect_and_degenerate_samples():
+    esperado = PRUEBAS_BENFORD['primer_digito']['esperado']
+    perfecta = estadisticos_benford(esperado * 1_000_000, 'primer_digito')
+    assert perfecta['chi2'] == pytest.approx(0, abs=1e-6)
+    assert perfecta['mad'] == pytest.approx(0, abs=1e-9)
+    assert perfecta['conformidad'] == 'Conformidad cercana'
+
+    # Todos los valores empiezan por 1
+    n = 100
+    e1 = esperado[0]
+    todo_uno = estadisticos_benford([n, 0, 0, 0, 0, 0, 0, 0, 0], 'primer_digito')
+    assert todo_uno['chi2'] == pytest.approx(n * (1 - e1) ** 2 / e1 + n * (1 - e1))
+    assert todo_uno['ks'] == pytest.approx(1 - e1)
+    assert todo_uno['ks_critico'] == pytest.approx(1.36 / 10)
+    assert todo_uno['mad'] == pytest.approx(2 * (1 - e1) / 9)
+    assert todo_uno['conformidad'] == 'No conformidad'
+
+    vacia = estadisticos_benford(np.zeros(9), 'primer_digito')
+    assert vacia['n'] == 0 and vacia['conformidad'] == 'Sin datos'
+
+
+def test_expected_proportions_sum_to_one():
+    for prueba, config in PRUEBAS_BENFORD.items():
+        assert config['esperado'].sum() == pytest.approx(1), prueba
+        assert len(config['esperado']) == len(config['digitos'])
+
+
+def test_accumulator_matches_batch_result():
+    rng = np.random.default_rng(7)
+    valores = (10 ** rng.uniform(0, 7, 2000)).astype(int).tolist()
+    valores[::50] = [None] * len(valores[::50])
+
+    acumulador = AcumuladorBenford()
+    for i, valor in enumerate(valores):
+        acumulador.agregar(f"u{i}", valor)
+    # Un valor nuevo del mismo username sustituye al anterior
+    for i in range(0, 300, 3):
+        valores[i] = int(rng.integers(1, 10 ** 6))
+        acumulador.agregar(f"u{i}", valores[i])
+
+    lote = pruebas_benford(conteos_benford(valores))
+    vivo = acumulador.pruebas()
+    for prueba in PRUEBAS_BENFORD:
+        np.testing.assert_array_equal(vivo[prueba]['conteos'], lote[prueba]['conteos'])
+        assert vivo[prueba]['mad'] == pytest.approx(lote[prueba]['mad'])
+        assert vivo[prueba]['chi2'] == pytest.approx(lote[prueba]['chi2'])
+    assert acumulador.n == lote['primer_digito']['n']
+
+    usernames, followers = acumulador.datos()
+    assert usernames == [f"u{i}" for i in range(len(valores))]
+    np.testing.assert_array_equal(followers, np.array([np.nan if v is None else v for v in valores], dtype=float))
+
+
+def test_analizar_benford_with_accumulator_matches_file(tmp_path):
+    valores = [int(10 ** x) for x in np.linspace(0, 6, 500)]
+    ruta = tmp_path / "following_data_perfil.json"
+    ruta.write_text(json.dumps([{'username': f"u{i}", 'followers': v} for i, v in enumerate(valores)]))
+
+    acumulador = AcumuladorBenford()
+    for i, v in enumerate(valores):
+        acumulador.agregar(f"u{i}", v)
+
+    desde_archivo = analizar_benford(ruta, "perfil", excel=False, png=False)
+    en_vivo = analizar_benford(None, "perfil", excel=False, png=False, acumulador=acumulador)
+    assert desde_archivo['resumen'].equals(en_vivo['resumen'])
+    assert desde_archivo['comparacion'].equals(en_vivo['comparacion'])
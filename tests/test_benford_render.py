@@ -0,0 +1,40 @@
+"""
+Archivo: tests/test_benford_render.py
+Descripción: Pruebas de la generación de gráficas de Benford
+"""
+
+import numpy as np
+import pytest
+
+import benford_render
+
+REAL = np.array([30.5, 17.0, 12.6, 9.5, 8.0, 6.6, 5.9, 5.1, 4.8])
+
+
+def test_render_png_and_svg_with_the_template(tmp_path):
+    png = benford_render.renderizar(tmp_path / "a.png", REAL, "perfil", dpi=50)
+    svg = benford_render.renderizar(tmp_path / "a.svg", np.full(9, np.nan), "vacio", "svg")
+    assert png.read_bytes().startswith(b"\x89PNG")
+    assert b"<svg" in svg.read_bytes()
+
+    plantilla = benford_render.plantilla()
+    assert plantilla is benford_render.plantilla()
+    assert plantilla.titulo.get_text() == "Ley de Benford - @vacio"
+
+
+def test_unsupported_format():
+    with pytest.raises(ValueError):
+        benford_render.formato_salida("gif")
+
+
+def test_panel_pages_and_background_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(benford_render, 'RESULTS_DIR', tmp_path)
+    monkeypatch.setitem(benford_render.RENDER_CONFIG, 'panel_max', 4)
+
+    perfiles = [(f"p{i}", REAL, "MAD 0.001") for i in range(5)]
+    futuro = benford_render.en_segundo_plano(benford_render.renderizar_panel, perfiles, "panel", dpi=30)
+    fallido = benford_render.en_segundo_plano(benford_render.renderizar, tmp_path / "x", REAL, "x", "gif")
+    assert benford_render.esperar() == 1
+    assert [p.name for p in futuro.result()] == ["panel_1.png", "panel_2.png"]
+    assert fallido.exception() is not None
+    assert benford_render.esperar() == 0
@@ -0,0 +1,119 @@
+"""
+Archivo: tests/test_bio_analysis.py
+Descripción: Pruebas del léxico deportivo y del autómata Aho-Corasick
+"""
+
+import json
+
+import pytest
+
+import bio_analysis
+from bio_analysis import (AhoCorasick, LEXICO_DEPORTES, agregar_intereses, analizar_bios, cargar_lexico,
+                          clasificar_bios, normalizar)
+from config import BIO_CONFIG
+
+
+@pytest.fixture(scope='module')
+def automata():
+    return AhoCorasick(LEXICO_DEPORTES)
+
+
+@pytest.mark.parametrize('bio, categorias', [
+    ("Hincha de Emelec ⚽ y corredor de maratón", ['futbol', 'running']),
+    ("Jugadora de BÁSQUET 🏀", ['baloncesto']),
+    ("#Crossfit y #fútbol", ['fitness', 'futbol']),
+    ("Coach de fútbol", ['deporte_general', 'futbol']),
+    ("🏆 Campeona nacional de natación", ['deporte_general', 'natacion']),
+    ("Streamer de Valorant", ['esports']),
+    ("vamos⚽vamos", ['futbol']),
+    ("#FutbolEcuador #RunningLife", ['futbol', 'running']),
+    ("Corredora de 21k y 42k 🏃", ['running']),
+    ("Socio del Barca ⚽", ['futbol']),
+])
+def test_positive_bios(automata, bio, categorias):
+    assert automata.clasificar(bio)[0] == categorias
+
+
+@pytest.mark.parametrize('bio', [
+    "coach de vida, gamer",
+    "Life coach 🏆 | emprendedora 🥇",
+    "F1 en el teclado y un rally político",
+    "Streamer y gamer",
+    "Tennisplayer",             # 'tennis' solo como palabra completa
+    "#VamosTenis",              # solo al principio de un hashtag
+    "10k followers 💰 DM for collabs",
+    "Barca de vela en Galápagos",
+    "Basket weaving workshop",
+    "#BasketWeaving",
+    "Pasante en una ATPase lab",
+    "Fotógrafa en Quito",
+    "",
+    None,
+])
+def test_negative_bios(automata, bio):
+    assert automata.clasificar(bio) == ([], [])
+
+
+def test_word_boundaries_and_overlapping_terms(automata):
+    categorias, terminos = automata.clasificar("Fan del Barcelona SC y del fútbol americano")
+    assert categorias == ['futbol', 'futbol_americano']
+    assert terminos == ['barcelona sc', 'futbol', 'futbol americano']
+    assert automata.clasificar("ufcstyle")[0] == []
+    assert automata.clasificar("ufc")[0] == ['combate']
+    assert automata.clasificar("#UFCFightNight")[1] == ['ufc']
+    assert automata.clasificar("#superufc")[0] == []
+
+
+def test_normalizar_strips_accents_and_variation_selectors():
+    assert normalizar("Fútbol ÁRBITRO") == "futbol arbitro"
+    assert normalizar("🏋️") == normalizar("🏋")
+
+
+def test_lexicon_file_extends_ambiguous_terms(tmp_path):
+    ruta = tmp_path / "lexico.json"
+    ruta.write_text(json.dumps({'padel_social': ['padelero'], '_ambiguos': ['padelero']}), encoding='utf-8')
+    automata = AhoCorasick(cargar_lexico(ruta))
+    assert automata.clasificar("padelero")[0] == []
+    assert automata.clasificar("padelero y ciclista")[0] == ['ciclismo', 'padel_social']
+
+
+def test_clasificar_bios_and_summary():
+    etiquetas = list(clasificar_bios([
+        {'username': 'a', 'bio': 'Runner 🏃'},
+        {'username': 'b', 'bio': 'coach de vida, gamer'},
+        {'username': 'c', 'bio': None},
+        {'username': 'd', 'bio': 'gym y running'},
+    ], workers=1))
+    assert [e['categorias'] for e in etiquetas] == [['running'], [], [], ['fitness', 'running']]
+
+    resumen = agregar_intereses(etiquetas, con_bio=3)
+    assert resumen['con_interes_deportivo'] == 2
+    assert resumen['porcentaje_interes'] == 50.0
+    assert resumen['categorias']['running'] == {'usuarios': 2, 'porcentaje': 50.0}
+
+
+def registros(n):
+    bios = ['Runner 🏃', 'coach de vida', None, '#FutbolEcuador', '']
+    for i in range(n):
+        yield {'username': f"u{i}", 'bio': bios[i % len(bios)], 'links': ["https://example.com"] * 50}
+
+
+def test_clasificar_bios_in_a_pool_keeps_order(monkeypatch):
+    monkeypatch.setitem(BIO_CONFIG, 'chunk_size', 7)
+    monkeypatch.setitem(BIO_CONFIG, 'parallel_min', 20)
+    en_proceso = list(clasificar_bios(registros(103), workers=1))
+    en_pool = list(clasificar_bios(registros(103), workers=2))
+    assert en_pool == en_proceso
+    assert [e['username'] for e in en_pool] == [f"u{i}" for i in range(103)]
+
+
+def test_analizar_bios_streams_records_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(bio_analysis, 'RESULTS_DIR', tmp_path)
+    resultado = analizar_bios(registros(10), "perfil", workers=1)
+
+    resumen = resultado['resumen']
+    assert (resumen['usuarios'], resumen['con_bio'], resumen['con_interes_deportivo']) == (10, 6, 4)
+    assert json.loads(resultado['json'].read_text(encoding='utf-8')) == resumen
+    filas = [json.loads(l) for l in resultado['tags'].read_text(encoding='utf-8').splitlines()]
+    assert [f['username'] for f in filas] == [f"u{i}" for i in range(10)]
+    assert filas[3]['categorias'] == ['futbol']
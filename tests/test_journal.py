@@ -0,0 +1,107 @@
+"""
+Archivo: tests/test_journal.py
+Descripción: Pruebas del journal de la fase 2 y de la reanudación
+"""
+
+import json
+
+from benchmarks import FakeWebDriver
+from file_manager import iter_journal, iter_jsonl, select_profiles
+from scheduler import Scheduler
+from scraper import collect_followers_data
+
+
+def write_journal(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+        f.write('{"username": "cortado", "foll')    # Línea incompleta tras un corte
+
+
+def test_iter_journal_keeps_latest_successful_record(tmp_path):
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [
+        {'username': 'a', 'followers': None},
+        {'username': 'b', 'followers': 10},
+        {'username': 'a', 'followers': 20},
+        {'username': 'b', 'followers': None},
+        {'username': 'c', 'followers': None},
+        {'username': 'd', 'followers': 5},
+    ])
+
+    records = list(iter_journal(journal))
+    assert [(r['username'], r['followers']) for r in records] == [
+        ('b', 10), ('a', 20), ('c', None), ('d', 5)
+    ]
+    assert [r['username'] for r in iter_journal(journal, {'a', 'c'})] == ['a', 'c']
+    assert list(iter_journal(tmp_path / "no_existe.jsonl")) == []
+
+
+def test_resume_retries_failed_profiles(tmp_path, no_delays):
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [
+        {'username': 'user_0', 'followers': 7},
+        {'username': 'user_1', 'followers': None},
+    ])
+    driver = FakeWebDriver()
+
+    data, profiles = collect_followers_data(
+        driver, {'user_0', 'user_1', 'user_2'}, journal=journal, resume=True,
+        scheduler=Scheduler(0, 0, 1)
+    )
+
+    # user_0 ya estaba completo; user_1 (fallido) y user_2 se visitan
+    assert driver.commands['get'] == 2
+    assert sorted((r['username'], r['followers']) for r in data) == [
+        ('user_0', 7), ('user_1', 12345), ('user_2', 12345)
+    ]
+    assert [(r['username'], r['followers']) for r in iter_journal(journal)] == [
+        ('user_0', 7), ('user_1', 12345), ('user_2', 12345)
+    ]
+    assert len(list(iter_jsonl(journal))) == 4
+
+
+def test_resume_only_counts_selected_profiles(tmp_path, no_delays):
+    journal = tmp_path / "journal.jsonl"
+    write_journal(journal, [{'username': f'user_{i}', 'followers': i + 1} for i in range(5)])
+    driver = FakeWebDriver()
+
+    data, _ = collect_followers_data(
+        driver, {f'user_{i}' for i in range(5)}, max_profiles=2, journal=journal,
+        resume=True, scheduler=Scheduler(0, 0, 1)
+    )
+
+    assert driver.commands == {}
+    assert [r['username'] for r in data] == ['user_0', 'user_1']
+
+
+def test_select_profiles_is_stable_and_limited():
+    assert select_profiles({'c', 'a', 'b'}) == ['a', 'b', 'c']
+    assert select_profiles({'c', 'a', 'b'}, 2) == ['a', 'b']
+
+
+def test_export_uses_saved_followers_and_selection(tmp_path, monkeypatch):
+    import analyze
+    import file_manager
+
+    monkeypatch.setattr(file_manager, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(file_manager, 'RESULTS_DIR', tmp_path)
+    monkeypatch.setattr(analyze, 'ensure_dirs', lambda: None)
+
+    file_manager.save_followers_state({'a', 'b', 'c'}, 'perfil')
+    write_journal(file_manager.journal_path('perfil'), [
+        {'username': 'perdido', 'followers': 1},
+        {'username': 'c', 'followers': 3},
+        {'username': 'a', 'followers': None},
+        {'username': 'b', 'followers': 2},
+        {'username': 'a', 'followers': 1},
+    ])
+
+    def exported(*argv):
+        assert analyze.main(['export', 'perfil', '--solo-json', *argv]) == 0
+        with open(tmp_path / "following_data_perfil.json", encoding='utf-8') as f:
+            return [(r['username'], r['followers']) for r in json.load(f)]
+
+    assert exported() == [('c', 3), ('b', 2), ('a', 1)]
+    assert exported('--max-profiles', '2') == [('b', 2), ('a', 1)]
+    assert exported('--todo') == [('perdido', 1), ('c', 3), ('b', 2), ('a', 1)]
@@ -0,0 +1,55 @@
+"""
+Archivo: tests/test_metrics.py
+Descripción: Pruebas del registro de métricas y su exportación
+"""
+
+import pytest
+
+from metrics import Histogram, Metrics, instrument_driver
+
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram([1, 0.1, 10])
+    for value in (0.05, 0.5, 5, 50):
+        hist.observe(value)
+    data = hist.to_dict()
+    assert data['buckets'] == {'0.1': 1, '1': 2, '10': 3}
+    assert data['count'] == 4 and data['max'] == 50 and data['sum'] == pytest.approx(55.55)
+
+
+def test_counters_timers_and_prometheus():
+    metrics = Metrics(buckets=(1, 10))
+    metrics.inc('profiles', source='cache')
+    metrics.inc('profiles', 2, source='cache')
+    metrics.observe('phase', 0.5, phase='1_followers')
+    with pytest.raises(ValueError):
+        with metrics.timer('phase', phase='2_profiles'):
+            raise ValueError
+
+    report = metrics.report()
+    assert report['counters'] == [{'name': 'profiles', 'labels': {'source': 'cache'}, 'value': 3}]
+    assert [h['labels']['phase'] for h in report['histograms']] == ['1_followers', '2_profiles']
+
+    text = metrics.prometheus()
+    assert 'igscraper_profiles_total{source="cache"} 3' in text
+    assert 'igscraper_phase_seconds_bucket{phase="1_followers",le="1"} 1' in text
+    assert 'igscraper_phase_seconds_count{phase="2_profiles"} 1' in text
+
+
+def test_instrument_driver_counts_commands():
+    class Driver:
+        def execute(self, command, params=None):
+            if command == 'boom':
+                raise RuntimeError
+            return command
+
+    metrics = Metrics(buckets=(1,))
+    driver = instrument_driver(Driver(), metrics)
+    assert instrument_driver(driver, metrics) is driver
+    assert driver.execute('get') == 'get'
+    with pytest.raises(RuntimeError):
+        driver.execute('boom')
+
+    counters = {(c['name'], c['labels']['command']): c['value'] for c in metrics.report()['counters']}
+    assert counters == {('webdriver_commands', 'get'): 1, ('webdriver_commands', 'boom'): 1,
+                        ('webdriver_errors', 'boom'): 1}
@@ -0,0 +1,64 @@
+"""
+Archivo: tests/test_pacing.py
+Descripción: Pruebas del control de ritmo del scroll
+"""
+
+from pacing import END_OF_LIST, END_STALL, ScrollPacer
+
+
+def pacer(**kwargs):
+    config = dict(min_interval=0, jitter=0, poll_interval=0, wait_timeout=0.5, settle_time=0, max_idle=2)
+    config.update(kwargs)
+    return ScrollPacer(**config)
+
+
+def statuses(*items):
+    items = list(items)
+    return lambda: items.pop(0) if len(items) > 1 else items[0]
+
+
+def status(total, loading=False, at_bottom=False):
+    return {'total': total, 'loading': loading, 'atBottom': at_bottom}
+
+
+def test_wait_for_rows_returns_as_soon_as_rows_arrive():
+    p = pacer()
+    p.idle_count = 1
+    result = p.wait_for_rows(statuses(status(10, loading=True), status(22)), baseline=10)
+    assert result['total'] == 22
+    assert p.idle_count == 0
+
+
+def test_finished_load_without_rows_counts_as_idle():
+    p = pacer()
+    p.wait_for_rows(statuses(status(10, loading=True), status(10)), baseline=10)
+    assert p.idle_count == 1
+    assert p.end_reason(status(10)) is None
+
+
+def test_end_reasons_after_max_idle():
+    p = pacer()
+    last = None
+    for _ in range(2):
+        last = p.wait_for_rows(statuses(status(50, at_bottom=True)), baseline=50)
+    assert p.end_reason(last) == END_OF_LIST
+
+    p = pacer(wait_timeout=0.05)
+    for _ in range(2):
+        last = p.wait_for_rows(statuses(status(50, loading=True)), baseline=50)
+    assert p.end_reason(last) == END_STALL
+
+
+def test_modal_gone_and_errors():
+    p = pacer()
+    assert p.wait_for_rows(lambda: None, baseline=0) is None
+    p.register_idle()
+    p.register_idle()
+    assert p.end_reason(None) == END_STALL
+
+
+def test_pace_counts_scrolls():
+    p = pacer()
+    p.pace()
+    p.pace()
+    assert p.scrolls == 2
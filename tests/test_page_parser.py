@@ -0,0 +1,61 @@
+"""
+Archivo: tests/test_page_parser.py
+Descripción: Pruebas del parseo offline de snapshots HTML
+"""
+
+from page_parser import parse_page
+
+HTML = """<html><head>
+<meta property="og:description" content="1,234 Followers, 56 Following">
+<meta name="description" content="Descripción">
+<script>var x = "<header>no es texto</header>";</script>
+<style>.a { color: red }</style>
+</head><body>
+<header><section>
+  <h2>perfil</h2>
+  <ul><li><span title="1,234">1.2K</span> followers</li><li>56   following</li></ul>
+  <div><span>Línea uno<br>Línea &amp; dos</span></div>
+  <a href="/perfil/followers/">seguidores</a>
+  <img src="x.jpg"><input type="text">
+</section></header>
+<header>segundo header</header>
+<div><p>sin cerrar<b>negrita</div>
+</body></html>"""
+
+
+def test_parse_page_collects_nodes_used_by_heuristics():
+    page = parse_page(HTML, "https://www.instagram.com/perfil/")
+
+    assert page.meta_content(prop='og:description') == "1,234 Followers, 56 Following"
+    assert page.meta_content(name='description') == "Descripción"
+    assert page.meta_content(prop='og:title') is None
+
+    assert page.header is not None and 'perfil' in page.header.text
+    assert [span.get('title') for span in page.title_spans] == ["1,234"]
+    assert page.absolute("/perfil/followers/") == "https://www.instagram.com/perfil/followers/"
+
+
+def test_node_text_matches_selenium_block_layout():
+    page = parse_page(HTML)
+    assert page.header.text.split("\n") == [
+        "perfil", "1.2K followers", "56 following", "Línea uno", "Línea & dos", "seguidores"
+    ]
+    # El contenido de <script> y <style> no es texto visible
+    assert "no es texto" not in page.root.text
+    assert "color" not in page.root.text
+
+
+def test_find_all_and_malformed_html():
+    page = parse_page(HTML)
+    assert [a.get('href') for a in page.header.find_all('a')] == ["/perfil/followers/"]
+    # Las etiquetas vacías no abren nivel y el HTML mal anidado se cierra igual
+    assert page.header.find_all('img')[0].children == []
+    assert page.root.text.split("\n")[-2:] == ["segundo header", "sin cerrarnegrita"]
+    assert len(page.root.find_all('header')) == 2
+
+
+def test_parse_page_without_source():
+    page = parse_page(None)
+    assert page.header is None
+    assert page.root.text == ""
+    assert page.absolute("/x/") == "/x/"
@@ -0,0 +1,87 @@
+"""
+Archivo: tests/test_parquet.py
+Descripción: Pruebas del dataset Parquet particionado por perfil y fecha
+"""
+
+import numpy as np
+import pytest
+
+import file_manager
+from benford_analysis import cargar_followers, cargar_parquet, es_dataset_parquet
+from config import OUTPUT_CONFIG
+from file_manager import save_profile_data_parquet
+
+
+def perfil(username, followers, **extra):
+    return {'username': username, 'followers': followers, 'following': 1, 'posts': 2,
+            'bio': f"Bio de {username} ⚽", 'links': [f"https://example.com/{username}"], **extra}
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    """Dos fechas del mismo perfil y una de otro; la primera fecha se reescribe"""
+    monkeypatch.setattr(file_manager, 'DATASET_DIR', tmp_path / "dataset")
+    monkeypatch.setitem(OUTPUT_CONFIG, 'parquet_batch_rows', 2)
+
+    save_profile_data_parquet([perfil("ana", 999)], "objetivo", day="2026-01-01")
+    # La misma partición se sustituye (generador y varios row groups)
+    save_profile_data_parquet((perfil(u, f) for u, f in [("ana", 10), ("beto", 200), ("dani", None)]),
+                              "objetivo", day="2026-01-01")
+    save_profile_data_parquet([perfil("ana", 30), perfil("carla", 4000)], "objetivo", day="2026-02-01")
+    save_profile_data_parquet([perfil("ana", 7)], "otro", day="2026-02-01")
+    return tmp_path / "dataset"
+
+
+def filas(tabla):
+    return sorted(zip(*(tabla[c].to_pylist() for c in tabla.column_names)), key=str)
+
+
+def test_partitions_are_written_per_target_and_date(dataset):
+    archivos = sorted(p.relative_to(dataset).as_posix() for p in dataset.rglob("*.parquet"))
+    assert archivos == [
+        "target=objetivo/date=2026-01-01/part-0.parquet",
+        "target=objetivo/date=2026-02-01/part-0.parquet",
+        "target=otro/date=2026-02-01/part-0.parquet",
+    ]
+    assert es_dataset_parquet(dataset)
+
+    tabla = cargar_parquet(dataset / archivos[0], columnas=("username", "followers", "bio", "links"))
+    assert filas(tabla) == [
+        ("ana", 10, "Bio de ana ⚽", ["https://example.com/ana"]),
+        ("beto", 200, "Bio de beto ⚽", ["https://example.com/beto"]),
+        ("dani", None, "Bio de dani ⚽", ["https://example.com/dani"]),
+    ]
+
+
+def test_latest_observation_wins(dataset):
+    tabla = cargar_parquet(dataset, columnas=("target", "username", "followers"))
+    assert filas(tabla) == [
+        ("objetivo", "ana", 30), ("objetivo", "beto", 200), ("objetivo", "carla", 4000),
+        ("objetivo", "dani", None), ("otro", "ana", 7),
+    ]
+
+
+def test_historico_and_date_filters(dataset):
+    historico = cargar_parquet(dataset, columnas=("date", "username", "followers"),
+                               perfiles=["objetivo"], historico=True)
+    assert filas(historico) == [
+        ("2026-01-01", "ana", 10), ("2026-01-01", "beto", 200), ("2026-01-01", "dani", None),
+        ("2026-02-01", "ana", 30), ("2026-02-01", "carla", 4000),
+    ]
+
+    desde = cargar_parquet(dataset, perfiles=["objetivo"], desde="2026-02-01")
+    assert filas(desde) == [("ana", 30), ("carla", 4000)]
+    hasta = cargar_parquet(dataset, perfiles=["objetivo"], hasta="2026-01-31")
+    assert filas(hasta) == [("ana", 10), ("beto", 200), ("dani", None)]
+
+
+def test_cargar_followers_from_dataset(dataset):
+    usernames, followers = cargar_followers(dataset, perfiles=["objetivo"])
+    datos = dict(zip(usernames, followers))
+    assert sorted(datos) == ["ana", "beto", "carla", "dani"]
+    assert datos["ana"] == 30 and datos["carla"] == 4000
+    assert np.isnan(datos["dani"])
+    assert followers.dtype == float
+
+    usernames, followers = cargar_followers(dataset, desde="2026-02-01")
+    assert sorted(zip(usernames, followers.tolist())) == [("ana", 7.0), ("ana", 30.0), ("carla", 4000.0)]
@@ -0,0 +1,71 @@
+"""
+Archivo: tests/test_profile_cache.py
+Descripción: Pruebas de la caché de perfiles (TTL y expulsión LRU)
+"""
+
+import pytest
+
+import profile_cache
+from profile_cache import ProfileCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(profile_cache, 'time', clock)
+    monkeypatch.setattr(profile_cache, 'ensure_dirs', lambda: None)
+    return clock
+
+
+def test_get_put_and_ttl(tmp_path, clock):
+    cache = ProfileCache(tmp_path / "cache.sqlite3", ttl_hours=1, max_entries=10)
+    record = {'username': 'ana', 'followers': 10, 'bio': 'Ñandú ⚽'}
+
+    assert cache.get('ana') is None
+    cache.put('ana', record)
+    assert cache.get('ana') == record
+
+    clock.now += 3601
+    assert cache.get('ana') is None
+    assert cache.summary() == {'hits': 1, 'misses': 2, 'stale': 1}
+
+    # put() refresca la entrada caducada
+    cache.put('ana', {**record, 'followers': 11})
+    assert cache.get('ana')['followers'] == 11
+    cache.close()
+
+
+def test_evict_removes_expired_and_least_recently_used(tmp_path, clock):
+    cache = ProfileCache(tmp_path / "cache.sqlite3", ttl_hours=1, max_entries=2)
+    for username in ('a', 'b', 'c'):
+        cache.put(username, {'username': username})
+        clock.now += 10
+    cache.get('a')             # 'a' pasa a ser la más usada
+    cache.evict()
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') and cache.get('c')
+
+    clock.now += 3601
+    cache.evict()
+    assert len(cache) == 0
+    cache.close()
+
+
+def test_cache_persists_between_runs(tmp_path, clock):
+    path = tmp_path / "cache.sqlite3"
+    cache = ProfileCache(path, ttl_hours=1, max_entries=10)
+    cache.put('ana', {'followers': 1})
+    cache.close()
+
+    cache = ProfileCache(path, ttl_hours=1, max_entries=10)
+    assert cache.get('ana') == {'followers': 1}
+    cache.close()
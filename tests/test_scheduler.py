@@ -0,0 +1,55 @@
+"""
+Archivo: tests/test_scheduler.py
+Descripción: Pruebas del planificador de navegaciones (token bucket)
+"""
+
+import time
+
+import pytest
+
+from scheduler import Scheduler
+
+
+def test_navigations_are_spaced_by_the_interval():
+    scheduler = Scheduler(min_interval=0.1, max_interval=0.1, burst=1)
+    starts = []
+    for _ in range(3):
+        with scheduler.navigation():
+            starts.append(time.monotonic())
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert all(gap >= 0.1 for gap in gaps)
+
+
+def test_burst_allows_consecutive_navigations():
+    scheduler = Scheduler(min_interval=0.5, max_interval=0.5, burst=2)
+    start = time.monotonic()
+    with scheduler.navigation():
+        pass
+    with scheduler.navigation():
+        pass
+    assert time.monotonic() - start < 0.1
+
+
+def test_pending_work_runs_during_waits():
+    scheduler = Scheduler(min_interval=0.1, max_interval=0.1, burst=1)
+    done = []
+    with scheduler.navigation():
+        pass
+    scheduler.submit(done.append, 1)
+    scheduler.submit(done.append, 2)
+    with scheduler.navigation():
+        # El trabajo encolado se hizo mientras se esperaba el token
+        assert done == [1, 2]
+    assert scheduler.summary()['slept'] > 0
+
+
+def test_drain_and_errors():
+    scheduler = Scheduler(0, 0, 1)
+    done = []
+    scheduler.submit(done.append, 'a')
+    scheduler.drain()
+    assert done == ['a']
+
+    scheduler.acquire()
+    with pytest.raises(RuntimeError):
+        scheduler.acquire()
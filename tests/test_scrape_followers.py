@@ -0,0 +1,104 @@
+"""
+Archivo: tests/test_scrape_followers.py
+Descripción: Pruebas de la carga de objetivos del modo por lotes y de la carpeta de trabajos
+"""
+
+import json
+import os
+import time
+from argparse import Namespace
+
+import pytest
+
+import scrape_followers
+from scrape_followers import job_targets, load_targets, parse_args, watch_jobs
+
+
+def opciones(**kwargs):
+    return Namespace(**{'job': None, 'target': [], 'limit': 100, 'max_profiles': 50, **kwargs})
+
+
+def escribir(ruta, contenido):
+    ruta.write_text(contenido if isinstance(contenido, str) else json.dumps(contenido), encoding='utf-8')
+    return ruta
+
+
+def test_job_targets_formats(tmp_path):
+    lista = escribir(tmp_path / "lista.json", ["@ana", {'profile': " beto ", 'limit': 20, 'max_profiles': "5"}])
+    assert job_targets(lista, opciones()) == [
+        {'profile': "ana", 'limit': 100, 'max_profiles': 50},
+        {'profile': "beto", 'limit': 20, 'max_profiles': 5},
+    ]
+    objeto = escribir(tmp_path / "objeto.json", {'targets': [{'profile': "carla", 'limit': 7}]})
+    assert job_targets(objeto, opciones()) == [{'profile': "carla", 'limit': 7, 'max_profiles': 50}]
+
+
+@pytest.mark.parametrize("contenido", [
+    '[{"profile": "ana"',                   # Escritura a medias
+    {'targets': "ana"},
+    [{'limit': 10}],
+    [42],
+    [{'profile': "ana", 'limit': "abc"}],
+    [{'profile': "ana", 'limit': 0}],
+    [{'profile': "@"}],
+])
+def test_job_targets_rejects_invalid_jobs(tmp_path, contenido):
+    with pytest.raises(ValueError):
+        job_targets(escribir(tmp_path / "job.json", contenido), opciones())
+
+
+def test_load_targets_combines_job_and_cli_targets(tmp_path):
+    job = escribir(tmp_path / "job.json", ["ana"])
+    targets = load_targets(opciones(job=job, target=["beto:200", "@carla"]))
+    assert targets == [
+        {'profile': "ana", 'limit': 100, 'max_profiles': 50},
+        {'profile': "beto", 'limit': 200, 'max_profiles': 50},
+        {'profile': "carla", 'limit': 100, 'max_profiles': 50},
+    ]
+
+    with pytest.raises(ValueError, match="--target perfil:abc"):
+        load_targets(opciones(target=["perfil:abc"]))
+
+
+@pytest.mark.parametrize("argv", [["--target", "perfil:abc"], ["--target", ":10"], ["--job", "no_existe.json"]])
+def test_parse_args_reports_invalid_targets(argv, capsys):
+    with pytest.raises(SystemExit) as salida:
+        parse_args(argv)
+    assert salida.value.code == 2
+    assert "error:" in capsys.readouterr().err
+
+
+def test_parse_args_targets():
+    assert parse_args(["--target", "ana:10", "--max-profiles", "3"]).targets == [
+        {'profile': "ana", 'limit': 10, 'max_profiles': 3}
+    ]
+
+
+class FinRevision(Exception):
+    pass
+
+
+def test_watch_jobs_skips_partial_files_and_sets_invalid_ones_aside(tmp_path, monkeypatch):
+    def sin_espera(segundos):
+        raise FinRevision
+
+    monkeypatch.setattr(scrape_followers.time, 'sleep', sin_espera)
+    escribir(tmp_path / "a_valido.json", ["ana"])
+    escribir(tmp_path / "b_publicando.json.tmp", ["beto"])
+    escribir(tmp_path / "c_a_medias.json", '["car')
+    antiguo = escribir(tmp_path / "d_invalido.json", '["dani"')
+    hace_un_rato = time.time() - 120
+    os.utime(antiguo, (hace_un_rato, hace_un_rato))
+
+    trabajos = watch_jobs(tmp_path, opciones(), interval=60)
+    job, targets = next(trabajos)
+    assert job.name == "a_valido.json"
+    assert targets == [{'profile': "ana", 'limit': 100, 'max_profiles': 50}]
+    with pytest.raises(FinRevision):
+        next(trabajos)
+
+    assert [p.name for p in (tmp_path / "done").iterdir()] == ["a_valido.json"]
+    assert [p.name for p in (tmp_path / "error").iterdir()] == ["d_invalido.json"]
+    # El archivo temporal y el que se está escribiendo siguen en la carpeta
+    assert (tmp_path / "b_publicando.json.tmp").exists()
+    assert (tmp_path / "c_a_medias.json").exists()
@@ -0,0 +1,78 @@
+"""
+Archivo: tests/test_scraper.py
+Descripción: Pruebas de la fase 1 (modal de followers) y de la extracción de perfiles
+"""
+
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+from benchmarks import FakeWebDriver, synthetic_profile_html
+import profile_cache
+from config import SCRAPING_CONFIG
+from profile_cache import ProfileCache
+from scraper import _profile_record, collect_followers_data, scrape_followers
+
+
+class FlakyModalDriver(FakeWebDriver):
+    """El script del modal falla las primeras `failures` veces con `error`"""
+
+    def __init__(self, failures, error, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = failures
+        self.error = error
+
+    def execute_script(self, script, *args):
+        if 'followersHarvest' in script and self.failures:
+            self.failures -= 1
+            raise self.error
+        return super().execute_script(script, *args)
+
+
+def test_scrape_followers_collects_until_limit(no_delays):
+    followers, stats = scrape_followers(FakeWebDriver(followers=40, page_size=12), "objetivo", 30,
+                                        return_stats=True)
+    assert len(followers) >= 30
+    assert followers <= {f"follower_{i}" for i in range(40)}
+    assert stats['end_reason'] == 'limit'
+
+
+def test_first_harvest_retries_script_errors(no_delays):
+    driver = FlakyModalDriver(2, JavascriptException("dialog aún no montado"), followers=10)
+    followers, stats = scrape_followers(driver, "objetivo", 5, return_stats=True)
+    assert len(followers) >= 5
+    assert stats['end_reason'] == 'limit'
+
+
+def test_first_harvest_error_ends_phase_1(no_delays, monkeypatch):
+    monkeypatch.setitem(SCRAPING_CONFIG, 'default_timeout', 1)
+    driver = FlakyModalDriver(100, WebDriverException("pestaña cerrada"), followers=10)
+    followers, stats = scrape_followers(driver, "objetivo", 5, return_stats=True)
+    assert followers == set()
+    assert stats['end_reason'] == 'error'
+
+
+def test_profile_record_from_snapshot():
+    html = synthetic_profile_html("ana_runner", followers=2048)
+    record = _profile_record("ana_runner", (html, "https://www.instagram.com/ana_runner/"))
+    assert record['username'] == "ana_runner"
+    assert record['followers'] == 2048
+    assert record['following'] == 321
+    assert record['posts'] == 45
+    assert "https://linktr.ee/ana_runner" in record['links']
+    assert "#futbol" in record['bio']
+
+    assert _profile_record("nadie", None)['followers'] is None
+
+
+def test_cache_summary_counts_only_the_current_run(no_delays, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(profile_cache, 'ensure_dirs', lambda: None)
+    cache = ProfileCache(tmp_path / "cache.sqlite3")
+    usernames = {"ana", "beto", "carla"}
+
+    collect_followers_data(FakeWebDriver(), usernames, cache=cache)
+    assert "💾 Caché: 0 aciertos, 3 fallos (0 caducados), 3 visitas" in capsys.readouterr().out
+
+    # La misma caché en el siguiente objetivo: solo cuenta los aciertos nuevos
+    collect_followers_data(FakeWebDriver(), usernames | {"dani"}, cache=cache)
+    assert "💾 Caché: 3 aciertos, 1 fallos (0 caducados), 1 visitas" in capsys.readouterr().out
+    assert cache.summary()['hits'] == 3
+    cache.close()
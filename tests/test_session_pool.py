@@ -0,0 +1,118 @@
+"""
+Archivo: tests/test_session_pool.py
+Descripción: Pruebas del presupuesto de navegaciones y del pool de sesiones
+"""
+
+import threading
+import time
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from benchmarks import FakeWebDriver
+from file_manager import iter_jsonl
+from scheduler import Scheduler
+from scraper import collect_followers_data
+from session_pool import BrowserSession, RequestBudget, RequestBudgetExceeded, SessionPool, SessionStartError
+
+
+class BudgetDriver(FakeWebDriver):
+    """FakeWebDriver cuyas navegaciones pasan por `execute`, como en Selenium"""
+
+    def execute(self, driver_command, params=None):
+        return None
+
+    def get(self, url):
+        self.execute(Command.GET, {'url': url})
+        super().get(url)
+
+    def execute_script(self, script, *args):
+        if script == "return document.readyState":
+            return "complete"
+        return super().execute_script(script, *args)
+
+    def quit(self):
+        self.closed = True
+
+
+def test_budget_consume_and_remaining():
+    budget = RequestBudget(max_requests=2, window_seconds=60)
+    budget.consume()
+    assert budget.remaining() == 1
+    budget.consume()
+    assert budget.remaining() == 0
+    with pytest.raises(RequestBudgetExceeded):
+        budget.consume()
+
+
+def test_budget_exhaustion_stops_phase_2_without_null_records(tmp_path, no_delays):
+    driver = BudgetDriver()
+    session = BrowserSession(driver, RequestBudget(max_requests=3, window_seconds=60), number=1)
+    journal = tmp_path / "journal.jsonl"
+    usernames = {f"user_{i}" for i in range(10)}
+
+    with pytest.raises(RequestBudgetExceeded):
+        collect_followers_data(driver, usernames, journal=journal, keep_records=False,
+                               scheduler=Scheduler(0, 0, 1))
+
+    records = list(iter_jsonl(journal))
+    assert session.pages == 3
+    assert [r['username'] for r in records] == ["user_0", "user_1", "user_2"]
+    assert all(r['followers'] == 12345 for r in records)
+
+
+def test_pool_reuses_and_recycles_sessions():
+    pool = SessionPool(lambda d: True, size=1, max_pages=2, max_heap_mb=None,
+                       budget=RequestBudget(100, 60), factory=BudgetDriver)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+
+    first.driver.get("https://example.com/a")
+    first.driver.get("https://example.com/b")
+    pool.release(first)
+    second = pool.acquire()
+    assert second is not first and second.number == 2
+    assert getattr(first.driver, 'closed', False)
+
+
+def test_pool_failed_start_frees_the_slot():
+    attempts = []
+
+    def authenticate(driver):
+        attempts.append(driver)
+        return len(attempts) > 1
+
+    pool = SessionPool(authenticate, size=1, budget=RequestBudget(100, 60), factory=BudgetDriver)
+    with pytest.raises(SessionStartError):
+        pool.acquire()
+    assert pool.acquire().number == 2
+
+
+def test_release_is_not_blocked_by_a_session_starting():
+    starting = threading.Event()
+    gate = threading.Event()
+    calls = []
+
+    def authenticate(driver):
+        calls.append(driver)
+        if len(calls) == 2:
+            starting.set()
+            gate.wait(5)
+        return True
+
+    pool = SessionPool(authenticate, size=2, max_heap_mb=None,
+                       budget=RequestBudget(100, 60), factory=BudgetDriver)
+    first = pool.acquire()
+    worker = threading.Thread(target=pool.acquire)
+    worker.start()
+    try:
+        assert starting.wait(5)
+        start = time.monotonic()
+        pool.release(first)
+        assert time.monotonic() - start < 1
+        assert pool.acquire(timeout=1) is first
+    finally:
+        gate.set()
+        worker.join(5)
+    assert len(pool._all) == 2
@@ -0,0 +1,43 @@
+"""
+Archivo: tests/test_snapshots.py
+Descripción: Pruebas de los snapshots de followers y sus diferencias
+"""
+
+import pytest
+
+import snapshots
+from snapshots import diff_profile, diff_snapshots, list_snapshots, load_snapshot, save_snapshot, to_array, to_names
+
+
+@pytest.fixture(autouse=True)
+def snapshots_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots, 'SNAPSHOTS_DIR', tmp_path)
+    monkeypatch.setattr(snapshots, 'ensure_dirs', lambda: None)
+
+
+def test_to_array_sorts_dedupes_and_round_trips_unicode():
+    array = to_array(['zoe', 'ana', 'ñandú', 'ana'])
+    assert to_names(array) == ['ana', 'zoe', 'ñandú']
+
+
+def test_diff_snapshots():
+    gained, lost = diff_snapshots(to_array(['a', 'b', 'c']), to_array(['b', 'c', 'd', 'e']))
+    assert to_names(gained) == ['d', 'e']
+    assert to_names(lost) == ['a']
+
+
+def test_save_load_and_diff_profile():
+    assert diff_profile('perfil') is None
+    save_snapshot('perfil', ['a', 'b'], day='2026-01-01')
+    save_snapshot('perfil', ['b', 'c'], day='2026-01-02')
+    save_snapshot('perfil', ['b', 'c', 'd'], day='2026-01-03')
+
+    assert list_snapshots('perfil') == ['2026-01-01', '2026-01-02', '2026-01-03']
+    assert to_names(load_snapshot('perfil')) == ['b', 'c', 'd']
+    assert load_snapshot('perfil', '2025-12-31') is None
+
+    diff = diff_profile('perfil')
+    assert (diff['since'], diff['until'], diff['gained'], diff['lost']) == ('2026-01-02', '2026-01-03', ['d'], [])
+
+    diff = diff_profile('perfil', since='2026-01-01')
+    assert (diff['gained'], diff['lost'], diff['total_since'], diff['total_until']) == (['c', 'd'], ['a'], 2, 3)
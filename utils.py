@@ -6,7 +6,9 @@ Descripción: Utilidades generales
 import time
 import random
 import re
-from config import SCRAPING_CONFIG
+from urllib.parse import urlparse
+from config import SCRAPING_CONFIG, INSTAGRAM_URLS
+from metrics import METRICS
 
 
 def human_delay(min_sec=None, max_sec=None):
@@ -16,7 +18,8 @@ def human_delay(min_sec=None, max_sec=None):
     if max_sec is None:
         max_sec = SCRAPING_CONFIG['request_delay_max']
     
-    time.sleep(random.uniform(min_sec, max_sec))
+    with METRICS.timer('human_delay'):
+        time.sleep(random.uniform(min_sec, max_sec) * SCRAPING_CONFIG['delay_scale'])
 
 
 def parse_follower_count(text):
@@ -41,7 +44,10 @@ def parse_follower_count(text):
 
 def extract_username_from_url(url):
     """Extrae el username de una URL de Instagram"""
-    if not url or "instagram.com" not in url:
+    if not url:
+        return None
+    host = urlparse(url).netloc
+    if "instagram.com" not in host and host != urlparse(INSTAGRAM_URLS['home']).netloc:
         return None
     
     parts = url.rstrip('/').split('/')